@@ -0,0 +1,221 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import subprocess
+import numpy as np
+import soundfile as sf
+from typing import Any, Callable, Tuple
+from Lazy_Import import lazy_import
+
+# Loads PortAudio, which only playback needs
+sd = lazy_import('sounddevice')
+
+
+SOUND_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Sound', 'prompt.aiff')
+
+
+def load_audio(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file at its own sample rate.
+
+    Args:
+        path (str): The path of the audio file (WAV, AIFF, FLAC or OGG).
+
+    Returns:
+        Tuple[np.ndarray, int]: The samples as float32, shaped (frames,) for mono or (frames, channels), and the sample rate.
+    """
+    y, sr = sf.read(path, dtype='float32', always_2d=False)
+    return y, sr
+
+
+def rms_envelope(y: np.ndarray, hop: int) -> np.ndarray:
+    """
+    Compute the loudness of audio over consecutive windows in one vectorized pass.
+
+    Args:
+        y (np.ndarray): The samples, shaped (frames,) or (frames, channels).
+        hop (int): The number of frames per window.
+
+    Returns:
+        np.ndarray: The RMS of every window, scaled so the loudest is 1.0.
+    """
+    mono = y.mean(axis=1) if y.ndim > 1 else y
+    if hop <= 0 or not len(mono):
+        return np.zeros(0, dtype=np.float32)
+    padded = np.pad(mono, (0, -len(mono) % hop))
+    envelope = np.sqrt(np.mean(np.square(padded.reshape(-1, hop), dtype=np.float32), axis=1))
+    peak = envelope.max()
+    return envelope / peak if peak > 0 else envelope
+
+
+class AudioPlayer:
+    """
+    Stream audio to the speakers in blocks without blocking the caller.
+
+    The samples are copied to the output stream from sounddevice's audio thread one block at a time,
+    and the number of frames already played is kept so the caller can follow the playback.
+
+    Attributes:
+        blocksize (int): The number of frames per block.
+        data (np.ndarray): The samples being played, shaped (frames, channels).
+        sr (int): The sample rate of the audio being played.
+        position (int): The number of frames played so far.
+    """
+
+    def __init__(self, blocksize: int = 1024):
+        """
+        Initialize the AudioPlayer class.
+
+        Args:
+            blocksize (int): The number of frames per block. Defaults to 1024.
+        """
+        self.blocksize = blocksize
+        self.data = np.zeros((0, 1), dtype=np.float32)
+        self.sr = 0
+        self.position = 0
+        self.stream = None
+        self.on_finish = None
+        self.finished = threading.Event()
+        self.finished.set()
+
+    @property
+    def playing(self) -> bool:
+        """
+        Whether audio is playing.
+        """
+        return not self.finished.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The number of seconds played so far.
+        """
+        return self.position / self.sr if self.sr else 0.0
+
+    def play(self, y: np.ndarray, sr: int, on_finish: Callable[[], None] = None) -> None:
+        """
+        Start playing audio, stopping whatever was playing.
+
+        Args:
+            y (np.ndarray): The samples, shaped (frames,) or (frames, channels).
+            sr (int): The sample rate.
+            on_finish (Callable[[], None], optional): Called from the audio thread when playback ends or is stopped.
+        """
+        self.stop()
+        data = y.reshape(-1, 1) if y.ndim == 1 else y
+        self.data = np.ascontiguousarray(data, dtype=np.float32)
+        self.sr = sr
+        self.position = 0
+        self.on_finish = on_finish
+        self.finished.clear()
+        stream = sd.OutputStream(samplerate=sr, channels=self.data.shape[1], dtype='float32', blocksize=self.blocksize,
+                                 callback=self._callback, finished_callback=lambda: self._finished(stream))
+        self.stream = stream
+        stream.start()
+
+    def _callback(self, outdata: np.ndarray, frames: int, time, status) -> None:
+        """
+        Fill the next block of the output stream.
+
+        Args:
+            outdata (np.ndarray): The block to fill.
+            frames (int): The number of frames in the block.
+            time: The stream timing information.
+            status (sd.CallbackFlags): Underflow and overflow flags.
+        """
+        chunk = self.data[self.position:self.position + frames]
+        played = len(chunk)
+        outdata[:played] = chunk
+        self.position += played
+        if played < frames:
+            outdata[played:] = 0
+            raise sd.CallbackStop
+
+    def _finished(self, stream: Any) -> None:
+        """
+        Mark playback as finished and call the finish callback, unless the stream has been replaced.
+
+        Args:
+            stream (sd.OutputStream): The stream that finished.
+        """
+        if stream is not self.stream:
+            return
+        self.finished.set()
+        if self.on_finish is not None:
+            self.on_finish()
+
+    def stop(self) -> None:
+        """
+        Stop playback and release the output stream.
+
+        The finish callback is detached first, so aborting the stream to start other audio does not
+        report that audio as finished.
+        """
+        self.on_finish = None
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            stream.abort()
+            stream.close()
+        self.finished.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for playback to end.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: True if playback ended, False if the wait timed out.
+        """
+        return self.finished.wait(timeout)
+
+
+def measure(loader: str, path: str) -> Tuple[float, float]:
+    """
+    Time importing an audio loader and decoding a file in a fresh interpreter, and record its peak memory.
+
+    Args:
+        loader (str): 'soundfile' or 'librosa'.
+        path (str): The audio file to decode.
+
+    Returns:
+        Tuple[float, float]: The time in seconds and the peak resident memory in MB.
+    """
+    code = {
+        'soundfile': 'import soundfile; soundfile.read(path, dtype="float32")',
+        'librosa': 'import librosa; librosa.load(path, sr=None)',
+    }[loader]
+    script = (
+        'import resource, sys, time\n'
+        'path = sys.argv[1]\n'
+        'start = time.perf_counter()\n'
+        f'{code}\n'
+        'elapsed = time.perf_counter() - start\n'
+        'rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n'
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        'print(elapsed, rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024)\n'
+    )
+    output = subprocess.run([sys.executable, '-c', script, path], capture_output=True, text=True, check=True).stdout
+    elapsed, rss = output.split()
+    return float(elapsed), float(rss)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the cost of loading speech audio with soundfile and librosa.')
+    parser.add_argument('path', nargs='?', default=SOUND_FILE, help='audio file to decode (defaults to Sound/prompt.aiff)')
+    parser.add_argument('-n', '--runs', type=int, default=3, help='runs per loader, the best is reported')
+    args = parser.parse_args()
+
+    for loader in ('soundfile', 'librosa'):
+        try:
+            results = [measure(loader, args.path) for _ in range(args.runs)]
+        except (subprocess.CalledProcessError, ValueError):
+            print(f'{loader:>10}: not available')
+            continue
+        print(f'{loader:>10}: import + decode {min(r[0] for r in results) * 1000:8.1f} ms, peak memory {min(r[1] for r in results):7.1f} MB')
+    start = time.perf_counter()
+    load_audio(args.path)
+    print(f'{"warm":>10}: decode {(time.perf_counter() - start) * 1000:8.1f} ms')
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from typing import List, Optional
+from Download_Manager import DownloadJob, DownloadManager, PRIORITY_LOW, DOWNLOADING, FINISHED, FAILED
+from Media_Library import MediaLibrary
+from Youtube_Downloader import YoutubeDownloader, say
+
+
+JSON_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Json')
+SEARCH_RESULTS_FILE = os.path.join(JSON_DIRECTORY, 'search_results.json')
+BATCH_QUEUE_FILE = os.path.join(JSON_DIRECTORY, 'batch_queue.json')
+REPORT_FILE = os.path.join(JSON_DIRECTORY, 'batch_report.json')
+
+
+def load_url_file(path: str) -> List[dict]:
+    """
+    Read links from a text file, one per line. Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        List[dict]: The links, each with a 'url' and an empty 'title'.
+    """
+    with open(path, 'r') as f:
+        return [{'url': line.strip(), 'title': ''} for line in f if line.strip() and not line.startswith('#')]
+
+
+def load_search_results(path: str = SEARCH_RESULTS_FILE) -> List[dict]:
+    """
+    Read the links of a saved mini-youtube search.
+
+    Args:
+        path (str): The path of the search results. Defaults to Json/search_results.json.
+
+    Returns:
+        List[dict]: The results, each with a 'url' and a 'title'.
+    """
+    with open(path, 'r') as f:
+        return [{'url': entry['url'], 'title': entry.get('title') or ''} for entry in json.load(f) if entry.get('url')]
+
+
+def collect_entries(urls: List[str] = None, url_file: str = None, search_results: str = None, playlists: List[str] = None,
+                    downloader: YoutubeDownloader = None) -> List[dict]:
+    """
+    Gather the links of a batch from every kind of input, dropping repeated links.
+
+    Args:
+        urls (List[str], optional): Individual links.
+        url_file (str, optional): A text file with one link per line.
+        search_results (str, optional): A saved search_results.json.
+        playlists (List[str], optional): Playlist links, expanded to their videos.
+        downloader (YoutubeDownloader, optional): Used to expand playlists. Defaults to a new YoutubeDownloader.
+
+    Returns:
+        List[dict]: The links, each with a 'url' and a 'title'.
+    """
+    entries = [{'url': url, 'title': ''} for url in urls or []]
+    if url_file:
+        entries += load_url_file(url_file)
+    if search_results:
+        entries += load_search_results(search_results)
+    if playlists:
+        downloader = downloader if downloader is not None else YoutubeDownloader(False, say)
+        for playlist in playlists:
+            entries += downloader.playlist_entries(playlist)
+    seen = set()
+    unique = []
+    for entry in entries:
+        if entry['url'] not in seen:
+            seen.add(entry['url'])
+            unique.append(entry)
+    return unique
+
+
+def batch_download(entries: List[dict], type: str, manager: DownloadManager, timeout: Optional[float] = None) -> dict:
+    """
+    Download every link of a batch through a download manager and wait for them to finish.
+
+    Jobs already waiting in the manager, such as those left by an interrupted batch, are waited for
+    and reported as well.
+
+    Args:
+        entries (List[dict]): The links, each with a 'url' and a 'title'.
+        type (str): The type of download ('Audio' or 'Video').
+        manager (DownloadManager): The manager that runs the downloads.
+        timeout (float, optional): The maximum number of seconds to wait. Defaults to no limit.
+
+    Returns:
+        dict: The report, with a summary and the outcome of every job.
+    """
+    start = time.time()
+    queued = threading.Event()
+    done = threading.Event()
+
+    def check(job: DownloadJob = None):
+        # Progress events of a running download cannot end the batch, so skip the count for them
+        if queued.is_set() and (job is None or job.status != DOWNLOADING) and manager.progress()['active'] == 0:
+            done.set()
+
+    manager.add_listener(check)
+    try:
+        jobs = manager.submit_many(entries, type, priority=PRIORITY_LOW)
+        logging.info(f"Batch of {len(jobs)} {type} downloads queued")
+        queued.set()
+        check()
+        done.wait(timeout)
+    finally:
+        manager.remove_listener(check)
+    return report(manager, type, time.time() - start)
+
+
+def report(manager: DownloadManager, type: str, elapsed: float) -> dict:
+    """
+    Build the machine-readable report of a batch.
+
+    Args:
+        manager (DownloadManager): The manager that ran the downloads.
+        type (str): The type of download ('Audio' or 'Video').
+        elapsed (float): The number of seconds the batch took.
+
+    Returns:
+        dict: The summary and the outcome of every job.
+    """
+    summary = manager.progress()
+    return {
+        'type': type,
+        'elapsed': round(elapsed, 2),
+        'completed': summary['active'] == 0,
+        'summary': {key: summary[key] for key in ('jobs', 'finished', 'failed', 'active', 'paused')},
+        'jobs': [
+            {
+                'url': job.url,
+                'title': job.title,
+                'video_id': job.video_id,
+                'status': job.status,
+                'filepath': job.filepath,
+                'size': job.size,
+                'sha256': job.sha256,
+                'attempts': job.attempts,
+                'error': job.error
+            }
+            for job in list(manager.jobs.values())
+        ]
+    }
+
+
+def print_outcome(job: DownloadJob) -> None:
+    """
+    Print a line for every download of a batch that finishes or fails.
+
+    Args:
+        job (DownloadJob): The updated job.
+    """
+    if job.status in (FINISHED, FAILED):
+        print(f"{job.status:>8}  {job.title or job.url}")
+
+
+def write_report(data: dict, path: str = REPORT_FILE) -> None:
+    """
+    Save a batch report as JSON.
+
+    Args:
+        data (dict): The report.
+        path (str): The path of the report. Defaults to Json/batch_report.json.
+    """
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run a batch download from the command line.
+
+    Args:
+        argv (List[str], optional): The arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit code, 1 if any download failed or the batch timed out.
+    """
+    parser = argparse.ArgumentParser(description='Download many YouTube videos or songs without prompts.')
+    parser.add_argument('urls', nargs='*', help='links to download')
+    parser.add_argument('-f', '--file', help='text file with one link per line')
+    parser.add_argument('-s', '--search-results', nargs='?', const=SEARCH_RESULTS_FILE, help='saved search results (defaults to Json/search_results.json)')
+    parser.add_argument('-p', '--playlist', action='append', default=[], help='playlist link, may be repeated')
+    parser.add_argument('-t', '--type', choices=('Audio', 'Video'), default='Audio', help='what to download (default: Audio)')
+    parser.add_argument('-w', '--workers', type=int, default=2, help='downloads running at once (default: 2)')
+    parser.add_argument('-r', '--report', default=REPORT_FILE, help='where to write the JSON report (default: Json/batch_report.json)')
+    parser.add_argument('--timeout', type=float, help='stop waiting after this many seconds')
+    parser.add_argument('--no-library', action='store_true', help='download again even if the media library has the video')
+    args = parser.parse_args(argv)
+
+    entries = collect_entries(args.urls, args.file, args.search_results, args.playlist)
+    library = None if args.no_library else MediaLibrary()
+    manager = DownloadManager(max_workers=args.workers, queue_file=BATCH_QUEUE_FILE, library=library)
+    manager.add_listener(print_outcome)
+
+    data = batch_download(entries, args.type, manager, args.timeout)
+    manager.shutdown()
+    write_report(data, args.report)
+    print(f"{data['summary']['finished']}/{data['summary']['jobs']} finished in {data['elapsed']}s, report written to {args.report}")
+    return 1 if data['summary']['failed'] or not data['completed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import time
+import socket
+import logging
+import threading
+from typing import Optional
+
+
+DEFAULT_HOST = 'www.google.com'
+DEFAULT_PORT = 80
+
+
+class ConnectivityMonitor:
+    """
+    Track whether the internet is reachable without blocking the callers that ask.
+
+    A probe opens a TCP connection to a known host with a short timeout. The result is cached for a
+    while, and once it is stale callers get the last known status while a probe runs in the background.
+    No check waits for a probe: until the first one finishes the internet is assumed reachable, so an
+    online-only action just fails as it would have without the check. The host and port can be pointed
+    at a local server to test offline and online behaviour.
+
+    Attributes:
+        host (str): The host probed.
+        port (int): The port probed.
+        timeout (float): The connection timeout of a probe in seconds.
+        ttl (float): How long a probe result is trusted, in seconds.
+        online (Optional[bool]): The last probe result, or None before the first probe.
+        checked_at (float): When the last probe finished, from time.monotonic().
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 1.5, ttl: float = 30.0):
+        """
+        Initialize the ConnectivityMonitor class.
+
+        Args:
+            host (str): The host probed. Defaults to www.google.com.
+            port (int): The port probed. Defaults to 80.
+            timeout (float): The connection timeout of a probe in seconds. Defaults to 1.5.
+            ttl (float): How long a probe result is trusted, in seconds. Defaults to 30.0.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ttl = ttl
+        self.online: Optional[bool] = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+        self.probing = False
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def probe(self) -> bool:
+        """
+        Check the connection now and cache the result.
+
+        Returns:
+            bool: True if the host could be reached, False otherwise.
+        """
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                online = True
+        except OSError:
+            online = False
+        with self.lock:
+            if online != self.online:
+                logging.info(f"Connectivity changed: {'online' if online else 'offline'}")
+            self.online = online
+            self.checked_at = time.monotonic()
+            self.probing = False
+        return online
+
+    def is_online(self) -> bool:
+        """
+        Get the last known connection status, probing in the background if it is stale or unknown.
+
+        Never blocks, so it is safe to call from the Tk thread.
+
+        Returns:
+            bool: True if the internet is reachable or has not been checked yet, False otherwise.
+        """
+        with self.lock:
+            online = self.online
+            stale = time.monotonic() - self.checked_at > self.ttl
+        if online is None or stale:
+            self.refresh()
+        return online is not False
+
+    def refresh(self) -> None:
+        """
+        Probe in the background unless a probe is already running.
+        """
+        with self.lock:
+            if self.probing:
+                return
+            self.probing = True
+        threading.Thread(target=self.probe, name='connectivity-probe', daemon=True).start()
+
+    def start(self, interval: float = None) -> None:
+        """
+        Keep the status fresh by probing in the background at a fixed interval.
+
+        Args:
+            interval (float, optional): The time between probes in seconds. Defaults to the ttl.
+        """
+        if self.thread is not None:
+            return
+        interval = self.ttl if interval is None else interval
+
+        def run():
+            while not self.stopped.is_set():
+                with self.lock:
+                    self.probing = True
+                self.probe()
+                self.stopped.wait(interval)
+
+        self.thread = threading.Thread(target=run, name='connectivity-monitor', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background probes.
+        """
+        self.stopped.set()
+
+
+# Shared by every module that checks the connection, so there is one cached status and one prober
+shared_monitor = ConnectivityMonitor()
@@ -0,0 +1,349 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Tuple
+
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Persistence Documents', 'conversation_history.db')
+LEGACY_HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Persistence Documents', 'conversation_history.txt')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL REFERENCES sessions (id),
+    role TEXT NOT NULL,
+    text TEXT NOT NULL,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_session ON messages (session, id);
+CREATE INDEX IF NOT EXISTS messages_time ON messages (time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_search USING fts5 (text, content='messages', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS messages_search_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_search (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_search_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_search (messages_search, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_search_update AFTER UPDATE OF text ON messages BEGIN
+    INSERT INTO messages_search (messages_search, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO messages_search (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+
+def parse_legacy_history(text: str) -> List[Tuple[str, str]]:
+    """
+    Split the old conversation_history.txt into messages.
+
+    The user's messages were written on one line indented by three tabs, and the replies after them
+    followed by a blank line.
+
+    Args:
+        text (str): The contents of the file.
+
+    Returns:
+        List[Tuple[str, str]]: The role and text of every message, in order.
+    """
+    messages = []
+    reply: List[str] = []
+
+    def end_reply() -> None:
+        if ''.join(reply).strip():
+            messages.append(('assistant', ''.join(reply).strip('\n')))
+        reply.clear()
+
+    for line in text.splitlines(keepends=True):
+        if line.startswith('\t\t\t'):
+            end_reply()
+            messages.append(('user', line.strip()))
+        else:
+            reply.append(line)
+    end_reply()
+    return messages
+
+
+class ConversationStore:
+    """
+    A SQLite store of the conversation history, grouped into sessions.
+
+    Messages are kept in memory and written in batches, when enough have built up or shortly after the
+    last one, so an exchange costs no file opens on the Tk thread. One connection stays open for the
+    life of the app. Messages are indexed by session and by time, and read back a page at a time. Their
+    text is also indexed with FTS5, kept up to date by triggers as messages are written, so searching
+    stays instant with years of history.
+
+    Attributes:
+        path (str): The path of the database file.
+        batch_size (int): The number of messages that are written as soon as they have built up.
+        flush_delay (float): How long a message waits to be written with later ones in seconds.
+        connection (sqlite3.Connection): The connection, shared by all threads under a lock.
+        session (int): The id of the session messages are added to.
+        pending (List[Tuple[int, str, str, float]]): The session, role, text and time of the messages not yet written.
+        searchable (bool): Whether the FTS5 text index is available.
+    """
+
+    def __init__(self, path: str = HISTORY_FILE, batch_size: int = 20, flush_delay: float = 2.0):
+        """
+        Initialize the ConversationStore class.
+
+        Args:
+            path (str): The path of the database file. Defaults to Persistence Documents/conversation_history.db.
+            batch_size (int): The number of messages that are written as soon as they have built up. Defaults to 20.
+            flush_delay (float): How long a message waits to be written with later ones in seconds. Defaults to 2.0.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_delay = flush_delay
+        self.lock = threading.Lock()
+        self.pending: List[Tuple[int, str, str, float]] = []
+        self.timer = None
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.executescript(SCHEMA)
+            indexed = self.connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'messages_search'").fetchone()
+            try:
+                self.connection.executescript(SEARCH_SCHEMA)
+                if not indexed:
+                    # Index the messages written before the index existed
+                    self.connection.execute("INSERT INTO messages_search (messages_search) VALUES ('rebuild')")
+                self.searchable = True
+            except sqlite3.OperationalError:
+                logging.info("SQLite has no FTS5, falling back to LIKE for conversation search")
+                self.searchable = False
+        self.session = self.start_session()
+
+    def start_session(self) -> int:
+        """
+        Start a new session, which the messages added from now on belong to.
+
+        Returns:
+            int: The id of the session.
+        """
+        self.flush()
+        with self.lock, self.connection:
+            self.session = self.connection.execute("INSERT INTO sessions (started) VALUES (?)", (time.time(),)).lastrowid
+        return self.session
+
+    def add(self, role: str, text: str) -> None:
+        """
+        Add a message to the current session. It is written with the next batch.
+
+        Args:
+            role (str): Who sent it, 'user' or 'assistant'.
+            text (str): The text of the message.
+        """
+        with self.lock:
+            self.pending.append((self.session, role, text, time.time()))
+            full = len(self.pending) >= self.batch_size
+            if not full and self.timer is None:
+                self.timer = threading.Timer(self.flush_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the messages added since the last batch in one transaction.
+
+        Returns:
+            int: The number of messages written.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            pending, self.pending = self.pending, []
+            if pending:
+                with self.connection:
+                    self.connection.executemany("INSERT INTO messages (session, role, text, time) VALUES (?, ?, ?, ?)", pending)
+        return len(pending)
+
+    def page(self, before: int = None, limit: int = 50, session: int = None) -> List[dict]:
+        """
+        Get a page of messages, going back from the newest.
+
+        Args:
+            before (int, optional): Only messages with an id below this, such as the oldest id of the last page. Defaults to None for the newest page.
+            limit (int): The number of messages. Defaults to 50.
+            session (int, optional): Only messages of this session. Defaults to None for every session.
+
+        Returns:
+            List[dict]: The messages, oldest first.
+        """
+        self.flush()
+        conditions, parameters = [], []
+        if before is not None:
+            conditions.append("id < ?")
+            parameters.append(before)
+        if session is not None:
+            conditions.append("session = ?")
+            parameters.append(session)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            rows = self.connection.execute(f"SELECT * FROM messages {where} ORDER BY id DESC LIMIT ?", parameters + [limit]).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def between(self, start: float, end: float, session: int = None) -> List[dict]:
+        """
+        Get the messages sent in a stretch of time.
+
+        Args:
+            start (float): The start, as a Unix time.
+            end (float): The end, as a Unix time.
+            session (int, optional): Only messages of this session. Defaults to None for every session.
+
+        Returns:
+            List[dict]: The messages, oldest first.
+        """
+        self.flush()
+        query = "SELECT * FROM messages WHERE time >= ? AND time < ?"
+        parameters = [start, end]
+        if session is not None:
+            query += " AND session = ?"
+            parameters.append(session)
+        with self.lock:
+            rows = self.connection.execute(query + " ORDER BY id", parameters).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, query: str, limit: int = 50, session: int = None) -> List[dict]:
+        """
+        Search the messages by text. Every word of the query matches as a prefix.
+
+        Matches are returned newest first rather than by relevance, which lets the index stop after
+        `limit` matches instead of ranking every message that contains a common word.
+
+        Args:
+            query (str): The words to search for.
+            limit (int): The maximum number of results. Defaults to 50.
+            session (int, optional): Only messages of this session. Defaults to None for every session.
+
+        Returns:
+            List[dict]: The matching messages, newest first.
+        """
+        words = [word.replace('"', '') for word in query.split()]
+        words = [word for word in words if word]
+        if not words:
+            return []
+        self.flush()
+        condition, parameters = ("AND messages.session = ?", [session]) if session is not None else ("", [])
+        with self.lock:
+            if self.searchable:
+                rows = self.connection.execute(
+                    f"""
+                    SELECT messages.* FROM messages_search JOIN messages ON messages.id = messages_search.rowid
+                    WHERE messages_search MATCH ? {condition} ORDER BY messages_search.rowid DESC LIMIT ?
+                    """,
+                    [' '.join(f'"{word}"*' for word in words)] + parameters + [limit]
+                ).fetchall()
+            else:
+                rows = self.connection.execute(
+                    "SELECT * FROM messages WHERE " + ' AND '.join(['text LIKE ?'] * len(words)) +
+                    f" {condition} ORDER BY id DESC LIMIT ?",
+                    [f'%{word}%' for word in words] + parameters + [limit]
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def sessions(self, limit: int = 50) -> List[dict]:
+        """
+        Get the sessions that have messages, newest first.
+
+        Args:
+            limit (int): The number of sessions. Defaults to 50.
+
+        Returns:
+            List[dict]: The id, start time and number of messages of every session.
+        """
+        self.flush()
+        with self.lock:
+            rows = self.connection.execute(
+                """
+                SELECT sessions.id, sessions.started, COUNT(messages.id) AS messages
+                FROM sessions JOIN messages ON messages.session = sessions.id
+                GROUP BY sessions.id ORDER BY sessions.id DESC LIMIT ?
+                """,
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_legacy(self, path: str = LEGACY_HISTORY_FILE) -> int:
+        """
+        Copy the history from the old text file into a session of its own, once.
+
+        Args:
+            path (str): The path of the text file. Defaults to Persistence Documents/conversation_history.txt.
+
+        Returns:
+            int: The number of messages imported.
+        """
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+                return 0
+        messages = []
+        if os.path.exists(path):
+            with open(path, 'r') as fr:
+                messages = parse_legacy_history(fr.read())
+        started = os.path.getmtime(path) if os.path.exists(path) else time.time()
+        with self.lock, self.connection:
+            if messages:
+                session = self.connection.execute("INSERT INTO sessions (started) VALUES (?)", (started,)).lastrowid
+                self.connection.executemany("INSERT INTO messages (session, role, text, time) VALUES (?, ?, ?, ?)",
+                                            [(session, role, text, started) for role, text in messages])
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)", (str(time.time()),))
+        logging.info(f"Imported {len(messages)} messages from {path}")
+        return len(messages)
+
+    def clear(self) -> None:
+        """
+        Delete every message and session, and start a new session.
+        """
+        with self.lock:
+            self.pending.clear()
+            with self.connection:
+                self.connection.execute("DELETE FROM messages")
+                self.connection.execute("DELETE FROM sessions")
+        self.start_session()
+
+    def close(self) -> None:
+        """
+        Write the pending messages and close the database connection.
+        """
+        self.flush()
+        with self.lock:
+            self.connection.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Print or search the conversation history.')
+    parser.add_argument('query', nargs='?', help='words to search for, instead of printing the latest messages')
+    parser.add_argument('-s', '--session', type=int, help='only this session')
+    parser.add_argument('-n', '--limit', type=int, default=50, help='number of messages')
+    args = parser.parse_args()
+
+    store = ConversationStore()
+    store.import_legacy()
+    if args.query:
+        messages = store.search(args.query, limit=args.limit, session=args.session)
+    else:
+        messages = store.page(limit=args.limit, session=args.session)
+    for message in messages:
+        stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(message['time']))
+        print(f"[{message['session']}] {stamp} {message['role']}: {message['text']}")
+    store.close()
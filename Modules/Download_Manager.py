@@ -0,0 +1,568 @@
+import os
+import json
+import uuid
+import heapq
+import hashlib
+import logging
+import threading
+from yt_dlp.utils import DownloadCancelled
+from typing import Callable, Dict, List, Optional
+from Progress_Channel import ProgressChannel
+from Session_Pool import YoutubeDLPool
+from Youtube_Downloader import session_pool, is_network_error
+
+
+QUEUE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Json', 'download_queue.json')
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+QUEUED = 'queued'
+DOWNLOADING = 'downloading'
+PAUSED = 'paused'
+RETRYING = 'retrying'
+CANCELLED = 'cancelled'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+# Network failures are retried this many times, with a growing delay, before the job fails.
+MAX_ATTEMPTS = 5
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the SHA-256 hash of a file without reading it into memory at once.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadJob:
+    """
+    A single audio or video download handled by the DownloadManager.
+
+    Attributes:
+        id (str): The id of the job.
+        url (str): The YouTube link to download.
+        type (str): The type of download ('Audio' or 'Video').
+        title (str): The title of the video.
+        priority (int): The priority of the job, lower runs first.
+        status (str): One of queued, downloading, paused, retrying, cancelled, finished or failed.
+        progress (float): The download progress in percent.
+        filepath (str): The path of the downloaded file once finished.
+        error (str): The error message if the job failed.
+        attempts (int): The number of network failures so far.
+        partial_file (str): The partial file being written, kept so the download can be continued.
+        downloaded_bytes (int): The number of bytes of the current stream already on disk.
+        total_bytes (int): The expected size of the current stream.
+        size (int): The size of the finished file.
+        sha256 (str): The SHA-256 hash of the finished file.
+        video_id (str): The YouTube video id, known once the download has started.
+        duration (float): The duration of the video in seconds.
+    """
+
+    def __init__(self, url: str, type: str, title: str = '', priority: int = PRIORITY_NORMAL, id: str = None,
+                 status: str = QUEUED, progress: float = 0.0, filepath: str = '', error: str = '', attempts: int = 0,
+                 partial_file: str = '', downloaded_bytes: int = 0, total_bytes: int = 0, size: int = 0, sha256: str = '',
+                 video_id: str = '', duration: float = 0.0):
+        """
+        Initialize the DownloadJob class.
+
+        Args:
+            url (str): The YouTube link to download.
+            type (str): The type of download ('Audio' or 'Video').
+            title (str): The title of the video. Defaults to ''.
+            priority (int): The priority of the job, lower runs first. Defaults to PRIORITY_NORMAL.
+            id (str, optional): The id of the job. Defaults to a new random id.
+            status (str): The status of the job. Defaults to queued.
+            progress (float): The download progress in percent. Defaults to 0.0.
+            filepath (str): The path of the downloaded file. Defaults to ''.
+            error (str): The error message if the job failed. Defaults to ''.
+            attempts (int): The number of network failures so far. Defaults to 0.
+            partial_file (str): The partial file being written. Defaults to ''.
+            downloaded_bytes (int): The number of bytes of the current stream on disk. Defaults to 0.
+            total_bytes (int): The expected size of the current stream. Defaults to 0.
+            size (int): The size of the finished file. Defaults to 0.
+            sha256 (str): The SHA-256 hash of the finished file. Defaults to ''.
+            video_id (str): The YouTube video id. Defaults to ''.
+            duration (float): The duration of the video in seconds. Defaults to 0.0.
+        """
+        self.id = id if id else uuid.uuid4().hex[:8]
+        self.url = url
+        self.type = type
+        self.title = title
+        self.priority = priority
+        self.status = status
+        self.progress = progress
+        self.filepath = filepath
+        self.error = error
+        self.attempts = attempts
+        self.partial_file = partial_file
+        self.downloaded_bytes = downloaded_bytes
+        self.total_bytes = total_bytes
+        self.size = size
+        self.sha256 = sha256
+        self.video_id = video_id
+        self.duration = duration
+
+    def to_dict(self) -> dict:
+        """
+        Convert the job to a dictionary for the persistent queue.
+
+        Returns:
+            dict: The job's fields.
+        """
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DownloadJob':
+        """
+        Create a job from a dictionary saved in the persistent queue.
+
+        Args:
+            data (dict): The job's fields.
+
+        Returns:
+            DownloadJob: The job.
+        """
+        return cls(**data)
+
+
+class DownloadManager:
+    """
+    Run audio and video downloads on a bounded pool of workers.
+
+    Jobs wait in a priority queue that is saved to disk, so queued and paused downloads
+    survive a restart. Workers check a YoutubeDL for the download type out of the shared session
+    pool for each job. Every time a job's progress or status changes, listeners are called with it on
+    the worker thread and it is published on the progress channel for the UI.
+
+    Partial files are kept when a job is paused or the connection drops, and network failures are
+    retried with a growing delay, so an interrupted download continues where it stopped. Finished
+    files are checked against the size the server reported and their hash is recorded.
+
+    When a media library is given, videos it already holds are not downloaded again and
+    finished downloads are added to it.
+
+    Attributes:
+        pool (YoutubeDLPool): The YoutubeDL sessions the downloads run on.
+        library (MediaLibrary): The catalog of downloaded files, or None.
+        queue_file (str): The path of the persistent queue.
+        jobs (Dict[str, DownloadJob]): All known jobs by id.
+        queue (list): The heap of (priority, sequence, job id) waiting to run.
+        listeners (List[Callable[[DownloadJob], None]]): Callbacks for job updates, run on the worker thread.
+        channel (ProgressChannel): Throttled, thread-safe delivery of job updates to the Tk thread.
+        workers (List[threading.Thread]): The worker threads.
+        running_ids (set): The ids of the jobs being downloaded, guarded by the condition.
+    """
+
+    def __init__(self, pool: YoutubeDLPool = session_pool, max_workers: int = 2, queue_file: str = QUEUE_FILE,
+                 library=None):
+        """
+        Initialize the DownloadManager class.
+
+        Args:
+            pool (YoutubeDLPool): The YoutubeDL sessions the downloads run on. Defaults to the shared session pool.
+            max_workers (int): The number of downloads that may run at once. Defaults to 2.
+            queue_file (str): The path of the persistent queue. Defaults to Json/download_queue.json.
+            library (MediaLibrary, optional): The catalog of downloaded files. Defaults to None.
+        """
+        self.pool = pool
+        self.library = library
+        self.queue_file = queue_file
+        self.jobs: Dict[str, DownloadJob] = {}
+        self.queue = []
+        self.sequence = 0
+        self.running = True
+        self.listeners: List[Callable[[DownloadJob], None]] = []
+        self.channel = ProgressChannel()
+        self.condition = threading.Condition()
+        self.save_lock = threading.Lock()
+        self.running_ids = set()
+        if library is not None:
+            self.add_listener(library.add_job)
+        self.load_queue()
+        self.workers = [threading.Thread(target=self._worker, name=f'download-{i}', daemon=True) for i in range(max_workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def load_queue(self) -> None:
+        """
+        Load unfinished jobs from the persistent queue.
+        """
+        try:
+            with open(self.queue_file, 'r') as qf:
+                saved_jobs = json.load(qf)
+        except (OSError, ValueError):
+            return
+        with self.condition:
+            for data in saved_jobs:
+                job = DownloadJob.from_dict(data)
+                if job.status in (DOWNLOADING, RETRYING):
+                    job.status = QUEUED
+                self.jobs[job.id] = job
+                if job.status == QUEUED:
+                    self._push(job)
+        logging.info(f"Loaded {len(self.jobs)} unfinished downloads")
+
+    def save_queue(self) -> None:
+        """
+        Save the unfinished jobs to the persistent queue.
+        """
+        with self.condition:
+            unfinished = [job.to_dict() for job in self.jobs.values() if job.status in (QUEUED, DOWNLOADING, PAUSED, RETRYING)]
+        with self.save_lock:
+            with open(self.queue_file + '.tmp', 'w') as qf:
+                json.dump(unfinished, qf, indent=4)
+            os.replace(self.queue_file + '.tmp', self.queue_file)
+
+    def _push(self, job: DownloadJob) -> None:
+        """
+        Put a job on the heap. The caller must hold the condition.
+
+        Args:
+            job (DownloadJob): The job to queue.
+        """
+        self.sequence += 1
+        heapq.heappush(self.queue, (job.priority, self.sequence, job.id))
+        self.condition.notify()
+
+    def submit(self, url: str, type: str, title: str = '', priority: int = PRIORITY_NORMAL) -> DownloadJob:
+        """
+        Queue a download. If the media library already holds the video, a finished job for the existing file
+        is returned instead.
+
+        Args:
+            url (str): The YouTube link to download.
+            type (str): The type of download ('Audio' or 'Video').
+            title (str): The title of the video. Defaults to ''.
+            priority (int): The priority of the job, lower runs first. Defaults to PRIORITY_NORMAL.
+
+        Returns:
+            DownloadJob: The queued job.
+        """
+        existing = self.library.find_download(url, type) if self.library is not None else None
+        if existing is not None:
+            job = DownloadJob(url, type, title=existing['title'], priority=priority, status=FINISHED, progress=100.0,
+                              filepath=existing['path'], size=existing['size'], sha256=existing['sha256'],
+                              video_id=existing['video_id'], duration=existing['duration'])
+            with self.condition:
+                self.jobs[job.id] = job
+            logging.info(f"Skipped {job.title}, already downloaded to {job.filepath} ---{type}")
+            self.notify(job)
+            return job
+        job = DownloadJob(url, type, title=title, priority=priority)
+        with self.condition:
+            self.jobs[job.id] = job
+            self._push(job)
+        self.save_queue()
+        self.notify(job)
+        return job
+
+    def submit_many(self, entries: List[dict], type: str, priority: int = PRIORITY_LOW) -> List[DownloadJob]:
+        """
+        Queue a download for every search result in a list, such as a whole result page.
+
+        Args:
+            entries (List[dict]): Search results with a 'url' and a 'title'.
+            type (str): The type of download ('Audio' or 'Video').
+            priority (int): The priority of the jobs. Defaults to PRIORITY_LOW.
+
+        Returns:
+            List[DownloadJob]: The queued jobs.
+        """
+        return [self.submit(entry['url'], type, title=entry.get('title', ''), priority=priority) for entry in entries]
+
+    def cancel(self, job_id: str) -> None:
+        """
+        Cancel a job. A running download stops at its next progress update.
+
+        Args:
+            job_id (str): The id of the job.
+        """
+        self._set_status(job_id, CANCELLED, (QUEUED, DOWNLOADING, PAUSED, RETRYING))
+        job = self.jobs.get(job_id)
+        if job is not None and job.status == CANCELLED and self._running_job(job_id) is None:
+            self.remove_partial_files(job)
+
+    def pause(self, job_id: str) -> None:
+        """
+        Pause a job. A running download stops at its next progress update and keeps its partial file.
+
+        Args:
+            job_id (str): The id of the job.
+        """
+        self._set_status(job_id, PAUSED, (QUEUED, DOWNLOADING, RETRYING))
+
+    def resume(self, job_id: str) -> None:
+        """
+        Put a paused, failed or retrying job back in the queue. The download continues from the partial file.
+
+        Args:
+            job_id (str): The id of the job.
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status not in (PAUSED, FAILED, RETRYING):
+                return
+            if job.status != RETRYING:
+                job.attempts = 0
+            job.status = QUEUED
+            job.error = ''
+            self._push(job)
+        self.save_queue()
+        self.notify(job)
+
+    def _set_status(self, job_id: str, status: str, allowed: tuple) -> None:
+        """
+        Change the status of a job if it is currently in one of the allowed states.
+
+        Args:
+            job_id (str): The id of the job.
+            status (str): The new status.
+            allowed (tuple): The statuses the job may be changed from.
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status not in allowed:
+                return
+            job.status = status
+        self.save_queue()
+        self.notify(job)
+
+    def progress(self, job_ids: List[str] = None) -> dict:
+        """
+        Aggregate the progress of several jobs.
+
+        Args:
+            job_ids (List[str], optional): The jobs to include. Defaults to all known jobs.
+
+        Returns:
+            dict: The number of jobs, how many are finished, failed, active or paused, and the overall percent.
+        """
+        with self.condition:
+            jobs = [self.jobs[i] for i in job_ids if i in self.jobs] if job_ids is not None else list(self.jobs.values())
+        counted = [job for job in jobs if job.status != CANCELLED]
+        return {
+            'jobs': len(jobs),
+            'finished': sum(job.status == FINISHED for job in jobs),
+            'failed': sum(job.status == FAILED for job in jobs),
+            'active': sum(job.status in (QUEUED, DOWNLOADING, RETRYING) for job in jobs),
+            'paused': sum(job.status == PAUSED for job in jobs),
+            'percent': sum(100.0 if job.status == FINISHED else job.progress for job in counted) / len(counted) if counted else 0.0
+        }
+
+    def verify(self, job: DownloadJob) -> bool:
+        """
+        Check that a finished job's file is still on disk and still matches its recorded hash.
+
+        Args:
+            job (DownloadJob): The finished job.
+
+        Returns:
+            bool: True if the file is intact, False otherwise.
+        """
+        if not job.filepath or not os.path.exists(job.filepath):
+            return False
+        if job.size and os.path.getsize(job.filepath) != job.size:
+            return False
+        return not job.sha256 or file_digest(job.filepath) == job.sha256
+
+    def remove_partial_files(self, job: DownloadJob) -> None:
+        """
+        Delete the partial file of a cancelled job along with the resume state kept next to it.
+
+        Args:
+            job (DownloadJob): The cancelled job.
+        """
+        if not job.partial_file:
+            return
+        for path in (job.partial_file, job.partial_file + '.ytdl', job.partial_file + '.aria2'):
+            if os.path.exists(path):
+                os.remove(path)
+        job.partial_file = ''
+
+    def add_listener(self, listener: Callable[[DownloadJob], None]) -> None:
+        """
+        Register a callback for job updates. It is called on the worker thread.
+
+        Args:
+            listener (Callable[[DownloadJob], None]): The callback.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[DownloadJob], None]) -> None:
+        """
+        Unregister a callback for job updates.
+
+        Args:
+            listener (Callable[[DownloadJob], None]): The callback.
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, job: DownloadJob) -> None:
+        """
+        Call every listener with an updated job and publish it on the progress channel.
+
+        Args:
+            job (DownloadJob): The updated job.
+        """
+        self.channel.publish(job.id, job)
+        for listener in list(self.listeners):
+            try:
+                listener(job)
+            except Exception as e:
+                logging.error(f"Download listener failed: {e}")
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers once their current downloads finish, keeping the queue on disk.
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def _next_job(self) -> Optional[DownloadJob]:
+        """
+        Wait for the next queued job.
+
+        Returns:
+            Optional[DownloadJob]: The job, or None when the manager is shutting down.
+        """
+        with self.condition:
+            while self.running:
+                while self.queue:
+                    _, _, job_id = heapq.heappop(self.queue)
+                    job = self.jobs.get(job_id)
+                    if job is not None and job.status == QUEUED:
+                        job.status = DOWNLOADING
+                        return job
+                self.condition.wait()
+        return None
+
+    def _running_job(self, job_id: str) -> Optional[DownloadJob]:
+        """
+        Get a job if a worker is currently downloading it.
+
+        Args:
+            job_id (str): The id of the job.
+
+        Returns:
+            Optional[DownloadJob]: The job if it is running, otherwise None.
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            return job if job is not None and job.id in self.running_ids else None
+
+    def _retry_later(self, job: DownloadJob) -> None:
+        """
+        Put a job that lost its connection back in the queue after a delay that grows with every attempt.
+
+        Args:
+            job (DownloadJob): The job to retry.
+        """
+        def requeue():
+            with self.condition:
+                if job.status != RETRYING:
+                    return
+                job.status = QUEUED
+                self._push(job)
+            self.notify(job)
+
+        timer = threading.Timer(min(2 ** job.attempts, 60), requeue)
+        timer.daemon = True
+        timer.start()
+
+    def _worker(self) -> None:
+        """
+        Run queued jobs until the manager shuts down.
+        """
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self.save_queue()
+            self.notify(job)
+            self._run(job)
+            self.save_queue()
+            self.notify(job)
+
+    def _run(self, job: DownloadJob) -> None:
+        """
+        Download a job on the current worker.
+
+        Args:
+            job (DownloadJob): The job to run.
+        """
+        # The hook is bound to the job because yt-dlp may call it from its fragment threads
+        state = {'size_mismatch': ''}
+        with self.condition:
+            self.running_ids.add(job.id)
+        try:
+            with self.pool.session(job.type, lambda d: self._progress_hook(job, state, d)) as ydl:
+                info = ydl.extract_info(job.url, download=True)
+            job.title = info.get('title', job.title)
+            job.video_id = info.get('id', job.video_id)
+            job.duration = info.get('duration') or job.duration
+            downloads = info.get('requested_downloads') or [{}]
+            job.filepath = downloads[0].get('filepath', '')
+            if state['size_mismatch']:
+                raise ValueError(state['size_mismatch'])
+            job.size = os.path.getsize(job.filepath)
+            job.sha256 = file_digest(job.filepath)
+            job.partial_file = ''
+            job.progress = 100.0
+            job.status = FINISHED
+            logging.info(f"{job.filepath} Successfully ---{job.type} sha256={job.sha256}")
+        except DownloadCancelled:
+            if job.status == CANCELLED:
+                self.remove_partial_files(job)
+            logging.info(f"{job.status.capitalize()} {job.title or job.url} ---{job.type}")
+        except Exception as e:
+            job.error = str(e)
+            if is_network_error(e) and job.attempts + 1 < MAX_ATTEMPTS:
+                job.attempts += 1
+                job.status = RETRYING
+                self._retry_later(job)
+                logging.info(f"Connection lost while downloading {job.title or job.url}, retry {job.attempts} ---{job.type}")
+            else:
+                job.status = FAILED
+                logging.info(f"Failed to Download {job.title or job.url} ---{job.type}")
+        finally:
+            with self.condition:
+                self.running_ids.discard(job.id)
+
+    def _progress_hook(self, job: DownloadJob, state: dict, d: dict) -> None:
+        """
+        Update the running job from a yt-dlp progress event, stopping it if it was paused or cancelled.
+
+        Args:
+            job (DownloadJob): The running job.
+            state (dict): The job's run state, where a size mismatch is recorded.
+            d (dict): The download status dictionary.
+        """
+        if job.status in (PAUSED, CANCELLED):
+            raise DownloadCancelled(f'Download {job.status}')
+        if d['status'] == 'downloading':
+            job.partial_file = d.get('tmpfilename') or job.partial_file
+            job.downloaded_bytes = d.get('downloaded_bytes') or 0
+            job.total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+            if job.total_bytes:
+                job.progress = min(100.0, job.downloaded_bytes * 100.0 / job.total_bytes)
+            self.notify(job)
+        elif d['status'] == 'finished':
+            # The server's reported size is only exact for 'total_bytes', not for the estimate
+            expected, received = d.get('total_bytes'), d.get('downloaded_bytes')
+            if expected and received and expected != received:
+                state['size_mismatch'] = f"Size mismatch for {d.get('filename')}: expected {expected} bytes, got {received}"
@@ -1,22 +1,31 @@
+from __future__ import annotations
+
 import os 
-import torch
 import shutil
 import logging
 import warnings
 import requests
 from dotenv import load_dotenv
-from langchain.chains import RetrievalQA
-from langchain_community.vectorstores import Chroma
-from langchain_community.llms import HuggingFacePipeline
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
-from langchain_core._api.deprecation import LangChainDeprecationWarning
-from langchain_community.embeddings import SentenceTransformerEmbeddings
-from langchain_community.output_parsers.rail_parser import GuardrailsOutputParser
-from langchain_community.document_loaders import PyPDFLoader, DirectoryLoader, PDFMinerLoader, TextLoader
+from typing import TYPE_CHECKING
+from Lazy_Import import lazy_import
+
+if TYPE_CHECKING:
+    from langchain.chains import RetrievalQA
+    from langchain_community.vectorstores import Chroma
+    from langchain_community.llms import HuggingFacePipeline
+
+# torch, transformers and langchain take seconds to import, so they are only imported once a file chat starts
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+chains = lazy_import('langchain.chains')
+text_splitter = lazy_import('langchain.text_splitter')
+deprecation = lazy_import('langchain_core._api.deprecation')
+vectorstores = lazy_import('langchain_community.vectorstores')
+llms = lazy_import('langchain_community.llms')
+embeddings = lazy_import('langchain_community.embeddings')
+document_loaders = lazy_import('langchain_community.document_loaders')
 
 logging.getLogger().addHandler(logging.NullHandler())
-warnings.filterwarnings("ignore", category=LangChainDeprecationWarning)
 
 class FileChat:
     """
@@ -30,8 +39,9 @@ class FileChat:
     
     def __init__(self):
         """Initialize the FileChat class."""
+        warnings.filterwarnings("ignore", category=deprecation.LangChainDeprecationWarning)
         self.KEY = os.getenv('HUGGINGFACE_KEY')
-        self.embeddings = SentenceTransformerEmbeddings(model_name='all-MiniLM-L6-v2')
+        self.embeddings = embeddings.SentenceTransformerEmbeddings(model_name='all-MiniLM-L6-v2')
         self.Database = self.load_embedding()
 
     def chat(self):
@@ -72,14 +82,14 @@ class FileChat:
             for file in files:
                 if file.endswith('.pdf'):
                     print(file)
-                    loader = PDFMinerLoader(os.path.join(root, file))
+                    loader = document_loaders.PDFMinerLoader(os.path.join(root, file))
                 elif file.endswith('.txt'):
                     print(file)
-                    loader = TextLoader((os.path.join(root, file)), encoding='utf-8')
+                    loader = document_loaders.TextLoader((os.path.join(root, file)), encoding='utf-8')
         documents = loader.load()
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=200)
-        texts = text_splitter.split_documents(documents)
-        Database = Chroma.from_documents(texts, self.embeddings, persist_directory='./Database')
+        splitter = text_splitter.RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=200)
+        texts = splitter.split_documents(documents)
+        Database = vectorstores.Chroma.from_documents(texts, self.embeddings, persist_directory='./Database')
         Database = None
 
     def qa_llm(self) -> RetrievalQA:
@@ -91,7 +101,7 @@ class FileChat:
         """
         llm = self.load_llm()
         retriever = self.Database.as_retriever()
-        return RetrievalQA.from_chain_type(
+        return chains.RetrievalQA.from_chain_type(
             llm=llm,
             chain_type='stuff',
             retriever=retriever,
@@ -106,8 +116,8 @@ class FileChat:
             HuggingFacePipeline: The loaded HuggingFacePipeline.
         """
         CHECKPOINT = './Models/LaMini' if os.path.exists('./Models/LaMini') else "MBZUAI/LaMini-T5-738M"
-        TOKENIZER = AutoTokenizer.from_pretrained(CHECKPOINT, token=self.KEY)
-        BASE_MODEL = AutoModelForSeq2SeqLM.from_pretrained(
+        TOKENIZER = transformers.AutoTokenizer.from_pretrained(CHECKPOINT, token=self.KEY)
+        BASE_MODEL = transformers.AutoModelForSeq2SeqLM.from_pretrained(
             CHECKPOINT,
             device_map="auto",
             torch_dtype=torch.float32,
@@ -117,7 +127,7 @@ class FileChat:
         if not os.path.exists('./Models/LaMini'):
             TOKENIZER.save_pretrained('./Models/LaMini')
             BASE_MODEL.save_pretrained('./Models/LaMini')
-        return HuggingFacePipeline(pipeline=pipeline(
+        return llms.HuggingFacePipeline(pipeline=transformers.pipeline(
             "text2text-generation",
             model=BASE_MODEL,
             max_length=256,
@@ -150,7 +160,7 @@ class FileChat:
         Returns:
             Chroma: The loaded Chroma database.
         """
-        return Chroma(persist_directory='./Database', embedding_function=self.embeddings)
+        return vectorstores.Chroma(persist_directory='./Database', embedding_function=self.embeddings)
 
     def basic_ingest(self, file_path: str) -> bool:
         """
@@ -163,14 +173,14 @@ class FileChat:
             bool: True if the ingestion is successful, False otherwise.
         """
         if file_path.endswith('.pdf'):
-            loader = PDFMinerLoader(file_path)
+            loader = document_loaders.PDFMinerLoader(file_path)
         elif file_path.endswith('.txt'):
-            loader = TextLoader(file_path, encoding='utf-8')
+            loader = document_loaders.TextLoader(file_path, encoding='utf-8')
         documents = loader.load()
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=200)
-        texts = text_splitter.split_documents(documents)
+        splitter = text_splitter.RecursiveCharacterTextSplitter(chunk_size=200, chunk_overlap=200)
+        texts = splitter.split_documents(documents)
         try:
-            Chroma.from_documents(texts, self.embeddings, persist_directory='./Database')
+            vectorstores.Chroma.from_documents(texts, self.embeddings, persist_directory='./Database')
             return True
         except:
             return False
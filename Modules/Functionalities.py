@@ -1,29 +1,57 @@
 import os
-import time
-import fitz
 import random
 import datetime
+import functools
 import subprocess
 from typing import Tuple
 from File_Chat import FileChat
 from dotenv import load_dotenv
-from transformers import pipeline
 from Youtube_Downloader import YoutubeDownloader, say
+from Connectivity import ConnectivityMonitor, shared_monitor
+from Wikipedia_Provider import WikipediaProvider
+from Retry_Policy import Retrier
+from Lazy_Import import lazy_import
 from concurrent.futures import ThreadPoolExecutor
 
+fitz = lazy_import('fitz')
+transformers = lazy_import('transformers')
+
+
+
+OFFLINE_MESSAGE = " I Think You Do Not Have Internet Connection At The Moment"
+
+
+@functools.lru_cache(maxsize=1)
+def load_summarizer():
+    """
+    Load the summarization pipeline once and keep it for later summaries.
+
+    Returns:
+        The transformers summarization pipeline.
+    """
+    os.environ['TOKENIZERS_PARALLELISM'] = 'False'
+    model_name = "sshleifer/distilbart-cnn-12-6"
+    model_revision = "a4f8f3e"
+    return transformers.pipeline("summarization", model=model_name, revision=model_revision)
 
 
 class Functionalities:
-    def __init__(self, speak: bool, say_function):
+    def __init__(self, speak: bool, say_function, connectivity: ConnectivityMonitor = None, retry_reporter=None):
         """
         Initialize the Functionalities class.
 
         Args:
             speak (bool): Flag indicating whether to use speech.
             say_function (callable): Function to handle speaking text.
+            connectivity (ConnectivityMonitor, optional): Lets online-only actions fail fast when offline. Defaults to the shared monitor.
+            retry_reporter (callable, optional): Receives the intent, whether it succeeded and the result or error
+                of actions retried in the background. Defaults to None.
         """
         self.speak = speak
         self.say = say_function
+        self.connectivity = connectivity if connectivity is not None else shared_monitor
+        self.wikipedia = WikipediaProvider(connectivity=self.connectivity)
+        self.retrier = Retrier(reporter=retry_reporter)
 
     def open_cmd(self, prompt: str) -> Tuple[str, str]:
         """
@@ -48,13 +76,14 @@ class Functionalities:
         Returns:
             Tuple[str, str]: Empty strings if successful, otherwise error messages.
         """
+        if not self.connectivity.is_online():
+            return OFFLINE_MESSAGE, OFFLINE_MESSAGE
         try:
             query = prompt[(prompt.index("-p"))+3:] if "-p" in prompt else "Google"
             import pywhatkit as kit
-            kit.search(query)
+            self.retrier.run('search-google', lambda: kit.search(query))
             return "", ''
         except Exception as e:
-            time.sleep(2)
             return random.choice([
                 " Sorry There Seems To Be Problem",
                 " I Think You Do Not Have Internet Connection At The Moment"
@@ -73,13 +102,14 @@ class Functionalities:
         Returns:
             Tuple[str, str]: Empty strings if successful, otherwise error messages.
         """
+        if not self.connectivity.is_online():
+            return OFFLINE_MESSAGE, OFFLINE_MESSAGE
         try:
             video = prompt[(prompt.index("-p"))+3:] if "-p" in prompt else "Youtube"
             import pywhatkit as kit
-            kit.playonyt(video), f'Playing {video}'
+            self.retrier.run('play-youtube-video', lambda: kit.playonyt(video))
             return '', ''
         except Exception as e:
-            time.sleep(2)
             return random.choice([
                 " Sorry There Seems To Be Problem",
                 " I Think You Do Not Have Internet Connection At The Moment"
@@ -105,11 +135,14 @@ class Functionalities:
             sentences = 2
 
         try:
-            import wikipedia
-            result = wikipedia.summary(query, sentences=sentences)
+            # Cached and offline summaries still work without a connection, so only the API checks it
+            result = self.retrier.run('wikipedia-search', lambda: self.wikipedia.summary(query, sentences=sentences))
             return result, result
-        except (wikipedia.exceptions.DisambiguationError, wikipedia.exceptions.PageError, Exception) as e:
-            time.sleep(2)
+        except ConnectionError:
+            return OFFLINE_MESSAGE, OFFLINE_MESSAGE
+        except LookupError:
+            return f" Sorry, I Could Not Find Anything On {query}", f" Sorry, I Could Not Find Anything On {query}"
+        except Exception as e:
             return random.choice([
                 f" Sorry There Seems To Be Problem",
                 f" I Think You Do Not Have Internet Connection At The Moment"
@@ -157,17 +190,13 @@ class Functionalities:
         Returns:
             Tuple[str, str]: The summarized text for printing and speaking, or error messages.
         """
-        os.environ['TOKENIZERS_PARALLELISM'] = False
-        model_name = "sshleifer/distilbart-cnn-12-6"
-        model_revision = "a4f8f3e"
-        summarisation = pipeline("summarization", model=model_name, revision=model_revision)
+        summarisation = load_summarizer()
 
         article = prompt[(prompt.index("-p"))+3:] if "-p" in prompt else "What Should I Summarize? \033[1m(Add flag `-p` to specify)"
         try:
-            summary = summarisation(article, max_length=250, min_length=100, do_sample=False)[0]['summary_text']
+            summary = self.retrier.run('summarizer', lambda: summarisation(article, max_length=250, min_length=100, do_sample=False)[0]['summary_text'])
             return summary, summary
         except Exception as e:
-            time.sleep(2)
             return random.choice([
                 f" Sorry There Seems To Be Problem",
                 f" I Think You Do Not Have Internet Connection At The Moment"
@@ -203,7 +232,7 @@ class Functionalities:
         Returns:
             Tuple[str, str]: Empty strings.
         """
-        YoutubeDownloader(self.speak, self.say).mini_youtube()
+        YoutubeDownloader(self.speak, self.say, connectivity=self.connectivity).mini_youtube()
         return "", ""
 
     def repeat(self, prompt: str) -> Tuple[str, str]:
@@ -263,10 +292,7 @@ class Functionalities:
             except Exception as e:
                 return f"Failed to read text file: {str(e)}", ""
 
-        os.environ['TOKENIZERS_PARALLELISM'] = 'False'
-        model_name = "sshleifer/distilbart-cnn-12-6"
-        model_revision = "a4f8f3e"
-        summarisation = pipeline("summarization", model=model_name, revision=model_revision)
+        summarisation = load_summarizer()
 
 
         if len(article) > 500:
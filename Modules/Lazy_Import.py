@@ -0,0 +1,81 @@
+import types
+import importlib
+import threading
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    A stand-in for a module that is only imported when one of its attributes is first used.
+
+    Heavy dependencies such as torch, transformers and langchain can be bound at the top of a
+    module with `torch = lazy_import('torch')` and used as usual, while the import itself happens
+    the first time a feature needs them instead of when the application starts.
+
+    Attributes:
+        __name__ (str): The name of the module stood in for.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the LazyModule class.
+
+        Args:
+            name (str): The name of the module to import on first use.
+        """
+        super().__init__(name)
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        """
+        Import the module if it has not been imported yet.
+
+        Returns:
+            types.ModuleType: The module.
+        """
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        """
+        Get an attribute of the module, importing it first if needed.
+
+        Args:
+            attribute (str): The name of the attribute.
+
+        Returns:
+            Any: The attribute.
+        """
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        """
+        List the attributes of the module, importing it first if needed.
+        """
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        """
+        Describe the stand-in and whether the module has been imported.
+        """
+        return f"<lazy module '{self.__name__}'{'' if self.__dict__['_module'] is None else ' (loaded)'}>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a module that is imported the first time one of its attributes is used.
+
+    Args:
+        name (str): The name of the module, such as 'torch' or 'langchain.chains'.
+
+    Returns:
+        LazyModule: The stand-in for the module.
+    """
+    return LazyModule(name)
@@ -0,0 +1,310 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Optional
+from urllib.parse import urlparse, parse_qs
+from Download_Manager import FINISHED, file_digest
+
+
+LIBRARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Persistence Documents', 'media_library.db')
+DOWNLOAD_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Downloads')
+
+AUDIO_FORMATS = {'mp3', 'm4a', 'opus', 'ogg', 'wav', 'flac'}
+VIDEO_FORMATS = {'mp4', 'webm', 'mkv', 'mov', 'avi'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    video_id TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT '',
+    format TEXT NOT NULL DEFAULT '',
+    size INTEGER NOT NULL DEFAULT 0,
+    duration REAL NOT NULL DEFAULT 0,
+    sha256 TEXT NOT NULL DEFAULT '',
+    mtime REAL NOT NULL DEFAULT 0,
+    added REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS media_video ON media (video_id, type);
+"""
+
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS media_search USING fts5 (title, content='media', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS media_search_insert AFTER INSERT ON media BEGIN
+    INSERT INTO media_search (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_delete AFTER DELETE ON media BEGIN
+    INSERT INTO media_search (media_search, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS media_search_update AFTER UPDATE OF title ON media BEGIN
+    INSERT INTO media_search (media_search, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO media_search (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+
+def video_id(url: str) -> str:
+    """
+    Get the YouTube video id from a link.
+
+    Args:
+        url (str): A youtube.com or youtu.be link.
+
+    Returns:
+        str: The video id, or '' if the link has none.
+    """
+    parsed = urlparse(url)
+    if parsed.netloc.endswith('youtu.be'):
+        return parsed.path.strip('/')
+    if parsed.path.startswith('/shorts/'):
+        return parsed.path.split('/')[2]
+    return parse_qs(parsed.query).get('v', [''])[0]
+
+
+def media_type(format: str) -> str:
+    """
+    Get the download type of a file format.
+
+    Args:
+        format (str): The file extension without the dot.
+
+    Returns:
+        str: 'Audio' or 'Video'.
+    """
+    return 'Audio' if format in AUDIO_FORMATS else 'Video'
+
+
+class MediaLibrary:
+    """
+    A SQLite catalog of the files in the Downloads folder.
+
+    Finished downloads are added as they complete, so the folder only has to be rescanned for files that
+    changed outside the app, and the scan skips files whose size and modification time are unchanged.
+    Titles are indexed with FTS5 so searching stays instant with thousands of files.
+
+    Attributes:
+        path (str): The path of the database file.
+        download_directory (str): The folder the catalog covers.
+        connection (sqlite3.Connection): The connection, shared by all threads under a lock.
+        searchable (bool): Whether the FTS5 title index is available.
+    """
+
+    def __init__(self, path: str = LIBRARY_FILE, download_directory: str = DOWNLOAD_DIRECTORY):
+        """
+        Initialize the MediaLibrary class.
+
+        Args:
+            path (str): The path of the database file. Defaults to Persistence Documents/media_library.db.
+            download_directory (str): The folder the catalog covers. Defaults to Downloads.
+        """
+        self.path = path
+        self.download_directory = download_directory
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+            try:
+                self.connection.executescript(SEARCH_SCHEMA)
+                self.searchable = True
+            except sqlite3.OperationalError:
+                logging.info("SQLite has no FTS5, falling back to LIKE for media search")
+                self.searchable = False
+
+    def add(self, path: str, video_id: str = '', title: str = '', duration: float = 0.0, sha256: str = '') -> dict:
+        """
+        Add a file to the catalog, or update it if it is already there.
+
+        Args:
+            path (str): The path of the file.
+            video_id (str): The YouTube video id. Defaults to ''.
+            title (str): The title. Defaults to the catalogued title, or the file name for a new entry.
+            duration (float): The duration in seconds. Defaults to 0.0.
+            sha256 (str): The SHA-256 hash of the file. Computed if not given.
+
+        Returns:
+            dict: The catalog entry.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        name, extension = os.path.splitext(os.path.basename(path))
+        format = extension.lstrip('.').lower()
+        entry = {
+            'path': path,
+            'video_id': video_id,
+            'title': title,
+            'type': media_type(format),
+            'format': format,
+            'size': stat.st_size,
+            'duration': duration,
+            'sha256': sha256 or file_digest(path),
+            'mtime': stat.st_mtime,
+            'added': time.time()
+        }
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT INTO media (path, video_id, title, type, format, size, duration, sha256, mtime, added)
+                VALUES (:path, :video_id, CASE WHEN :title != '' THEN :title ELSE :name END,
+                        :type, :format, :size, :duration, :sha256, :mtime, :added)
+                ON CONFLICT (path) DO UPDATE SET
+                    video_id = CASE WHEN excluded.video_id != '' THEN excluded.video_id ELSE media.video_id END,
+                    title = CASE WHEN :title != '' THEN :title ELSE media.title END,
+                    type = excluded.type, format = excluded.format, size = excluded.size,
+                    duration = CASE WHEN excluded.duration > 0 THEN excluded.duration ELSE media.duration END,
+                    sha256 = excluded.sha256, mtime = excluded.mtime
+                """,
+                dict(entry, name=name)
+            )
+        entry['title'] = entry['title'] or name
+        return entry
+
+    def add_job(self, job) -> None:
+        """
+        Add the file of a finished download to the catalog. Meant to be used as a download manager listener.
+
+        Args:
+            job (DownloadJob): The download.
+        """
+        if job.status != FINISHED or not job.filepath or not os.path.exists(job.filepath):
+            return
+        self.add(job.filepath, video_id=job.video_id or video_id(job.url), title=job.title,
+                 duration=job.duration, sha256=job.sha256)
+        logging.info(f"Added {job.filepath} to the media library")
+
+    def remove(self, path: str) -> None:
+        """
+        Remove a file from the catalog.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM media WHERE path = ?", (os.path.abspath(path),))
+
+    def find_download(self, url: str, type: str) -> Optional[dict]:
+        """
+        Find an already downloaded file for a YouTube link.
+
+        Args:
+            url (str): The YouTube link.
+            type (str): The type of download ('Audio' or 'Video').
+
+        Returns:
+            Optional[dict]: The catalog entry, or None if the video has not been downloaded.
+        """
+        return self.find(video_id(url), type)
+
+    def find(self, video_id: str, type: str) -> Optional[dict]:
+        """
+        Find an already downloaded file for a video, so the download can be skipped.
+
+        Entries whose file has been deleted are dropped from the catalog.
+
+        Args:
+            video_id (str): The YouTube video id.
+            type (str): The type of download ('Audio' or 'Video').
+
+        Returns:
+            Optional[dict]: The catalog entry, or None if the video has not been downloaded.
+        """
+        if not video_id:
+            return None
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT * FROM media WHERE video_id = ? AND type = ? ORDER BY added DESC", (video_id, type)
+            ).fetchall()
+        for row in rows:
+            if os.path.exists(row['path']):
+                return dict(row)
+            self.remove(row['path'])
+        return None
+
+    def search(self, query: str, limit: int = 50) -> List[dict]:
+        """
+        Search the catalog by title. Every word of the query matches as a prefix.
+
+        Args:
+            query (str): The words to search for.
+            limit (int): The maximum number of results. Defaults to 50.
+
+        Returns:
+            List[dict]: The matching catalog entries, best match first.
+        """
+        words = [word.replace('"', '') for word in query.split()]
+        words = [word for word in words if word]
+        if not words:
+            return []
+        with self.lock:
+            if self.searchable:
+                rows = self.connection.execute(
+                    """
+                    SELECT media.* FROM media_search JOIN media ON media.id = media_search.rowid
+                    WHERE media_search MATCH ? ORDER BY rank LIMIT ?
+                    """,
+                    (' '.join(f'"{word}"*' for word in words), limit)
+                ).fetchall()
+            else:
+                rows = self.connection.execute(
+                    "SELECT * FROM media WHERE " + ' AND '.join(['title LIKE ?'] * len(words)) + " ORDER BY added DESC LIMIT ?",
+                    [f'%{word}%' for word in words] + [limit]
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def entries(self) -> List[dict]:
+        """
+        Get every catalog entry, newest first.
+
+        Returns:
+            List[dict]: The catalog entries.
+        """
+        with self.lock:
+            rows = self.connection.execute("SELECT * FROM media ORDER BY added DESC").fetchall()
+        return [dict(row) for row in rows]
+
+    def scan(self) -> dict:
+        """
+        Bring the catalog up to date with the Downloads folder.
+
+        Only new files and files whose size or modification time changed are hashed; entries for files
+        that no longer exist are removed.
+
+        Returns:
+            dict: The number of files 'added', 'updated', 'removed' and 'unchanged'.
+        """
+        start = time.time()
+        with self.lock:
+            known = {row['path']: (row['size'], row['mtime']) for row in self.connection.execute("SELECT path, size, mtime FROM media")}
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+        seen = set()
+        if os.path.isdir(self.download_directory):
+            for entry in os.scandir(self.download_directory):
+                format = os.path.splitext(entry.name)[1].lstrip('.').lower()
+                if not entry.is_file() or format not in AUDIO_FORMATS | VIDEO_FORMATS:
+                    continue
+                path = os.path.abspath(entry.path)
+                seen.add(path)
+                stat = entry.stat()
+                if known.get(path) == (stat.st_size, stat.st_mtime):
+                    counts['unchanged'] += 1
+                    continue
+                counts['updated' if path in known else 'added'] += 1
+                try:
+                    self.add(path)
+                except OSError as e:
+                    logging.error(f"Could not add {path} to the media library: {e}")
+        for path in set(known) - seen:
+            self.remove(path)
+            counts['removed'] += 1
+        logging.info(f"Scanned media library in {time.time() - start:.2f}s: {counts}")
+        return counts
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self.lock:
+            self.connection.close()
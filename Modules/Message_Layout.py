@@ -0,0 +1,237 @@
+import math
+from typing import Dict, List, Tuple
+
+
+class HeightIndex:
+    """
+    The heights of a list of rows, with their offsets kept in a Fenwick tree.
+
+    Appending a row, changing a row's height, getting a row's offset and finding the row at an
+    offset all take O(log n) time, however many rows there are.
+
+    Attributes:
+        heights (List[int]): The height of every row.
+        tree (List[int]): The Fenwick tree of the heights, indexed from 1.
+    """
+
+    def __init__(self):
+        """
+        Initialize the HeightIndex class.
+        """
+        self.heights: List[int] = []
+        self.tree: List[int] = [0]
+
+    def __len__(self) -> int:
+        """
+        The number of rows.
+        """
+        return len(self.heights)
+
+    def append(self, height: int) -> None:
+        """
+        Add a row at the end.
+
+        Args:
+            height (int): The height of the row.
+        """
+        self.heights.append(height)
+        i = len(self.heights)
+        # A node holds the sum of the rows (i - lowbit(i), i], all but the last of which are already indexed
+        self.tree.append(height + self.offset(i - 1) - self.offset(i - (i & -i)))
+
+    def set(self, index: int, height: int) -> None:
+        """
+        Change the height of a row.
+
+        Args:
+            index (int): The index of the row.
+            height (int): The new height.
+        """
+        delta = height - self.heights[index]
+        self.heights[index] = height
+        i = index + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def offset(self, index: int) -> int:
+        """
+        Get the total height of the rows before a row.
+
+        Args:
+            index (int): The index of the row.
+
+        Returns:
+            int: The offset of the row.
+        """
+        total = 0
+        i = index
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    @property
+    def total(self) -> int:
+        """
+        The total height of all rows.
+        """
+        return self.offset(len(self.heights))
+
+    def find(self, y: int) -> int:
+        """
+        Find the row at an offset.
+
+        Args:
+            y (int): The offset.
+
+        Returns:
+            int: The index of the row that contains the offset, clamped to the rows there are.
+        """
+        index = 0
+        remaining = y
+        step = 1 << len(self.tree).bit_length()
+        while step:
+            if index + step < len(self.tree) and self.tree[index + step] <= remaining:
+                index += step
+                remaining -= self.tree[index]
+            step >>= 1
+        return min(index, len(self.heights) - 1)
+
+
+class MessageLayout:
+    """
+    The vertical layout of a chat history, for drawing only the messages in view.
+
+    Every message takes its bubble's height plus a gap. Heights are estimated from the text until the
+    bubble has been drawn and measured, and measured heights are cached by text, role and width so
+    the same message is never measured twice.
+
+    Attributes:
+        width (int): The width text wraps at in pixels.
+        gap (int): The space below each message in pixels.
+        top (int): The space above the first message in pixels.
+        line_height (int): The estimated height of a line of text in pixels.
+        char_width (int): The estimated width of a character in pixels.
+        padding (int): The estimated height a bubble adds around its text in pixels.
+        messages (List[Tuple[str, str]]): The text and role of every message.
+        measured (List[bool]): Whether the height of each message has been measured.
+        index (HeightIndex): The heights of the messages.
+        height_cache (Dict[Tuple[str, str, int], int]): Measured bubble heights by text, role and width.
+    """
+
+    def __init__(self, width: int = 300, gap: int = 40, top: int = 100, line_height: int = 18, char_width: int = 7,
+                 padding: int = 28):
+        """
+        Initialize the MessageLayout class.
+
+        Args:
+            width (int): The width text wraps at in pixels. Defaults to 300.
+            gap (int): The space below each message in pixels. Defaults to 40.
+            top (int): The space above the first message in pixels. Defaults to 100.
+            line_height (int): The estimated height of a line of text in pixels. Defaults to 18.
+            char_width (int): The estimated width of a character in pixels. Defaults to 7.
+            padding (int): The estimated height a bubble adds around its text in pixels. Defaults to 28.
+        """
+        self.width = width
+        self.gap = gap
+        self.top = top
+        self.line_height = line_height
+        self.char_width = char_width
+        self.padding = padding
+        self.messages: List[Tuple[str, str]] = []
+        self.measured: List[bool] = []
+        self.index = HeightIndex()
+        self.height_cache: Dict[Tuple[str, str, int], int] = {}
+
+    def __len__(self) -> int:
+        """
+        The number of messages.
+        """
+        return len(self.messages)
+
+    def estimate(self, text: str) -> int:
+        """
+        Estimate the height of a bubble from its text.
+
+        Args:
+            text (str): The text of the message.
+
+        Returns:
+            int: The estimated height in pixels.
+        """
+        per_line = max(self.width // self.char_width, 1)
+        lines = sum(max(math.ceil(len(line) / per_line), 1) for line in text.split('\n'))
+        return lines * self.line_height + self.padding
+
+    def append(self, text: str, role: str) -> int:
+        """
+        Add a message at the end.
+
+        Args:
+            text (str): The text of the message.
+            role (str): Who sent it, 'user' or 'assistant'.
+
+        Returns:
+            int: The index of the message.
+        """
+        cached = self.height_cache.get((text, role, self.width))
+        self.messages.append((text, role))
+        self.measured.append(cached is not None)
+        self.index.append((cached if cached is not None else self.estimate(text)) + self.gap)
+        return len(self.messages) - 1
+
+    def measure(self, index: int, height: int) -> bool:
+        """
+        Record the measured height of a message's bubble.
+
+        Args:
+            index (int): The index of the message.
+            height (int): The measured height in pixels.
+
+        Returns:
+            bool: True if the height differs from the one assumed so far, so later messages have moved.
+        """
+        text, role = self.messages[index]
+        self.height_cache[(text, role, self.width)] = height
+        self.measured[index] = True
+        if self.index.heights[index] == height + self.gap:
+            return False
+        self.index.set(index, height + self.gap)
+        return True
+
+    def y(self, index: int) -> int:
+        """
+        Get the top of a message.
+
+        Args:
+            index (int): The index of the message.
+
+        Returns:
+            int: The y coordinate in pixels.
+        """
+        return self.top + self.index.offset(index)
+
+    @property
+    def height(self) -> int:
+        """
+        The height of the whole history in pixels.
+        """
+        return self.top + self.index.total
+
+    def visible(self, top: int, bottom: int) -> range:
+        """
+        Get the messages that overlap a stretch of the history.
+
+        Args:
+            top (int): The top of the stretch in pixels.
+            bottom (int): The bottom of the stretch in pixels.
+
+        Returns:
+            range: The indices of the messages.
+        """
+        if not self.messages or bottom < self.top:
+            return range(0)
+        first = self.index.find(max(top - self.top, 0))
+        last = self.index.find(max(bottom - self.top, 0))
+        return range(first, last + 1)
@@ -0,0 +1,103 @@
+import tkinter as tk
+from PIL import Image, ImageSequence, ImageTk
+from typing import Callable, Dict, List, Sequence
+
+
+# Sizes the orb is drawn at: the first while idle, larger ones as speech gets louder
+ORB_SIZES = (200, 216, 233, 250)
+
+
+def load_frames(path: str) -> List[Image.Image]:
+    """
+    Read every frame of a GIF as RGBA images.
+
+    Args:
+        path (str): The path of the GIF.
+
+    Returns:
+        List[Image.Image]: The frames.
+    """
+    with Image.open(path) as img:
+        return [frame.convert('RGBA') for frame in ImageSequence.Iterator(img)]
+
+
+class OrbAnimation:
+    """
+    Play an animated GIF on a label from frames rendered once at a few sizes.
+
+    Every frame is resized to every size and turned into a PhotoImage when the animation is created,
+    so a tick only has to pick one of them. A single `after` timer advances the frames, asking
+    `size_for` which size to show on every tick.
+
+    Attributes:
+        container (tk.Label): The label the frames are shown on.
+        sizes (Sequence[int]): The sizes the frames are rendered at.
+        delay (int): The time between frames in milliseconds.
+        size_for (Callable[[], int]): Returns the size wanted for the next frame.
+        frames (Dict[int, List[ImageTk.PhotoImage]]): The rendered frames by size.
+        index (int): The index of the frame shown.
+    """
+
+    def __init__(self, container: tk.Label, path: str, size_for: Callable[[], int], sizes: Sequence[int] = ORB_SIZES,
+                 delay: int = 50):
+        """
+        Initialize the OrbAnimation class.
+
+        Args:
+            container (tk.Label): The label the frames are shown on.
+            path (str): The path of the GIF.
+            size_for (Callable[[], int]): Returns the size wanted for the next frame.
+            sizes (Sequence[int]): The sizes the frames are rendered at. Defaults to ORB_SIZES.
+            delay (int): The time between frames in milliseconds. Defaults to 50.
+        """
+        self.container = container
+        self.sizes = sorted(sizes)
+        self.delay = delay
+        self.size_for = size_for
+        self.index = 0
+        self.after_id = None
+        source = load_frames(path)
+        self.frames: Dict[int, List[ImageTk.PhotoImage]] = {
+            size: [ImageTk.PhotoImage(frame.resize((size, size), Image.LANCZOS), master=container) for frame in source]
+            for size in self.sizes
+        }
+        container.bind('<Destroy>', lambda e: self.stop(), add='+')
+
+    def nearest_size(self, size: int) -> int:
+        """
+        Get the rendered size closest to a wanted size.
+
+        Args:
+            size (int): The wanted size.
+
+        Returns:
+            int: The closest rendered size.
+        """
+        return min(self.sizes, key=lambda s: abs(s - size))
+
+    def start(self) -> None:
+        """
+        Start the animation.
+        """
+        if self.after_id is None:
+            self._tick()
+
+    def stop(self) -> None:
+        """
+        Stop the animation.
+        """
+        if self.after_id is not None:
+            try:
+                self.container.after_cancel(self.after_id)
+            except tk.TclError:
+                pass
+            self.after_id = None
+
+    def _tick(self) -> None:
+        """
+        Show the next frame and schedule the one after it.
+        """
+        frames = self.frames[self.nearest_size(self.size_for())]
+        self.index = (self.index + 1) % len(frames)
+        self.container.configure(image=frames[self.index])
+        self.after_id = self.container.after(self.delay, self._tick)
@@ -0,0 +1,96 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class ProgressChannel:
+    """
+    Carry progress updates from worker threads to the Tk thread at a fixed frame rate.
+
+    Workers publish as often as they like; only the latest value per key is kept until the
+    next frame, when subscribers are called with it on the Tk thread through `after`.
+
+    Attributes:
+        interval (int): The time between frames in milliseconds.
+        latest (Dict[Hashable, Any]): The newest unpublished value for each key.
+        subscribers (List[Callable[[Any], None]]): Callbacks run on the Tk thread.
+        widget (tk.Misc): The widget whose `after` drives the frames.
+    """
+
+    def __init__(self, fps: int = 10):
+        """
+        Initialize the ProgressChannel class.
+
+        Args:
+            fps (int): The number of frames per second delivered to subscribers. Defaults to 10.
+        """
+        self.interval = int(1000 / fps)
+        self.lock = threading.Lock()
+        self.latest: Dict[Hashable, Any] = {}
+        self.subscribers: List[Callable[[Any], None]] = []
+        self.widget = None
+        self.after_id = None
+
+    def publish(self, key: Hashable, value: Any) -> None:
+        """
+        Record an update. Safe to call from any thread; earlier updates for the same key are replaced.
+
+        Args:
+            key (Hashable): What the update is about, such as a job id.
+            value (Any): The update.
+        """
+        with self.lock:
+            self.latest[key] = value
+
+    def subscribe(self, callback: Callable[[Any], None]) -> None:
+        """
+        Register a callback for updates. It is called on the Tk thread.
+
+        Args:
+            callback (Callable[[Any], None]): The callback.
+        """
+        if callback not in self.subscribers:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Any], None]) -> None:
+        """
+        Unregister a callback.
+
+        Args:
+            callback (Callable[[Any], None]): The callback.
+        """
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def start(self, widget) -> None:
+        """
+        Start delivering updates on the Tk thread.
+
+        Args:
+            widget (tk.Misc): The widget whose `after` drives the frames.
+        """
+        self.widget = widget
+        if self.after_id is None:
+            self._flush()
+
+    def stop(self) -> None:
+        """
+        Stop delivering updates.
+        """
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _flush(self) -> None:
+        """
+        Deliver the updates gathered since the last frame and schedule the next one.
+        """
+        with self.lock:
+            updates, self.latest = self.latest, {}
+        for value in updates.values():
+            for callback in list(self.subscribers):
+                try:
+                    callback(value)
+                except Exception as e:
+                    logging.error(f"Progress subscriber failed: {e}")
+        self.after_id = self.widget.after(self.interval, self._flush)
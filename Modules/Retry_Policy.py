@@ -0,0 +1,173 @@
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class RetryPolicy:
+    """
+    How often, and how long apart, a failed action is tried again.
+
+    Delays grow exponentially from the base delay up to the maximum, and each one is shortened by a
+    random amount of up to `jitter` of itself so retries from many callers do not line up.
+
+    Attributes:
+        attempts (int): The total number of tries, including the first one.
+        base_delay (float): The delay before the first retry in seconds.
+        max_delay (float): The longest delay in seconds.
+        jitter (float): The fraction of each delay that is randomized, between 0 and 1.
+        retry_on (Tuple[type, ...]): The errors worth retrying; others are reported at once.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 16.0, jitter: float = 0.5,
+                 retry_on: Tuple[type, ...] = (Exception,)):
+        """
+        Initialize the RetryPolicy class.
+
+        Args:
+            attempts (int): The total number of tries, including the first one. Defaults to 3.
+            base_delay (float): The delay before the first retry in seconds. Defaults to 1.0.
+            max_delay (float): The longest delay in seconds. Defaults to 16.0.
+            jitter (float): The fraction of each delay that is randomized. Defaults to 0.5.
+            retry_on (Tuple[type, ...]): The errors worth retrying. Defaults to every error.
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before a retry.
+
+        Args:
+            attempt (int): The number of tries that have failed so far.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * (1 - self.jitter * random.random())
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """
+        Check whether a failed action should be tried again.
+
+        Args:
+            error (Exception): The error of the last try.
+            attempt (int): The number of tries that have failed so far.
+
+        Returns:
+            bool: True if there are tries left and the error is worth retrying.
+        """
+        return attempt < self.attempts and isinstance(error, self.retry_on)
+
+
+# Policies of the chatbot intents. Intents without one are not retried.
+INTENT_POLICIES: Dict[str, RetryPolicy] = {
+    'search-google': RetryPolicy(attempts=3, base_delay=2.0),
+    'play-youtube-video': RetryPolicy(attempts=3, base_delay=2.0),
+    'wikipedia-search': RetryPolicy(attempts=4, base_delay=1.0, retry_on=(ConnectionError,)),
+    'summarizer': RetryPolicy(attempts=2, base_delay=1.0, retry_on=(OSError,)),
+}
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class Retrier:
+    """
+    Run actions once in the caller's thread and retry failures in the background.
+
+    A failure returns to the caller straight away, so it can answer without waiting, while the
+    retries run on timers. The reporter is called from the timer thread with the outcome: the
+    result if a retry succeeded, or the last error once the policy gives up.
+
+    Attributes:
+        policies (Dict[str, RetryPolicy]): The policy of each intent.
+        reporter (Callable[[str, bool, Any], None]): Called with the intent, whether a retry succeeded and its result or error.
+    """
+
+    def __init__(self, policies: Dict[str, RetryPolicy] = None, reporter: Callable[[str, bool, Any], None] = None):
+        """
+        Initialize the Retrier class.
+
+        Args:
+            policies (Dict[str, RetryPolicy], optional): The policy of each intent. Defaults to INTENT_POLICIES.
+            reporter (Callable[[str, bool, Any], None], optional): Receives the outcome of background retries.
+        """
+        self.policies = policies if policies is not None else INTENT_POLICIES
+        self.reporter = reporter
+
+    def run(self, intent: str, action: Callable[[], Any]) -> Any:
+        """
+        Run an action, scheduling background retries if it fails.
+
+        Args:
+            intent (str): The intent the action belongs to, which selects the policy.
+            action (Callable[[], Any]): The action.
+
+        Returns:
+            Any: The action's result.
+
+        Raises:
+            Exception: The error of the first try, after the retries have been scheduled.
+        """
+        try:
+            return action()
+        except Exception as e:
+            self._schedule(intent, action, e, 1)
+            raise
+
+    def _schedule(self, intent: str, action: Callable[[], Any], error: Exception, attempt: int) -> None:
+        """
+        Retry an action after the policy's delay, or report the failure if the policy gives up.
+
+        Args:
+            intent (str): The intent the action belongs to.
+            action (Callable[[], Any]): The action.
+            error (Exception): The error of the last try.
+            attempt (int): The number of tries that have failed so far.
+        """
+        policy = self.policies.get(intent, NO_RETRY)
+        if not policy.should_retry(error, attempt):
+            if attempt > 1:
+                logging.info(f"Gave up on {intent} after {attempt} tries: {error}")
+                self._report(intent, False, error)
+            return
+        timer = threading.Timer(policy.delay(attempt), self._retry, args=(intent, action, attempt))
+        timer.daemon = True
+        timer.start()
+
+    def _retry(self, intent: str, action: Callable[[], Any], attempt: int) -> None:
+        """
+        Try an action again on the timer thread.
+
+        Args:
+            intent (str): The intent the action belongs to.
+            action (Callable[[], Any]): The action.
+            attempt (int): The number of tries that have failed so far.
+        """
+        try:
+            result = action()
+        except Exception as e:
+            self._schedule(intent, action, e, attempt + 1)
+        else:
+            logging.info(f"{intent} succeeded on try {attempt + 1}")
+            self._report(intent, True, result)
+
+    def _report(self, intent: str, succeeded: bool, value: Any) -> None:
+        """
+        Pass the outcome of background retries to the reporter.
+
+        Args:
+            intent (str): The intent the action belongs to.
+            succeeded (bool): Whether a retry succeeded.
+            value (Any): The result, or the last error.
+        """
+        if self.reporter is None:
+            return
+        try:
+            self.reporter(intent, succeeded, value)
+        except Exception as e:
+            logging.error(f"Retry reporter failed: {e}")
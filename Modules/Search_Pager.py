@@ -0,0 +1,116 @@
+from typing import Callable, Dict, List
+from Thumbnail_Loader import ThumbnailLoader, pick_thumbnail
+
+
+class SearchResultPager:
+    """
+    Page through saved mini-youtube search results, keeping the neighbouring pages warm.
+
+    The tile data of the current page and of the pages either side of it is prepared ahead of time,
+    and their thumbnails are loaded into the ThumbnailLoader's memory so a page flip only has to
+    reconfigure the tiles.
+
+    Attributes:
+        loader (ThumbnailLoader): The loader used to prefetch thumbnails.
+        format_title (Callable[[str], str]): Formats a result title for display on a tile.
+        page_size (int): The number of results on a page.
+        data (List[dict]): The search results.
+        start (int): The index of the first result on the current page.
+        tiles (Dict[int, List[dict]]): Prepared tile data keyed by the page's start index.
+    """
+
+    def __init__(self, loader: ThumbnailLoader, format_title: Callable[[str], str], page_size: int = 6):
+        """
+        Initialize the SearchResultPager class.
+
+        Args:
+            loader (ThumbnailLoader): The loader used to prefetch thumbnails.
+            format_title (Callable[[str], str]): Formats a result title for display on a tile.
+            page_size (int): The number of results on a page. Defaults to 6.
+        """
+        self.loader = loader
+        self.format_title = format_title
+        self.page_size = page_size
+        self.data: List[dict] = []
+        self.start = 0
+        self.tiles: Dict[int, List[dict]] = {}
+
+    @property
+    def end(self) -> int:
+        """
+        The index after the last result on the current page.
+        """
+        return self.start + self.page_size
+
+    def set_data(self, data: List[dict], reset: bool = False) -> None:
+        """
+        Replace the search results.
+
+        Args:
+            data (List[dict]): The new search results.
+            reset (bool): Whether to go back to the first page. Defaults to False.
+        """
+        self.data = data
+        self.tiles = {}
+        if reset:
+            self.start = 0
+        self.start = max(0, min(self.start, len(self.data) - self.page_size))
+
+    def page_items(self, start: int = None) -> List[dict]:
+        """
+        Get the prepared tile data for a page.
+
+        Args:
+            start (int, optional): The index of the first result on the page. Defaults to the current page.
+
+        Returns:
+            List[dict]: The tile data, each with the 'entry', 'title', 'duration' and 'thumbnail' of a result.
+        """
+        start = self.start if start is None else start
+        if start not in self.tiles:
+            self.tiles[start] = [
+                {
+                    'entry': entry,
+                    'title': self.format_title(entry['title']),
+                    'duration': entry['audio_length'],
+                    'thumbnail': pick_thumbnail(entry)
+                }
+                for entry in self.data[start:start + self.page_size]
+            ]
+        return self.tiles[start]
+
+    def back(self) -> None:
+        """
+        Move to the previous page.
+        """
+        self.start = max(0, self.start - self.page_size)
+
+    def forward(self) -> None:
+        """
+        Move to the next page, stopping at the last full page.
+        """
+        self.start = max(0, min(self.start + self.page_size, len(self.data) - self.page_size))
+
+    def page_label(self) -> str:
+        """
+        Get the text for the page indicator.
+
+        Returns:
+            str: The current page and page count.
+        """
+        if not self.data:
+            return 'Page: 0/0'
+        return f'Page: {int(self.end/self.page_size)}/{int(len(self.data)/self.page_size)}'
+
+    def prefetch(self, target_width: int = 250) -> None:
+        """
+        Prepare the tile data and load the thumbnails of the pages either side of the current one.
+
+        Args:
+            target_width (int): The width of the tile thumbnails. Defaults to 250.
+        """
+        previous_start = max(0, self.start - self.page_size)
+        next_start = max(0, min(self.start + self.page_size, len(self.data) - self.page_size))
+        for start in {previous_start, next_start} - {self.start}:
+            for tile in self.page_items(start):
+                self.loader.prefetch(tile['thumbnail'], target_width=target_width)
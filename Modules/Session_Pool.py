@@ -0,0 +1,125 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+from yt_dlp import YoutubeDL
+
+
+# Extractors created ahead of time by warm(), so the first search or download does not pay for them
+WARM_EXTRACTORS = ('Youtube', 'YoutubeSearch', 'YoutubeTab')
+
+
+class YoutubeDLPool:
+    """
+    Reuse YoutubeDL sessions instead of building one for every call.
+
+    Sessions are grouped by option profile, such as 'search' or 'Audio'. A session is checked out by one
+    caller at a time and returned when the caller is done, keeping its initialized extractors and
+    HTTP connections for the next caller. Every session has a single progress hook that forwards events
+    to the hook of whoever has it checked out, including events raised on yt-dlp's fragment threads.
+
+    Attributes:
+        profiles (Dict[str, Callable[[], dict]]): The option factory of each profile.
+        max_idle (int): The number of idle sessions kept per profile; extra returned sessions are closed.
+        idle (Dict[str, List[YoutubeDL]]): The sessions waiting to be checked out, by profile.
+        created (Dict[str, int]): The number of sessions created so far, by profile.
+    """
+
+    def __init__(self, profiles: Dict[str, Callable[[], dict]], max_idle: int = 4):
+        """
+        Initialize the YoutubeDLPool class.
+
+        Args:
+            profiles (Dict[str, Callable[[], dict]]): A function returning fresh YoutubeDL options for each profile.
+            max_idle (int): The number of idle sessions kept per profile. Defaults to 4.
+        """
+        self.profiles = profiles
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle: Dict[str, List[YoutubeDL]] = {profile: [] for profile in profiles}
+        self.created: Dict[str, int] = {profile: 0 for profile in profiles}
+        self.hooks: Dict[int, Callable[[dict], None]] = {}
+
+    def _create(self, profile: str) -> YoutubeDL:
+        """
+        Create a session for a profile.
+
+        Args:
+            profile (str): The option profile.
+
+        Returns:
+            YoutubeDL: The new session.
+        """
+        options = self.profiles[profile]()
+        holder: Dict[str, Callable[[dict], None]] = {}
+
+        def dispatch(d: dict) -> None:
+            hook = holder.get('hook')
+            if hook is not None:
+                hook(d)
+
+        options['progress_hooks'] = [dispatch]
+        session = YoutubeDL(options)
+        with self.lock:
+            self.hooks[id(session)] = holder
+            self.created[profile] += 1
+        return session
+
+    @contextmanager
+    def session(self, profile: str, progress_hook: Callable[[dict], None] = None) -> Iterator[YoutubeDL]:
+        """
+        Check out a session for a profile, creating one if none is idle, and return it afterwards.
+
+        Args:
+            profile (str): The option profile.
+            progress_hook (Callable[[dict], None], optional): Receives the session's progress events while checked out.
+
+        Yields:
+            YoutubeDL: The session.
+        """
+        with self.lock:
+            session = self.idle[profile].pop() if self.idle[profile] else None
+        if session is None:
+            session = self._create(profile)
+        holder = self.hooks[id(session)]
+        holder['hook'] = progress_hook
+        try:
+            yield session
+        finally:
+            holder['hook'] = None
+            with self.lock:
+                keep = len(self.idle[profile]) < self.max_idle
+                if keep:
+                    self.idle[profile].append(session)
+                else:
+                    del self.hooks[id(session)]
+            if not keep:
+                session.close()
+
+    def warm(self, *profiles: str, extractors: Tuple[str, ...] = WARM_EXTRACTORS) -> None:
+        """
+        Create an idle session for each profile and initialize its YouTube extractors.
+
+        Args:
+            *profiles (str): The profiles to warm. Defaults to all of them.
+            extractors (Tuple[str, ...]): The extractors to initialize. Defaults to the YouTube ones.
+        """
+        for profile in profiles or tuple(self.profiles):
+            with self.session(profile) as session:
+                for extractor in extractors:
+                    try:
+                        session.get_info_extractor(extractor)
+                    except Exception as e:
+                        logging.error(f"Could not initialize the {extractor} extractor: {e}")
+
+    def close(self) -> None:
+        """
+        Close every idle session.
+        """
+        with self.lock:
+            sessions = [session for idle in self.idle.values() for session in idle]
+            for idle in self.idle.values():
+                idle.clear()
+            self.hooks.clear()
+        for session in sessions:
+            session.close()
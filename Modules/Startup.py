@@ -0,0 +1,82 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class Warmup:
+    """
+    Run the work the main window needs before it can be shown on a background thread.
+
+    Steps run one after another in the order they were added. Each has a weight for how long it
+    takes compared to the others, so the progress can be shown on the splash screen while the
+    steps run. The results and timings of the steps are kept by name.
+
+    Attributes:
+        steps (List[Tuple[str, str, Callable[[], Any], float]]): The name, label, action and weight of every step.
+        results (Dict[str, Any]): What each finished step returned, by name.
+        timings (Dict[str, float]): How long each finished step took in seconds, by name.
+        label (str): The label of the step running.
+        completed (float): The total weight of the finished steps.
+        error (Exception): The error that stopped the warm-up, or None.
+        done (threading.Event): Set once every step has run or one has failed.
+    """
+
+    def __init__(self):
+        """
+        Initialize the Warmup class.
+        """
+        self.steps: List[Tuple[str, str, Callable[[], Any], float]] = []
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.label = ''
+        self.error = None
+        self.done = threading.Event()
+        self.completed = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, name: str, label: str, action: Callable[[], Any], weight: float = 1) -> None:
+        """
+        Add a step.
+
+        Args:
+            name (str): The name the step's result and timing are kept under.
+            label (str): What the splash screen shows while the step runs.
+            action (Callable[[], Any]): The work of the step.
+            weight (float): How long the step takes compared to the others. Defaults to 1.
+        """
+        self.steps.append((name, label, action, weight))
+
+    @property
+    def progress(self) -> float:
+        """
+        The fraction of the work done, from 0 to 1.
+        """
+        total = sum(step[3] for step in self.steps)
+        with self.lock:
+            return self.completed / total if total else 1.0
+
+    def start(self) -> None:
+        """
+        Start running the steps on a background thread.
+        """
+        threading.Thread(target=self._run, name='warmup', daemon=True).start()
+
+    def _run(self) -> None:
+        """
+        Run the steps, stopping at the first that fails.
+        """
+        try:
+            for name, label, action, weight in self.steps:
+                self.label = label
+                start = time.perf_counter()
+                self.results[name] = action()
+                self.timings[name] = time.perf_counter() - start
+                logging.info(f"Startup step {name} took {self.timings[name]:.2f}s")
+                with self.lock:
+                    self.completed += weight
+        except Exception as e:
+            logging.error(f"Startup step {self.label} failed: {e}")
+            self.error = e
+        finally:
+            self.done.set()
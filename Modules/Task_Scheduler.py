@@ -0,0 +1,298 @@
+import time
+import logging
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Set
+
+
+# Workers per queue: network requests overlap well, while a model or speech engine is used one task at a time
+DEFAULT_LIMITS = {'network': 4, 'model': 1, 'io': 2, 'audio': 1}
+
+
+class TaskQueue(Executor):
+    """
+    A named pool of worker threads with a fixed size that keeps count of its tasks.
+
+    It is an Executor, so modules that take one, such as the thumbnail loader and the speech
+    renderer, can share it instead of starting threads of their own.
+
+    Attributes:
+        name (str): The name of the queue.
+        max_workers (int): The number of tasks run at the same time.
+        executor (ThreadPoolExecutor): The worker threads.
+        pending (int): The number of tasks waiting for a worker.
+        running (int): The number of tasks running.
+        completed (int): The number of tasks that ran to the end, with or without an error.
+        failed (int): The number of tasks that raised an error.
+        cancelled (int): The number of tasks cancelled before they started.
+        total_wait (float): The time tasks spent waiting for a worker in seconds.
+        max_wait (float): The longest a task waited for a worker in seconds.
+        total_run (float): The time tasks spent running in seconds.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize the TaskQueue class.
+
+        Args:
+            name (str): The name of the queue, also used for the names of its threads.
+            max_workers (int): The number of tasks run at the same time.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{name}-task')
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue a task.
+
+        Args:
+            fn (Callable[..., Any]): The task.
+            *args: The positional arguments of the task.
+            **kwargs: The keyword arguments of the task.
+
+        Returns:
+            Future: Resolves to the task's result.
+        """
+        submitted = time.perf_counter()
+
+        def run() -> Any:
+            started = time.perf_counter()
+            with self.lock:
+                self.pending -= 1
+                self.running += 1
+                self.total_wait += started - submitted
+                self.max_wait = max(self.max_wait, started - submitted)
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with self.lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self.lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.total_run += time.perf_counter() - started
+
+        with self.lock:
+            self.pending += 1
+        future = self.executor.submit(run)
+        future.add_done_callback(self._count_cancelled)
+        return future
+
+    def _count_cancelled(self, future: Future) -> None:
+        """
+        Count a task that was cancelled before it started.
+
+        Args:
+            future (Future): The task's future.
+        """
+        if future.cancelled():
+            with self.lock:
+                self.pending -= 1
+                self.cancelled += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get the depth of the queue and the latency of its tasks.
+
+        Returns:
+            Dict[str, float]: The pending, running, completed, failed and cancelled task counts, and the mean
+            and longest wait for a worker and the mean run time in milliseconds.
+        """
+        with self.lock:
+            started = self.completed + self.running
+            return {
+                'pending': self.pending,
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'mean_wait_ms': self.total_wait / started * 1000 if started else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+                'mean_run_ms': self.total_run / self.completed * 1000 if self.completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            wait (bool): Whether to wait for running tasks to finish. Defaults to True.
+            cancel_futures (bool): Whether to cancel the tasks that have not started. Defaults to False.
+        """
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class Task:
+    """
+    A task submitted to the scheduler.
+
+    Attributes:
+        name (str): The name of the task's function, for logging.
+        future (Future): Resolves to the task's result.
+        group (str): The group the task can be cancelled with, or None.
+        cancelled (bool): Whether the task was cancelled. A cancelled task that had already started
+            runs to the end, but its result is dropped.
+    """
+
+    def __init__(self, name: str, group: str = None):
+        """
+        Initialize the Task class.
+
+        Args:
+            name (str): The name of the task's function.
+            group (str, optional): The group the task can be cancelled with. Defaults to None.
+        """
+        self.name = name
+        self.future = None
+        self.group = group
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Cancel the task if it has not started, and drop its result otherwise.
+        """
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class TaskScheduler:
+    """
+    Run background work on a few named queues, each with a bounded number of workers.
+
+    Tasks can be given a group, such as the page that started them, so they can all be cancelled
+    at once when the page goes away. Results and errors are handed to their callbacks through
+    `dispatch`, which the app points at the Tk thread, unless the task was cancelled first.
+
+    Attributes:
+        queues (Dict[str, TaskQueue]): The queues by name.
+        dispatch (Callable[[Callable[[], None]], None]): Runs a callback where it should run, such as on the Tk thread.
+        groups (Dict[str, Set[Task]]): The unfinished tasks of every group.
+    """
+
+    def __init__(self, limits: Dict[str, int] = None, dispatch: Callable[[Callable[[], None]], None] = None):
+        """
+        Initialize the TaskScheduler class.
+
+        Args:
+            limits (Dict[str, int], optional): The number of workers of each queue. Defaults to DEFAULT_LIMITS.
+            dispatch (Callable[[Callable[[], None]], None], optional): Runs result callbacks. Defaults to running
+                them on the worker thread.
+        """
+        self.queues: Dict[str, TaskQueue] = {name: TaskQueue(name, workers) for name, workers in (limits or DEFAULT_LIMITS).items()}
+        self.dispatch = dispatch if dispatch is not None else (lambda callback: callback())
+        self.groups: Dict[str, Set[Task]] = {}
+        self.lock = threading.Lock()
+
+    def queue(self, name: str) -> TaskQueue:
+        """
+        Get a queue, to hand to modules that take an Executor.
+
+        Args:
+            name (str): The name of the queue.
+
+        Returns:
+            TaskQueue: The queue.
+        """
+        return self.queues[name]
+
+    def submit(self, queue: str, fn: Callable[..., Any], *args, group: str = None,
+               on_result: Callable[[Any], None] = None, on_error: Callable[[Exception], None] = None, **kwargs) -> Task:
+        """
+        Queue a task.
+
+        Args:
+            queue (str): The name of the queue to run the task on.
+            fn (Callable[..., Any]): The task.
+            *args: The positional arguments of the task.
+            group (str, optional): The group the task can be cancelled with. Defaults to None.
+            on_result (Callable[[Any], None], optional): Called through `dispatch` with the result.
+            on_error (Callable[[Exception], None], optional): Called through `dispatch` with the error. Errors
+                are logged either way.
+            **kwargs: The keyword arguments of the task.
+
+        Returns:
+            Task: The task.
+        """
+        task = Task(getattr(fn, '__name__', repr(fn)), group)
+        if group is not None:
+            with self.lock:
+                self.groups.setdefault(group, set()).add(task)
+        task.future = self.queues[queue].submit(fn, *args, **kwargs)
+        task.future.add_done_callback(lambda future: self._finish(task, on_result, on_error))
+        return task
+
+    def _finish(self, task: Task, on_result: Callable[[Any], None], on_error: Callable[[Exception], None]) -> None:
+        """
+        Hand the outcome of a finished task to its callback.
+
+        Args:
+            task (Task): The task.
+            on_result (Callable[[Any], None]): Called with the result.
+            on_error (Callable[[Exception], None]): Called with the error.
+        """
+        if task.group is not None:
+            with self.lock:
+                self.groups.get(task.group, set()).discard(task)
+        if task.cancelled or task.future.cancelled():
+            return
+        error = task.future.exception()
+        if error is not None:
+            logging.error(f"Background task {task.name} failed: {error}")
+            callback, value = on_error, error
+        else:
+            callback, value = on_result, task.future.result()
+        if callback is None:
+            return
+        try:
+            # Checked again where the callback runs, in case the task was cancelled in between
+            self.dispatch(lambda: None if task.cancelled else callback(value))
+        except Exception as e:
+            logging.error(f"Could not deliver the outcome of a background task: {e}")
+
+    def cancel_group(self, group: str) -> int:
+        """
+        Cancel every unfinished task of a group.
+
+        Args:
+            group (str): The group.
+
+        Returns:
+            int: The number of tasks cancelled.
+        """
+        with self.lock:
+            tasks = self.groups.pop(group, set())
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the depth and latency metrics of every queue.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The metrics of each queue, by name.
+        """
+        return {name: queue.metrics() for name, queue in self.queues.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop every queue, cancelling the tasks that have not started.
+
+        Args:
+            wait (bool): Whether to wait for running tasks to finish. Defaults to False.
+        """
+        for queue in self.queues.values():
+            queue.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,297 @@
+import os
+import wave
+import shutil
+import hashlib
+import logging
+import platform
+import subprocess
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, List
+
+
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Cache', 'Speech')
+
+
+class SayBackend:
+    """
+    Speech through the macOS `say` command.
+
+    Attributes:
+        name (str): The name of the backend, part of the cache key.
+        extension (str): The audio format the backend renders.
+    """
+    name = 'say'
+    extension = 'aiff'
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Check whether the backend can run here.
+
+        Returns:
+            bool: True on macOS with `say` installed.
+        """
+        return platform.system() == 'Darwin' and shutil.which('say') is not None
+
+    def render(self, text: str, path: str) -> None:
+        """
+        Render text to an audio file.
+
+        Args:
+            text (str): The text to speak.
+            path (str): The file to write.
+        """
+        subprocess.run(['say', '-o', path, text], check=True)
+
+    def speak(self, text: str) -> None:
+        """
+        Speak text straight to the speakers.
+
+        Args:
+            text (str): The text to speak.
+        """
+        subprocess.run(['say', text])
+
+
+class EspeakBackend:
+    """
+    Speech through espeak-ng or espeak, for Linux and Windows.
+
+    Attributes:
+        name (str): The name of the backend, part of the cache key.
+        extension (str): The audio format the backend renders.
+        command (str): The espeak executable found on the path.
+    """
+    name = 'espeak'
+    extension = 'wav'
+
+    def __init__(self):
+        """
+        Initialize the EspeakBackend class.
+        """
+        self.command = shutil.which('espeak-ng') or shutil.which('espeak')
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Check whether the backend can run here.
+
+        Returns:
+            bool: True if espeak-ng or espeak is installed.
+        """
+        return bool(shutil.which('espeak-ng') or shutil.which('espeak'))
+
+    def render(self, text: str, path: str) -> None:
+        """
+        Render text to an audio file.
+
+        Args:
+            text (str): The text to speak.
+            path (str): The file to write.
+        """
+        subprocess.run([self.command, '-w', path, text], check=True)
+
+    def speak(self, text: str) -> None:
+        """
+        Speak text straight to the speakers.
+
+        Args:
+            text (str): The text to speak.
+        """
+        subprocess.run([self.command, text])
+
+
+class NullBackend:
+    """
+    Silent speech for machines without a speech engine, and for tests.
+
+    It renders silence about as long as the text would take to say.
+
+    Attributes:
+        name (str): The name of the backend, part of the cache key.
+        extension (str): The audio format the backend renders.
+        sample_rate (int): The sample rate of the rendered silence.
+    """
+    name = 'null'
+    extension = 'wav'
+    sample_rate = 16000
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Check whether the backend can run here.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    def render(self, text: str, path: str) -> None:
+        """
+        Render text to an audio file of silence.
+
+        Args:
+            text (str): The text to speak.
+            path (str): The file to write.
+        """
+        # Roughly three words a second, as a spoken reply would take
+        frames = int(self.sample_rate * max(len(text.split()), 1) / 3)
+        with wave.open(path, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.sample_rate)
+            w.writeframes(b'\x00\x00' * frames)
+
+    def speak(self, text: str) -> None:
+        """
+        Do nothing.
+
+        Args:
+            text (str): The text to speak.
+        """
+        return None
+
+
+BACKENDS = [SayBackend, EspeakBackend, NullBackend]
+
+
+def pick_backend():
+    """
+    Pick the first speech backend that can run on this machine.
+
+    Returns:
+        The backend instance.
+    """
+    for backend in BACKENDS:
+        if backend.available():
+            return backend()
+    return NullBackend()
+
+
+class TextToSpeech:
+    """
+    Render speech on a worker thread and cache the audio by text.
+
+    Rendered files are kept in the cache directory under a hash of the backend and the text, so a
+    reply that was spoken before plays without running the speech engine again. The oldest files
+    are removed once the cache holds more than `max_entries`.
+
+    Attributes:
+        backend: The speech backend.
+        cache_directory (str): Where rendered audio is kept.
+        max_entries (int): The number of rendered files kept.
+        executor (Executor): The single worker that renders speech in order.
+    """
+
+    def __init__(self, backend=None, cache_directory: str = CACHE_DIRECTORY, max_entries: int = 200, executor: Executor = None):
+        """
+        Initialize the TextToSpeech class.
+
+        Args:
+            backend (optional): The speech backend. Defaults to the first one available here.
+            cache_directory (str): Where rendered audio is kept. Defaults to Cache/Speech.
+            max_entries (int): The number of rendered files kept. Defaults to 200.
+            executor (Executor, optional): The single worker to render on. Defaults to a new one.
+        """
+        self.backend = backend if backend is not None else pick_backend()
+        self.cache_directory = cache_directory
+        self.max_entries = max_entries
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1, thread_name_prefix='speech')
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def path_for(self, text: str) -> str:
+        """
+        Get the cache file of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            str: The path of the rendered audio.
+        """
+        key = hashlib.sha1(f'{self.backend.name}|{text}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_directory, f'{key}.{self.backend.extension}')
+
+    def render(self, text: str) -> str:
+        """
+        Render text to audio on the calling thread, reusing the cached file if there is one.
+
+        Args:
+            text (str): The text to speak.
+
+        Returns:
+            str: The path of the rendered audio.
+        """
+        path = self.path_for(text)
+        if os.path.exists(path):
+            # Mark it as recently used so eviction keeps it
+            os.utime(path)
+            return path
+        temporary = f'{path}.tmp.{self.backend.extension}'
+        self.backend.render(text, temporary)
+        os.replace(temporary, path)
+        self.evict()
+        return path
+
+    def render_async(self, text: str, callback: Callable[[str], None] = None) -> Future:
+        """
+        Render text to audio on the worker thread.
+
+        Args:
+            text (str): The text to speak.
+            callback (Callable[[str], None], optional): Called on the worker thread with the path of the audio.
+
+        Returns:
+            Future: Resolves to the path of the rendered audio.
+        """
+        def run() -> str:
+            path = self.render(text)
+            if callback is not None:
+                callback(path)
+            return path
+
+        future = self.executor.submit(run)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def _log_failure(self, future: Future) -> None:
+        """
+        Log the error of a render that failed. Renders cancelled before they started are not errors.
+
+        Args:
+            future (Future): The render's future.
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Speech failed: {error}")
+
+    def speak(self, text: str) -> None:
+        """
+        Speak text straight to the speakers on the calling thread, without rendering a file.
+
+        Args:
+            text (str): The text to speak.
+        """
+        self.backend.speak(text)
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used files once the cache holds more than `max_entries`.
+        """
+        entries: List[os.DirEntry] = [e for e in os.scandir(self.cache_directory) if e.is_file() and '.tmp.' not in e.name]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker once queued speech has been rendered.
+        """
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,374 @@
+import os
+import hashlib
+import logging
+import threading
+import requests
+from io import BytesIO
+from PIL import Image, ImageTk
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Cache', 'Thumbnails')
+PLACEHOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Images', 'placeholder.jpg')
+
+# Widths the thumbnails are shown at: the search result tiles and the download screen.
+VARIANT_WIDTHS = (250, 350)
+
+
+def pick_thumbnail(entry: dict, target_width: int = max(VARIANT_WIDTHS)) -> str:
+    """
+    Pick the smallest thumbnail of a search result that is at least the target width wide.
+
+    Args:
+        entry (dict): A search result as saved in search_results.json.
+        target_width (int): The minimum width. Defaults to the largest variant width.
+
+    Returns:
+        str: The URL of the chosen thumbnail.
+    """
+    thumbnails = [t for t in entry.get('thumbnails', []) if t.get('width')]
+    if not thumbnails:
+        return entry.get('largest_thumbnail')
+    wide_enough = [t for t in thumbnails if t['width'] >= target_width]
+    if wide_enough:
+        return min(wide_enough, key=lambda t: t['width']).get('url')
+    return max(thumbnails, key=lambda t: t['width']).get('url')
+
+
+def resize(img: Image.Image, target_width: int) -> Image.Image:
+    """
+    Resize an image to the target width, keeping its aspect ratio.
+
+    Args:
+        img (Image.Image): The image to resize.
+        target_width (int): The target width.
+
+    Returns:
+        Image.Image: The resized image.
+    """
+    width, height = img.size
+    return img.resize((target_width, int(target_width/(width/height))))
+
+
+class ThumbnailCache:
+    """
+    A size-capped on-disk cache of pre-scaled thumbnails keyed by URL and width.
+
+    Attributes:
+        directory (str): The folder the cached thumbnails are written to.
+        max_bytes (int): The maximum total size of the cache before old entries are evicted.
+        total_bytes (int): The current total size of the cache.
+    """
+
+    def __init__(self, directory: str = CACHE_DIRECTORY, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize the ThumbnailCache class.
+
+        Args:
+            directory (str): The folder the cached thumbnails are written to.
+            max_bytes (int): The maximum total size of the cache. Defaults to 50MB.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self.entries())
+
+    def path_for(self, url: str, width: int) -> str:
+        """
+        Get the cache file path for a thumbnail variant.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            width (int): The width of the variant.
+
+        Returns:
+            str: The path of the cached file.
+        """
+        return os.path.join(self.directory, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}_{width}.jpg")
+
+    def entries(self) -> list:
+        """
+        List the cached files.
+
+        Returns:
+            list: Tuples of (last used time, size, path) for every cached file.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, url: str, width: int) -> Optional[Image.Image]:
+        """
+        Read a thumbnail variant from the cache.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            width (int): The width of the variant.
+
+        Returns:
+            Optional[Image.Image]: The cached image, or None on a cache miss.
+        """
+        path = self.path_for(url, width)
+        try:
+            with open(path, 'rb') as cf:
+                img = Image.open(BytesIO(cf.read()))
+                img.load()
+            os.utime(path)  # Mark as recently used so it survives eviction
+        except OSError:
+            return None
+        return img
+
+    def put(self, url: str, width: int, img: Image.Image) -> None:
+        """
+        Write a thumbnail variant to the cache, evicting the least recently used entries if the cache is full.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            width (int): The width of the variant.
+            img (Image.Image): The scaled image.
+        """
+        buffer = BytesIO()
+        img.convert('RGB').save(buffer, format='JPEG', quality=90)
+        data = buffer.getvalue()
+        path = self.path_for(url, width)
+        with self.lock:
+            if os.path.exists(path):
+                self.total_bytes -= os.path.getsize(path)
+            with open(path + '.tmp', 'wb') as cf:
+                cf.write(data)
+            os.replace(path + '.tmp', path)
+            self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+        """
+        for _, size, path in sorted(self.entries()):
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+        logging.info(f"Thumbnail cache trimmed to {self.total_bytes} bytes")
+
+
+class ThumbnailLoader:
+    """
+    Load thumbnails in the background through a pooled HTTP session and an on-disk cache.
+
+    Each source image is downloaded and decoded once, then stored on disk at every width in
+    VARIANT_WIDTHS. The PhotoImages created on the Tk thread are kept in a small LRU so that
+    showing the same thumbnail again costs nothing.
+
+    Attributes:
+        root (tk.Tk): The root window used to get back onto the Tk thread.
+        timeout (int): The timeout for each HTTP request in seconds.
+        session (requests.Session): The pooled HTTP session.
+        cache (ThumbnailCache): The on-disk thumbnail cache.
+        executor (Executor): The pool of fetch workers.
+        max_photos (int): The number of PhotoImages kept in memory.
+        photos (OrderedDict): The PhotoImage LRU keyed by (url, width).
+        pending (Dict[Tuple[str, int], list]): Callbacks waiting for a thumbnail that is being fetched.
+        placeholders (Dict[int, ImageTk.PhotoImage]): Placeholder images by width.
+    """
+
+    def __init__(self, root, max_workers: int = 4, timeout: int = 5, max_photos: int = 64, cache: ThumbnailCache = None,
+                 executor: Executor = None):
+        """
+        Initialize the ThumbnailLoader class.
+
+        Args:
+            root (tk.Tk): The root window used to get back onto the Tk thread.
+            max_workers (int): The number of concurrent fetches. Defaults to 4.
+            timeout (int): The timeout for each HTTP request in seconds. Defaults to 5.
+            max_photos (int): The number of PhotoImages kept in memory. Defaults to 64.
+            cache (ThumbnailCache, optional): The cache to use. Defaults to a new ThumbnailCache.
+            executor (Executor, optional): The workers to fetch on. Defaults to a new pool of `max_workers` threads.
+        """
+        self.root = root
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.cache = cache if cache is not None else ThumbnailCache()
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='thumbnail')
+        self.max_photos = max_photos
+        self.photos: OrderedDict = OrderedDict()
+        self.pending: Dict[Tuple[str, int], List[Callable]] = {}
+        self.placeholders: Dict[int, ImageTk.PhotoImage] = {}
+
+    def placeholder(self, target_width: int = 250) -> ImageTk.PhotoImage:
+        """
+        Get the placeholder image at the target width.
+
+        Args:
+            target_width (int): The target width. Defaults to 250.
+
+        Returns:
+            ImageTk.PhotoImage: The placeholder image.
+        """
+        if target_width not in self.placeholders:
+            self.placeholders[target_width] = ImageTk.PhotoImage(resize(Image.open(PLACEHOLDER_PATH), target_width))
+        return self.placeholders[target_width]
+
+    def remember(self, key: Tuple[str, int], photo: ImageTk.PhotoImage) -> ImageTk.PhotoImage:
+        """
+        Add a PhotoImage to the LRU, dropping the least recently used one when it is full.
+
+        Args:
+            key (Tuple[str, int]): The (url, width) key.
+            photo (ImageTk.PhotoImage): The image to keep.
+
+        Returns:
+            ImageTk.PhotoImage: The same image.
+        """
+        self.photos[key] = photo
+        self.photos.move_to_end(key)
+        while len(self.photos) > self.max_photos:
+            self.photos.popitem(last=False)
+        return photo
+
+    def recall(self, key: Tuple[str, int]) -> Optional[ImageTk.PhotoImage]:
+        """
+        Get a PhotoImage from the LRU.
+
+        Args:
+            key (Tuple[str, int]): The (url, width) key.
+
+        Returns:
+            Optional[ImageTk.PhotoImage]: The image, or None if it is not in memory.
+        """
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+        return photo
+
+    def fetch(self, url: str, target_width: int) -> Image.Image:
+        """
+        Get a thumbnail variant, from the disk cache when possible.
+
+        On a miss the source image is downloaded once and every variant width is written to the cache.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            target_width (int): The width of the variant.
+
+        Returns:
+            Image.Image: The scaled image.
+        """
+        img = self.cache.get(url, target_width)
+        if img is not None:
+            return img
+        res = self.session.get(url, timeout=self.timeout)
+        res.raise_for_status()
+        source = Image.open(BytesIO(res.content))
+        source.load()
+        variants = {width: resize(source, width) for width in set(VARIANT_WIDTHS) | {target_width}}
+        for width, variant in variants.items():
+            self.cache.put(url, width, variant)
+        return variants[target_width]
+
+    def load_now(self, url: str, target_width: int = 250) -> ImageTk.PhotoImage:
+        """
+        Load a thumbnail on the calling thread, falling back to the placeholder.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            target_width (int): The target width. Defaults to 250.
+
+        Returns:
+            ImageTk.PhotoImage: The resized thumbnail.
+        """
+        key = (url, target_width)
+        photo = self.recall(key)
+        if photo is not None:
+            return photo
+        try:
+            return self.remember(key, ImageTk.PhotoImage(self.fetch(url, target_width)))
+        except Exception:
+            return self.placeholder(target_width)
+
+    def load(self, url: str, callback: Callable[[ImageTk.PhotoImage], None], target_width: int = 250) -> ImageTk.PhotoImage:
+        """
+        Get a thumbnail, loading it in the background if it is not already in memory.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            callback (Callable[[ImageTk.PhotoImage], None]): Called on the Tk thread with the loaded image
+                if it was not in memory.
+            target_width (int): The target width. Defaults to 250.
+
+        Returns:
+            ImageTk.PhotoImage: The thumbnail if it is in memory, otherwise the placeholder to show until it arrives.
+        """
+        key = (url, target_width)
+        photo = self.recall(key)
+        if photo is not None:
+            return photo
+        if key in self.pending:
+            self.pending[key].append(callback)
+        else:
+            self.pending[key] = [callback]
+            self.executor.submit(self._load, key)
+        return self.placeholder(target_width)
+
+    def prefetch(self, url: str, target_width: int = 250) -> None:
+        """
+        Load a thumbnail into memory ahead of time.
+
+        Args:
+            url (str): The URL of the thumbnail.
+            target_width (int): The target width. Defaults to 250.
+        """
+        self.load(url, lambda photo: None, target_width=target_width)
+
+    def _load(self, key: Tuple[str, int]) -> None:
+        """
+        Fetch a thumbnail variant on a worker thread.
+
+        Args:
+            key (Tuple[str, int]): The (url, width) key.
+        """
+        try:
+            img = self.fetch(*key)
+        except Exception as e:
+            logging.error(f"Failed to load thumbnail {key[0]}: {e}")
+            img = None
+        self.root.after(0, self._deliver, key, img)
+
+    def _deliver(self, key: Tuple[str, int], img: Optional[Image.Image]) -> None:
+        """
+        Create the PhotoImage on the Tk thread and pass it to the waiting callbacks.
+
+        Args:
+            key (Tuple[str, int]): The (url, width) key.
+            img (Optional[Image.Image]): The scaled thumbnail, or None if loading failed.
+        """
+        callbacks = self.pending.pop(key, [])
+        if img is None:
+            return
+        photo = self.remember(key, ImageTk.PhotoImage(img))
+        for callback in callbacks:
+            callback(photo)
+
+    def shutdown(self) -> None:
+        """
+        Stop the fetch workers and close the HTTP session.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
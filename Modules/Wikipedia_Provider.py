@@ -0,0 +1,248 @@
+import os
+import re
+import sys
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+import requests
+import xml.etree.ElementTree as ElementTree
+from typing import Optional
+from Connectivity import ConnectivityMonitor
+
+
+# Point this at a local stand-in server to work without the real Wikipedia API
+API_URL = os.environ.get('CONVIVA_WIKIPEDIA_API_URL', 'https://en.wikipedia.org/w/api.php')
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Cache', 'Wikipedia')
+DUMP_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Persistence Documents', 'wikipedia_index.db')
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def first_sentences(text: str, sentences: int) -> str:
+    """
+    Cut a text down to its first few sentences.
+
+    Args:
+        text (str): The text.
+        sentences (int): The number of sentences to keep.
+
+    Returns:
+        str: The shortened text.
+    """
+    return ' '.join(SENTENCE_END.split(text.strip())[:sentences])
+
+
+def build_dump_index(abstract_file: str, index_path: str = DUMP_INDEX) -> int:
+    """
+    Build the offline index from a Wikipedia abstracts dump, such as enwiki-latest-abstract.xml.
+
+    The dump is streamed, so it does not have to fit in memory.
+
+    Args:
+        abstract_file (str): The path of the abstracts dump.
+        index_path (str): The path of the index to write. Defaults to Persistence Documents/wikipedia_index.db.
+
+    Returns:
+        int: The number of articles indexed.
+    """
+    connection = sqlite3.connect(index_path)
+    connection.execute("CREATE TABLE IF NOT EXISTS articles (title TEXT PRIMARY KEY COLLATE NOCASE, summary TEXT NOT NULL)")
+    count = 0
+    batch = []
+    for _, element in ElementTree.iterparse(abstract_file):
+        if element.tag != 'doc':
+            continue
+        title = (element.findtext('title') or '').replace('Wikipedia: ', '', 1).strip()
+        summary = (element.findtext('abstract') or '').strip()
+        if title and summary:
+            batch.append((title, summary))
+        element.clear()
+        if len(batch) >= 10000:
+            connection.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?)", batch)
+            count += len(batch)
+            batch = []
+    connection.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?)", batch)
+    count += len(batch)
+    connection.commit()
+    connection.close()
+    return count
+
+
+class WikipediaProvider:
+    """
+    Look up Wikipedia summaries from the fastest source that has them.
+
+    Summaries are served from an on-disk cache keyed by query and sentence count, then from an optional
+    local index built from a Wikipedia abstracts dump, and only then from the Wikipedia API, which is
+    asked for the best matching article's introduction in a single request. Nothing here sleeps, so
+    failures come back as soon as they happen.
+
+    Attributes:
+        api_url (str): The MediaWiki API endpoint.
+        cache_directory (str): Where summaries are cached.
+        dump_index (str): The path of the offline index, used only if it exists.
+        timeout (float): The timeout of API requests in seconds.
+        connectivity (ConnectivityMonitor): Used to skip the API when offline, or None to always try it.
+        session (requests.Session): The HTTP session for API requests.
+    """
+
+    def __init__(self, api_url: str = API_URL, cache_directory: str = CACHE_DIRECTORY, dump_index: str = DUMP_INDEX,
+                 timeout: float = 5, connectivity: ConnectivityMonitor = None):
+        """
+        Initialize the WikipediaProvider class.
+
+        Args:
+            api_url (str): The MediaWiki API endpoint. Defaults to $CONVIVA_WIKIPEDIA_API_URL or English Wikipedia.
+            cache_directory (str): Where summaries are cached. Defaults to Cache/Wikipedia.
+            dump_index (str): The path of the offline index. Defaults to Persistence Documents/wikipedia_index.db.
+            timeout (float): The timeout of API requests in seconds. Defaults to 5.
+            connectivity (ConnectivityMonitor, optional): Used to skip the API when offline. Defaults to None.
+        """
+        self.api_url = api_url
+        self.cache_directory = cache_directory
+        self.dump_index = dump_index
+        self.timeout = timeout
+        self.connectivity = connectivity
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Conviva (https://github.com/Programming-Sai/Conviva)'
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def summary(self, query: str, sentences: int = 2) -> str:
+        """
+        Get the summary of the article that best matches a query.
+
+        Args:
+            query (str): What to look up.
+            sentences (int): The number of sentences in the summary. Defaults to 2.
+
+        Returns:
+            str: The summary.
+
+        Raises:
+            LookupError: If no article matches the query.
+            ConnectionError: If the summary is not available offline and the API cannot be reached.
+        """
+        query = ' '.join(query.split())
+        result = self._from_cache(query, sentences)
+        if result is None:
+            result = self._from_dump(query, sentences)
+            if result is None:
+                result = self._from_api(query, sentences)
+            self._save(query, sentences, result)
+        return result
+
+    def _cache_path(self, query: str, sentences: int) -> str:
+        """
+        Get the cache file of a query and sentence count.
+
+        Args:
+            query (str): The query.
+            sentences (int): The number of sentences.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        key = hashlib.sha1(f'{query.lower()}|{sentences}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_directory, f'{key}.json')
+
+    def _from_cache(self, query: str, sentences: int) -> Optional[str]:
+        """
+        Get a cached summary.
+
+        Args:
+            query (str): The query.
+            sentences (int): The number of sentences.
+
+        Returns:
+            Optional[str]: The summary, or None if it is not cached.
+        """
+        try:
+            with open(self._cache_path(query, sentences), 'r') as f:
+                return json.load(f)['summary']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, query: str, sentences: int, summary: str) -> None:
+        """
+        Cache a summary.
+
+        Args:
+            query (str): The query.
+            sentences (int): The number of sentences.
+            summary (str): The summary.
+        """
+        try:
+            with open(self._cache_path(query, sentences), 'w') as f:
+                json.dump({'query': query, 'sentences': sentences, 'summary': summary}, f)
+        except OSError as e:
+            logging.error(f"Could not cache the Wikipedia summary of {query}: {e}")
+
+    def _from_dump(self, query: str, sentences: int) -> Optional[str]:
+        """
+        Get a summary from the offline index.
+
+        Args:
+            query (str): The query, matched against article titles.
+            sentences (int): The number of sentences.
+
+        Returns:
+            Optional[str]: The summary, or None if there is no index or no matching article.
+        """
+        if not os.path.exists(self.dump_index):
+            return None
+        connection = sqlite3.connect(self.dump_index)
+        try:
+            row = connection.execute("SELECT summary FROM articles WHERE title = ?", (query,)).fetchone()
+        finally:
+            connection.close()
+        return first_sentences(row[0], sentences) if row else None
+
+    def _from_api(self, query: str, sentences: int) -> str:
+        """
+        Get a summary from the Wikipedia API.
+
+        Args:
+            query (str): The query.
+            sentences (int): The number of sentences.
+
+        Returns:
+            str: The summary.
+
+        Raises:
+            LookupError: If no article matches the query.
+            ConnectionError: If the API cannot be reached.
+        """
+        if self.connectivity is not None and not self.connectivity.is_online():
+            raise ConnectionError('No internet connection')
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'generator': 'search',
+            'gsrsearch': query,
+            'gsrlimit': 1,
+            'prop': 'extracts',
+            'exintro': 1,
+            'explaintext': 1,
+            'redirects': 1
+        }
+        try:
+            response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            pages = response.json().get('query', {}).get('pages', {})
+        except (requests.RequestException, ValueError) as e:
+            raise ConnectionError(f'Wikipedia request failed: {e}') from e
+        extracts = [page.get('extract', '') for page in pages.values() if page.get('extract', '').strip()]
+        if not extracts:
+            raise LookupError(f'No Wikipedia article for {query}')
+        return first_sentences(extracts[0], sentences)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the offline Wikipedia index from an abstracts dump.')
+    parser.add_argument('abstract_file', help='path of a Wikipedia abstracts dump, e.g. enwiki-latest-abstract.xml')
+    parser.add_argument('-o', '--output', default=DUMP_INDEX, help='where to write the index')
+    args = parser.parse_args()
+    print(f'Indexed {build_dump_index(args.abstract_file, args.output)} articles into {args.output}')
+    sys.exit(0)
@@ -1,16 +1,19 @@
 import json
 import os
 import random
+import shutil
 import socket
-import subprocess
 import webbrowser
 from datetime import datetime
 from typing import List, Union
-import platform
-import yt_dlp
-from yt_dlp import YoutubeDL
 import logging
-import ssl
+import urllib.error
+import http.client
+from yt_dlp.utils import DownloadError, ContentTooShortError
+from yt_dlp.networking.exceptions import TransportError
+from Session_Pool import YoutubeDLPool
+from Connectivity import ConnectivityMonitor, shared_monitor
+from Text_To_Speech import pick_backend
 
 logging.basicConfig(
     filename='conviva_app.log',  # Log file name
@@ -20,8 +23,78 @@ logging.basicConfig(
 )
 
 
+# Errors that mean the connection dropped, so a later attempt can continue the partial file.
+NETWORK_ERRORS = (TransportError, ContentTooShortError, urllib.error.URLError, http.client.IncompleteRead, ConnectionError, socket.timeout)
 
 
+def is_network_error(error: Exception) -> bool:
+    """
+    Check whether a download error was caused by the network.
+
+    Args:
+        error (Exception): The error raised by yt-dlp.
+
+    Returns:
+        bool: True if the error came from the connection, False otherwise.
+    """
+    if isinstance(error, DownloadError) and error.exc_info:
+        error = error.exc_info[1]
+    return isinstance(error, NETWORK_ERRORS)
+
+
+def download_options(type: str) -> dict:
+    """
+    Build the YoutubeDL options for a download.
+
+    Args:
+        type (str): The type of download ('Audio' or 'Video').
+
+    Returns:
+        dict: The YoutubeDL options.
+    """
+    ydl_opts = {
+        # 'nocheckcertificate': True, # Uncomment this when the SSL error arises
+        'outtmpl': os.path.join('Downloads', '%(title)s.%(ext)s'),  # Save to a 'downloads' folder
+        # Keep .part files and continue them on the next attempt instead of starting over
+        'continuedl': True,
+        'nopart': False,
+        'retries': 10,
+        'fragment_retries': 10,
+        'retry_sleep_functions': {'http': lambda n: min(2 ** n, 30), 'fragment': lambda n: min(2 ** n, 30)},
+        # Fetch DASH/HLS fragments in parallel and plain files in ranged chunks
+        'concurrent_fragment_downloads': 4,
+        'http_chunk_size': 10 * 1024 * 1024,
+    }
+    if shutil.which('aria2c'):
+        # Split plain HTTP downloads into several concurrent, resumable segments
+        ydl_opts['external_downloader'] = {'http': 'aria2c'}
+        ydl_opts['external_downloader_args'] = {'aria2c': ['--continue=true', '--split=8', '--max-connection-per-server=8', '--min-split-size=1M']}
+    if type == 'Audio':
+        ydl_opts['format'] = 'bestaudio/best'
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '192',
+        }]
+    else:
+        ydl_opts['format'] = 'bestvideo+bestaudio/best'
+    return ydl_opts
+
+
+# Shared YoutubeDL sessions for every kind of request, so searches, suggestions and downloads reuse
+# initialized extractors and connections instead of building a new YoutubeDL each time
+session_pool = YoutubeDLPool({
+    'search': lambda: {'default_search': 'auto', 'skip_download': True, 'quiet': True, 'extract_flat': True},
+    'details': lambda: {'quiet': True, 'extract_flat': True},
+    'playlist': lambda: {'quiet': True, 'extract_flat': 'in_playlist'},
+    'Video': lambda: download_options('Video'),
+    'Audio': lambda: download_options('Audio'),
+})
+
+
+# The speech engine of this machine: macOS say, espeak, or silence
+speech_backend = pick_backend()
+
 
 def say(speak: bool, text: str) -> str:
     """
@@ -35,15 +108,9 @@ def say(speak: bool, text: str) -> str:
         str: The input text.
     """
     if speak:
-        if platform.system() == 'Darwin':  # macOS
-            subprocess.run(["say", "-o", 'prompt.aiff', text])
-            ALLOWED_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 /-.,?_!@$%^&*()#|")
-            clean_text = ''.join(c for c in text if c in ALLOWED_CHARS)
-            subprocess.run(["say", clean_text])
-        # elif platform.system() == 'Windows':  # Windows
-        #     engine = pyttsx3.init()
-        #     engine.say(text)
-        #     engine.runAndWait()
+        ALLOWED_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 /-.,?_!@$%^&*()#|")
+        clean_text = ''.join(c for c in text if c in ALLOWED_CHARS)
+        speech_backend.speak(clean_text)
     return text
 
 class YoutubeDownloader:
@@ -54,19 +121,22 @@ class YoutubeDownloader:
         link (str): The YouTube video link.
         speak (bool): Flag to determine whether to speak prompts.
         say (callable): A function to speak text.
+        connectivity (ConnectivityMonitor): Tracks whether the internet is reachable.
     """
 
-    def __init__(self, speak: bool, say: callable):
+    def __init__(self, speak: bool, say: callable, connectivity: ConnectivityMonitor = None):
         """
         Initialize the YoutubeDownloader object.
 
         Args:
             speak (bool): Flag to determine whether to speak prompts.
             say (callable): A function to speak text.
+            connectivity (ConnectivityMonitor, optional): Tracks whether the internet is reachable. Defaults to the shared monitor.
         """
         self.link = ''
         self.speak = speak
         self.say = say
+        self.connectivity = connectivity if connectivity is not None else shared_monitor
 
     def progress(self):
         """
@@ -124,16 +194,12 @@ class YoutubeDownloader:
 
     def is_internet_connected(self) -> bool:
         """
-        Check if the device is connected to the internet.
+        Check if the device is connected to the internet, using the monitor's cached status.
 
         Returns:
             bool: True if connected, False otherwise.
         """
-        try:
-            socket.create_connection(("www.google.com", 80))
-            return True
-        except OSError:
-            return False
+        return self.connectivity.is_online()
 
     def items(self, search_results: List[dict]) -> None:
         """
@@ -180,24 +246,15 @@ Url:   {search_result.get('url')}
         Returns:
             List[str]: List of search suggestions.
         """
-        ydl_opts = {
-            'default_search': 'auto',
-            'format': 'bestaudio/best',
-            'quiet': True,
-            'extract_flat': True,
-            'extractor_args': {'search': query}
-        }
-
-        with YoutubeDL(ydl_opts) as ydl:
-            if not query.strip():
-                return []
-            else:
-                result = ydl.extract_info(f'ytsearch{random.randint(5, 10)}:' + query, download=False)
-                if 'entries' in result:
-                    suggestions = [entry['title'] for entry in result['entries']]
-                    return suggestions
-                else:
-                    return []
+        if not query.strip() or not self.is_internet_connected():
+            return []
+        with session_pool.session('search') as ydl:
+            result = ydl.extract_info(f'ytsearch{random.randint(5, 10)}:' + query, download=False)
+        if 'entries' in result:
+            suggestions = [entry['title'] for entry in result['entries']]
+            return suggestions
+        else:
+            return []
 
     def get_video_details(self, video_id: str) -> dict:
         """
@@ -209,15 +266,30 @@ Url:   {search_result.get('url')}
         Returns:
             dict: Dictionary containing details of the video.
         """
-        ydl_opts = {
-            'quiet': True,
-            'print_json': True,
-            'extract_flat': True
-        }
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with session_pool.session('details') as ydl:
             video_info = ydl.extract_info(video_id, download=False)
         return video_info
 
+    def playlist_entries(self, url: str) -> List[dict]:
+        """
+        List the videos of a playlist without resolving each of them.
+
+        Args:
+            url (str): The playlist link.
+
+        Returns:
+            List[dict]: The videos, each with a 'url' and a 'title'.
+        """
+        with session_pool.session('playlist') as ydl:
+            playlist = ydl.extract_info(url, download=False)
+        return [
+            {
+                'url': entry.get('url') or f"https://www.youtube.com/watch?v={entry.get('id')}",
+                'title': entry.get('title') or ''
+            }
+            for entry in playlist.get('entries') or [] if entry
+        ]
+
     def save_as_json(self, data: Union[dict, list], filename: str) -> None:
         """
         Save data as JSON to a file.
@@ -268,17 +340,11 @@ Url:   {search_result.get('url')}
         Returns:
             List[dict]: A list of dictionaries containing details of the search results.
         """
+        if not self.is_internet_connected():
+            return []
         try:
             search_query = f'ytsearch{max_result}:{query}'
-            ydl_opts = {
-                'default_search': 'auto',
-                'skip_download': True,
-                'quiet': True,
-                'print_json': True,
-                'extract_flat': True
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with session_pool.session('search') as ydl:
                 search_results = ydl.extract_info(search_query, download=False)
             
             if not search_results or 'entries' not in search_results:
@@ -297,6 +363,10 @@ Url:   {search_result.get('url')}
                     'title': video_info.get('title'),
                     'largest_thumbnail': max(video_info.get('thumbnails', []), key=lambda t: t.get('height', 0) * t.get('width', 0)).get('url'),
                     'smallest_thumbnail': min(video_info.get('thumbnails', []), key=lambda t: t.get('filesize', float('inf'))).get('url'),
+                    'thumbnails': [
+                        {'url': t.get('url'), 'width': t.get('width'), 'height': t.get('height')}
+                        for t in video_info.get('thumbnails', []) if t.get('width')
+                    ],
                     'url': video_info.get('webpage_url'),
                     'audio_length': self.format_audio_length(video_info.get('duration')),
                     'channel_name': video_info.get('uploader'),
@@ -321,20 +391,13 @@ Url:   {search_result.get('url')}
             str: Success message or error message if there is no internet connection.
         """
         try:
-            ydl_opts = {
-                'progress_hooks': [self.progress if not progress_hook else progress_hook],
-                'format': 'bestvideo+bestaudio/best',  
-                # '--no-check-certificates': True, # Uncomment this when the SSL error arises
-                'ssl_context': ssl._create_unverified_context(),
-                'outtmpl': os.path.join('Downloads', '%(title)s.%(ext)s'),  # Save to a 'downloads' folder
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with session_pool.session('Video', self.progress if not progress_hook else progress_hook) as ydl:
                 ydl.download([self.link if link is None else link])
             logging.info(f"{os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Downloads')}  {'%(title)s.%(ext)s'} Successfully ---Video")
             return 'Success'
-        except:
+        except Exception as e:
             logging.info(f"Failed to Download {'%(title)s.%(ext)s'} ---Video")
-            return "Sorry, There is no internet connection"
+            return "Sorry, There is no internet connection" if is_network_error(e) else "Sorry, Failed To Download"
 
     def download_video_audio_aka_music(self, link: str = None, progress_hook: callable = None) -> str:
         """
@@ -348,26 +411,13 @@ Url:   {search_result.get('url')}
             str: Success message or error message if there is no internet connection.
         """
         try:
-            ydl_opts = {
-                'progress_hooks': [self.progress if not progress_hook else progress_hook],
-                # '--no-check-certificates': True, # Uncomment this when the SSL error arises
-                'ssl_context': ssl._create_unverified_context(),
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'outtmpl': os.path.join('Downloads', '%(title)s.%(ext)s'),  # Save to a 'downloads' folder
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with session_pool.session('Audio', self.progress if not progress_hook else progress_hook) as ydl:
                 ydl.download([self.link if link is None else link])
             logging.info(f"{os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Downloads')} {'%(title)s.%(ext)s'} Successfully ---Audio")
             return 'Success'
-        except:
+        except Exception as e:
             logging.info(f"Failed to Download {'%(title)s.%(ext)s'} ---Audio")
-            return "Sorry, There is no internet connection"
-
+            return "Sorry, There is no internet connection" if is_network_error(e) else "Sorry, Failed To Download"
 
 
 
@@ -1,29 +1,31 @@
 import os
-import re
 import sys
 import time
 import json
-import fitz  
 import random
-import librosa
 import logging
-import requests
-import threading
-import markdown2 
 import webbrowser
-import subprocess
 import tkinter as tk
-from io import BytesIO
-import sounddevice as sd
 import customtkinter as ctk
 from PIL import Image, ImageTk
 from tkinter import messagebox
 from tkinter import filedialog
-from tkhtmlview import HTMLLabel 
-from typing import Any, List, Dict
+from typing import Any, Callable, List, Dict, Tuple
 
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'Modules'))
+from Modules.Startup import Warmup
+from Modules.Task_Scheduler import TaskScheduler
+from Modules.Message_Layout import MessageLayout
+from Modules.Lazy_Import import lazy_import
+
+# Only needed by the file previews and the documentation panel, so imported when first used
+fitz = lazy_import('fitz')
+markdown2 = lazy_import('markdown2')
+tkhtmlview = lazy_import('tkhtmlview')
+
+# When the process started, for the time-to-interactive measurement
+START_TIME = time.perf_counter()
 
 
 logging.basicConfig(
@@ -40,7 +42,44 @@ logging.basicConfig(
 
 
 
+def import_modules() -> None:
+    """
+    Import the application modules into the module namespace.
+
+    Returns:
+        None
+    """
+    global FileChat, YoutubeDownloader, Assistant, Functionalities, say, load_intents, ThumbnailLoader, pick_thumbnail, SearchResultPager, DownloadManager, PRIORITY_HIGH, MediaLibrary, session_pool, shared_monitor, TextToSpeech, AudioPlayer, load_audio, rms_envelope, OrbAnimation, ORB_SIZES, load_summarizer, ConversationStore
+    from Modules.File_Chat import FileChat
+    # Imported under the name the other modules use, so there is one session pool for searches and downloads
+    from Youtube_Downloader import YoutubeDownloader, session_pool
+    from Modules.Assistant import Assistant, say, load_intents
+    from Modules.Functionalities import Functionalities, load_summarizer
+    from Modules.Thumbnail_Loader import ThumbnailLoader, pick_thumbnail
+    from Modules.Search_Pager import SearchResultPager
+    from Modules.Download_Manager import DownloadManager, PRIORITY_HIGH
+    from Modules.Media_Library import MediaLibrary
+    from Modules.Conversation_Store import ConversationStore
+    # Imported under the name the other modules use, so there is one shared connectivity monitor
+    from Connectivity import shared_monitor
+    from Modules.Text_To_Speech import TextToSpeech
+    from Modules.Audio_IO import AudioPlayer, load_audio, rms_envelope
+    from Modules.Orb_Animation import OrbAnimation, ORB_SIZES
+
+
+def load_image(path: str) -> Image.Image:
+    """
+    Read and decode an image, so turning it into a PhotoImage later does not touch the disk.
+
+    Args:
+        path (str): The path of the image.
 
+    Returns:
+        Image.Image: The decoded image.
+    """
+    image = Image.open(path)
+    image.load()
+    return image
 
 
 class Conviva(ctk.CTk):
@@ -54,9 +93,12 @@ class Conviva(ctk.CTk):
         AUXILIARY_COLOR (str): Auxiliary color for the interface.
         LESSER_COLOR (str): Lesser color for the interface.
         splash (SplashScreen): The splash screen displayed at the start.
+        warmup (Warmup): The imports and files loaded in the background while the splash screen shows.
+        scheduler (TaskScheduler): The bounded network, model, io and audio queues all background work runs on.
+        suggestion_task (Task): The fetch of search suggestions in progress, or None.
+        search_task (Task): The mini YouTube search in progress, or None.
+        benchmark (bool): Whether to report the time to interactive and quit once the window is ready.
         id (int): General purpose id counter.
-        end (int): End index for certain operations.
-        start (int): Start index for certain operations.
         arc_id (int): Arc id for graphical elements.
         text_id (int): Text id for text elements.
         loading_id (int): Loading id for loading operations.
@@ -67,15 +109,25 @@ class Conviva(ctk.CTk):
         ingesting (bool): Flag to indicate if ingestion is in progress.
         current_page_idx (int): Index of the current page being displayed.
         page_frame (tk.Frame): Frame to hold the current page's content.
+        page_cache (Dict[int, tk.Canvas]): The canvas of every page built so far, by index.
+        visible_page (int): Index of the page whose canvas is shown, or None before the first page.
+        page_hooks (Dict[int, Tuple[Callable[[], None], Callable[[], None]]]): The functions that stop and restart the
+            timers of every built page that has any, by index.
+        floating_buttons (FloatingButtonList): The page navigation buttons shared by every page.
         size (tuple): The size of the application window.
         border_color (str): Color of the window border.
         window_title (str): Title of the window.
         border_frame_color_change (bool): Flag to indicate if the border frame color should change.
+        border_animation_id (str): The timer of the next border animation step, or None while it is stopped.
+        border_animation_paused (bool): Whether the border animation was stopped by hiding its page.
         text_based_preview_frame (ctk.CTkFrame): Frame for text-based preview.
         pdf_preview_canvas (tk.Canvas): Canvas for PDF preview.
         page_loader (tk.Label): Label to indicate page loading.
         text_preview_textbox (tk.Text): Textbox for text preview.
         listbox_suggestions (tk.Listbox): Listbox for suggestions.
+        thumbnail_loader (ThumbnailLoader): Background loader for search result thumbnails.
+        search_pager (SearchResultPager): Pager over the mini YouTube search results.
+        download_manager (DownloadManager): Queue and workers for audio and video downloads.
         bg_image (ImageTk.PhotoImage): Background image for the application.
         pages (list): List of page functions.
         page_commands (list): List of page command functions.
@@ -85,13 +137,14 @@ class Conviva(ctk.CTk):
         intent_function_mappings (dict): Mapping of intents to their corresponding functions.
     """
     
-    def __init__(self, title: str, size: tuple):
+    def __init__(self, title: str, size: tuple, benchmark: bool = False):
         """
         Initialize the Conviva class.
 
         Args:
             title (str): The title of the application window.
             size (tuple): The size of the application window.
+            benchmark (bool): Whether to report the time to interactive and quit once the window is ready. Defaults to False.
         """
         super().__init__()
 
@@ -108,24 +161,81 @@ class Conviva(ctk.CTk):
         # Show splash screen
         self.splash = SplashScreen(self)
 
-        # Import necessary modules and classes
-        global FileChat, YoutubeDownloader, Assistant, Functionalities, say, load_intents
-        from Modules.File_Chat import FileChat
-        from Modules.Youtube_Downloader import YoutubeDownloader
-        from Modules.Assistant import Assistant, say, load_intents
-        from Modules.Functionalities import Functionalities
-        # Deiconify the window and wait for splash screen
-        self.deiconify()
-        time.sleep(8)
+        # Background work runs on a few bounded queues, with results handed back on the Tk thread
+        self.scheduler = TaskScheduler(dispatch=lambda callback: self.after(0, callback))
+
+        # Load the modules, settings and images in the background while the splash screen shows progress
+        self.size = size
+        self.window_title = title
+        self.benchmark = benchmark
+        self.warmup = Warmup()
+        self.warmup.add('modules', 'Loading modules', import_modules, weight=8)
+        self.warmup.add('intents', 'Reading intents', lambda: load_intents())
+        self.warmup.add('config', 'Reading settings', self.get_config_data)
+        self.warmup.add('background', 'Loading images', lambda: load_image(os.path.join(os.getcwd(), 'Images', 'background.jpg')))
+        self.warmup.start()
+        self.wait_for_warmup()
+
+        # Start the main loop
+        self.mainloop()
+        logging.info(f"Background tasks: {self.scheduler.metrics()}")
+        self.scheduler.shutdown()
+        if hasattr(self, 'conversation_store'):
+            self.conversation_store.close()
+        if hasattr(self, 'download_manager'):
+            self.download_manager.shutdown()
+        if hasattr(self, 'media_library'):
+            self.media_library.close()
+        if hasattr(self, 'connectivity'):
+            self.connectivity.stop()
+
+    def wait_for_warmup(self) -> None:
+        """
+        Show the progress of the warm-up on the splash screen, and build the window once it is done.
+
+        Returns:
+            None
+        """
+        self.splash.show_progress(self.warmup.progress, self.warmup.label)
+        if not self.warmup.done.is_set():
+            self.after(50, self.wait_for_warmup)
+            return
+        if self.warmup.error is not None:
+            messagebox.showerror('Conviva', f"Conviva could not start: {self.warmup.error}")
+            self.destroy()
+            return
         self.splash.destroy()
+        self.deiconify()
+        self.build_window(self.warmup.results['config'])
+        # The window is interactive once the first page has been drawn
+        self.after_idle(self.report_startup)
+
+    def report_startup(self) -> None:
+        """
+        Log the time from the start of the process until the window is interactive.
+
+        Returns:
+            None
+        """
+        elapsed = time.perf_counter() - START_TIME
+        steps = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.warmup.timings.items())
+        logging.info(f"Interactive after {elapsed:.2f}s ({steps})")
+        if self.benchmark:
+            print(f"Time to interactive: {elapsed:.2f}s ({steps})")
+            self.quit()
 
-        # Load configuration data
-        config_data = self.get_config_data()
+    def build_window(self, config_data: dict) -> None:
+        """
+        Build the main window once the modules and files it needs are loaded.
 
+        Args:
+            config_data (dict): The configuration data.
+
+        Returns:
+            None
+        """
         # Initialize attributes for various operations
         self.id = 0
-        self.end = 6
-        self.start = 0
         self.arc_id = 0
         self.text_id = 0
         self.loading_id = 1
@@ -134,6 +244,12 @@ class Conviva(ctk.CTk):
         self.ingestion_id = 0
         self.loading_line = 0
         self.ingesting = False
+        self.thumbnail_generation = 0
+        self.suggestion_task = None
+        self.search_task = None
+        self.page_cache: Dict[int, tk.Canvas] = {}
+        self.page_hooks: Dict[int, Tuple[Callable[[], None], Callable[[], None]]] = {}
+        self.visible_page = None
         self.current_page_idx = config_data.get('starting-page-index') if config_data.get('starting-page-index') is not None else 0 
 
         # Create the main page frame
@@ -144,13 +260,13 @@ class Conviva(ctk.CTk):
         ctk.set_appearance_mode('dark')
 
         # Set the window size, title, and attributes
-        self.size = size
         self.border_color = ''
-        self.window_title = title
         self.resizable(False, False)
         self.title(self.window_title)
         self.attributes('-alpha', 0.8)
         self.border_frame_color_change = False
+        self.border_animation_id = None
+        self.border_animation_paused = False
         self.minsize(self.size[0], self.size[1])
         self.maxsize(self.size[0], self.size[1])
         self.geometry(f"{self.size[0]}x{self.size[1]}+{int(self.winfo_screenwidth()/2)-int(self.size[0]/2)}+{int(self.winfo_screenheight()/2)-int(self.size[1]/2)-50}")
@@ -169,7 +285,33 @@ class Conviva(ctk.CTk):
         self.bind('<Escape>', lambda event : self.quit())
 
         # Set the background image
-        self.bg_image = ImageTk.PhotoImage(file=os.path.join(os.getcwd(), 'Images', 'background.jpg'))
+        self.bg_image = ImageTk.PhotoImage(self.warmup.results['background'])
+
+        # Speech for the AI page, rendered on a worker and cached by text
+        self.tts = TextToSpeech(executor=self.scheduler.queue('audio'))
+
+        # Connection status, probed in the background so online-only actions can fail fast
+        self.connectivity = shared_monitor
+        self.connectivity.start()
+
+        # Initialize the YoutubeDL sessions used by searches and suggestions ahead of the first search
+        self.scheduler.submit('network', session_pool.warm, 'search', 'details')
+
+        # Background loader for the mini-youtube thumbnails and the pager for its search results
+        self.thumbnail_loader = ThumbnailLoader(self, executor=self.scheduler.queue('network'))
+        self.search_pager = SearchResultPager(self.thumbnail_loader, lambda title: self.manage_break(self.break_text(title, 30)))
+
+        # Catalog of downloaded files, brought up to date with the Downloads folder in the background
+        self.media_library = MediaLibrary()
+        self.scheduler.submit('io', self.media_library.scan)
+
+        # Conversation history, written in batches and read back a page at a time
+        self.conversation_store = ConversationStore()
+        self.scheduler.submit('io', self.conversation_store.import_legacy)
+
+        # Queue for audio and video downloads, with its progress delivered on the Tk thread
+        self.download_manager = DownloadManager(library=self.media_library)
+        self.download_manager.channel.start(self)
 
         # Define pages and corresponding commands
         self.pages = [self.ai_conversation_page, self.chat_conversation_page, self.text_ingestion_page, self.mini_youtube_page]
@@ -179,8 +321,8 @@ class Conviva(ctk.CTk):
         self.status_label = ctk.CTkLabel(self, text="", font=('Arial Black', 15), fg_color=self.AUXILIARY_COLOR, corner_radius=100, width=300, pady=5)
         
         # Initialize functionalities and intents
-        self.functionality = Functionalities(False, say)
-        self.intent = load_intents()
+        self.functionality = Functionalities(False, say, connectivity=self.connectivity, retry_reporter=self.report_retry)
+        self.intent = self.warmup.results['intents']
         self.intent_function_mappings = {
             "open-cmd": self.functionality.open_cmd,
             "search-google": self.functionality.search_google,
@@ -193,14 +335,20 @@ class Conviva(ctk.CTk):
             "repeat": self.functionality.repeat
         }
 
-        # Load the initial page
+        # Page navigation buttons, shared by every page and kept above them
+        self.floating_buttons = FloatingButtonList(self, orientation='vertical', functions=self.page_commands)
+
+        # Load the initial page, and build the others while idle if the settings ask for it
         self.load_page()
+        if config_data.get('prebuild-pages'):
+            self.after_idle(self.prebuild_pages)
         
         # Initialize the menu bar
         MenuBarEntries(self)
-        
-        # Start the main loop
-        self.mainloop()
+
+        # Load the summarization model ahead of its first use if the settings ask for it
+        if config_data.get('warm-models'):
+            self.scheduler.submit('model', load_summarizer)
     
     def get_config_data(self) -> dict:
         """
@@ -217,39 +365,104 @@ class Conviva(ctk.CTk):
 
     def load_page(self) -> None:
         """
-        Load the current page based on the current page index.
+        Show the current page, building it the first time it is shown.
+
+        Pages are built once and kept, so switching back to one only packs its canvas again. The
+        timers of a page, such as its animations, only run while it is shown.
 
         Returns:
             None
         """
-        self.pages[self.current_page_idx]()
-        self.page_loader.pack_forget()
+        if self.visible_page == 3:
+            self.cancel_search()
+        self.scheduler.cancel_group('page')
+        if self.visible_page is not None:
+            self.page_cache[self.visible_page].pack_forget()
+            self.hide_page(self.visible_page)
+        if self.current_page_idx not in self.page_cache:
+            self.page_loader = tk.Label(self.page_frame, text='Loading...', background=self.SECONDARY_COLOR, pady=20, font=("Arial Black", 20))
+            self.page_loader.pack(expand=True, fill='x')
+            self.update_idletasks()
+            self.build_page(self.current_page_idx)
+            self.page_loader.destroy()
+        # Methods of every page draw on self.canvas, so it has to be the visible page's canvas
+        self.canvas = self.page_cache[self.current_page_idx]
+        self.canvas.pack(expand=True, fill='both')
+        self.visible_page = self.current_page_idx
+        self.show_page(self.visible_page)
+        self.floating_buttons.lift()
 
-    def ai_page(self, e: tk.Event = None) -> None:
+    def build_page(self, index: int) -> tk.Canvas:
         """
-        Load the AI conversation page.
+        Build a page and cache its canvas, without showing it. Its timers are stopped until it is shown.
 
         Args:
-            e (tk.Event, optional): Event that triggered the method. Defaults to None.
+            index (int): The index of the page.
+
+        Returns:
+            tk.Canvas: The canvas of the page.
+        """
+        hooks = self.pages[index]()
+        if hooks is not None:
+            self.page_hooks[index] = hooks
+        self.canvas.pack_forget()
+        self.page_cache[index] = self.canvas
+        self.hide_page(index)
+        return self.canvas
+
+    def hide_page(self, index: int) -> None:
+        """
+        Stop the timers of a page that is no longer shown.
+
+        Args:
+            index (int): The index of the page.
 
         Returns:
             None
         """
-        self.clear_page_frame()
-        self.current_page_idx = 0
-        self.page_loader = tk.Label(self.page_frame, text='Loading...', background=self.SECONDARY_COLOR, pady=20, font=("Arial Black", 20))
-        self.page_loader.pack(expand=True, fill='x')      
-        self.load_page()
+        if index in self.page_hooks:
+            self.page_hooks[index][0]()
 
-    def clear_page_frame(self) -> None:
+    def show_page(self, index: int) -> None:
         """
-        Clear all widgets from the page frame.
+        Restart the timers of a page that is shown again.
+
+        Args:
+            index (int): The index of the page.
 
         Returns:
             None
         """
-        for child in self.page_frame.winfo_children():
-            child.destroy()
+        if index in self.page_hooks:
+            self.page_hooks[index][1]()
+
+    def prebuild_pages(self) -> None:
+        """
+        Build the next page that has not been built yet, then schedule the one after it, so the first
+        visit of every page is instant without holding up startup.
+
+        Returns:
+            None
+        """
+        remaining = [index for index in range(len(self.pages)) if index not in self.page_cache]
+        if not remaining:
+            return
+        self.build_page(remaining[0])
+        self.canvas = self.page_cache[self.visible_page]
+        self.after(100, self.prebuild_pages)
+
+    def ai_page(self, e: tk.Event = None) -> None:
+        """
+        Load the AI conversation page.
+
+        Args:
+            e (tk.Event, optional): Event that triggered the method. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.current_page_idx = 0
+        self.load_page()
 
     def chat_page(self, e: tk.Event = None) -> None:
         """
@@ -261,10 +474,7 @@ class Conviva(ctk.CTk):
         Returns:
             None
         """
-        self.clear_page_frame()
         self.current_page_idx = 1
-        self.page_loader = tk.Label(self.page_frame, text='Loading...', background=self.SECONDARY_COLOR, pady=20, font=("Arial Black", 20))
-        self.page_loader.pack(expand=True, fill='x')  
         self.load_page()
 
     def youtube_page(self, e: tk.Event = None) -> None:
@@ -277,10 +487,7 @@ class Conviva(ctk.CTk):
         Returns:
             None
         """
-        self.clear_page_frame()
         self.current_page_idx = 3
-        self.page_loader = tk.Label(self.page_frame, text='Loading...', background=self.SECONDARY_COLOR, pady=20, font=("Arial Black", 20))
-        self.page_loader.pack(expand=True, fill='x')
         self.load_page()
 
     def ingestion_page(self, e: tk.Event = None) -> None:
@@ -293,10 +500,7 @@ class Conviva(ctk.CTk):
         Returns:
             None
         """
-        self.clear_page_frame()
         self.current_page_idx = 2
-        self.page_loader = tk.Label(self.page_frame, text='Loading...', background=self.SECONDARY_COLOR, pady=20, font=("Arial Black", 20))
-        self.page_loader.pack(expand=True, fill='x')   
         self.load_page()
 
 
@@ -304,12 +508,12 @@ class Conviva(ctk.CTk):
 
 
 
-    def ai_conversation_page(self) -> None:
+    def ai_conversation_page(self) -> Tuple[Callable[[], None], Callable[[], None]]:
         """
         Load the AI conversation page.
 
         Returns:
-            None
+            Tuple[Callable[[], None], Callable[[], None]]: Stop and restart the orb animation.
         """
         self.canvas = tk.Canvas(self.page_frame, width=self.size[0], height=self.size[1], highlightthickness=0)
         self.canvas.create_image(0, 0, anchor='nw', image=self.bg_image)
@@ -317,9 +521,6 @@ class Conviva(ctk.CTk):
         # Create and pack a Pulser widget in the center of the canvas
         self.pulser = Pulser(self, corner_radius=200, border_width=2, border_color=self.LESSER_COLOR).pack_frame()
         self.canvas.create_window(int(self.size[0]/2), int(self.size[1]/2)-50, anchor='center', window=self.pulser)
-                                  
-        # Create a floating button list with page commands
-        FloatingButtonList(self, orientation='vertical', functions=self.page_commands)
 
         # Create a search bar for AI conversation input
         self.search_bar_1 = ctk.CTkEntry(self, fg_color=self.SECONDARY_COLOR, border_color=self.LESSER_COLOR, width=600, height=50, corner_radius=200, placeholder_text_color='white', placeholder_text='Message Conviva...')
@@ -328,6 +529,7 @@ class Conviva(ctk.CTk):
         
         # Pack the canvas to make it visible
         self.canvas.pack(expand=True, fill='both')
+        return self.pulser.animation.stop, self.pulser.animation.start
 
     def get_ai_prompt(self, e: tk.Event) -> str:
         """
@@ -340,8 +542,7 @@ class Conviva(ctk.CTk):
             str: The text entered in the search bar.
         """
         text = self.search_bar_1.get()
-        with open(os.path.join(os.getcwd(), "Persistence Documents", "conversation_history.txt"), 'a') as ch:
-            ch.write(f"\t\t\t{text}\n")
+        self.conversation_store.add('user', text)
 
         # Get AI response based on the input text
         response, add_ons, tag = Assistant(self.intent, False, say, intent_mapping=self.intent_function_mappings).get_response(text)
@@ -352,29 +553,57 @@ class Conviva(ctk.CTk):
         
         # Display the response using the Pulser widget
         self.pulser.speech(response)
-        with open(os.path.join(os.getcwd(), "Persistence Documents", "conversation_history.txt"), 'a') as ch:
-            ch.write(f"{response}\n\n")
+        self.conversation_store.add('assistant', response)
         # Clear the search bar after processing
         self.search_bar_1.delete(0, tk.END)
         return text
 
-    def chat_conversation_page(self) -> None:
+    def report_retry(self, intent: str, succeeded: bool, value: Any) -> None:
+        """
+        Receive the outcome of a chatbot action that was retried in the background.
+
+        This is called from the retry timer thread, so the outcome is shown on the Tk thread.
+
+        Args:
+            intent (str): The intent of the action.
+            succeeded (bool): Whether a retry succeeded.
+            value (Any): The result of the action, or its last error.
+        """
+        self.after(0, self.show_retry_outcome, intent, succeeded, value)
+
+    def show_retry_outcome(self, intent: str, succeeded: bool, value: Any) -> None:
+        """
+        Show the outcome of a chatbot action that was retried in the background.
+
+        A text result is spoken by the pulser if the AI page is open; anything else is shown as a toast.
+
+        Args:
+            intent (str): The intent of the action.
+            succeeded (bool): Whether a retry succeeded.
+            value (Any): The result of the action, or its last error.
+        """
+        name = intent.replace('-', ' ').title()
+        if not succeeded:
+            Toast(self, f'Sorry, {name} Still Failed', offset=(200, 200))
+        elif isinstance(value, str) and value and hasattr(self, 'pulser') and self.pulser.winfo_exists():
+            self.pulser.speech(value)
+        else:
+            Toast(self, f'{name} Worked On Retry', offset=(200, 200))
+
+    def chat_conversation_page(self) -> Tuple[Callable[[], None], Callable[[], None]]:
         """
         Load the chat conversation page.
 
         Returns:
-            None
+            Tuple[Callable[[], None], Callable[[], None]]: Stop and restart the chat's polling.
         """
         self.canvas = tk.Canvas(self.page_frame, width=self.size[0], height=self.size[1], highlightthickness=0)
         self.canvas.create_image(0, 0, anchor='nw', image=self.bg_image)
         
-        # Create a floating button list with page commands
-        FloatingButtonList(self, orientation='vertical', functions=self.page_commands)
-        
         # Initialize chat bar and  chat interface
         self.chat = ChatBar(self)
         frame = ctk.CTkFrame(self)
-        ChatInterFace(frame, self, self.chat)
+        self.chat_interface = ChatInterFace(frame, self, self.chat)
         
         # Create windows for chat bar and interface
         self.canvas.create_window(int(self.size[0]/2), 548, anchor='center', window=self.chat)
@@ -382,13 +611,14 @@ class Conviva(ctk.CTk):
         
         # Pack the canvas to make it visible
         self.canvas.pack(expand=True, fill='both')
+        return self.chat_interface.pause, self.chat_interface.resume
 
-    def text_ingestion_page(self) -> None:
+    def text_ingestion_page(self) -> Tuple[Callable[[], None], Callable[[], None]]:
         """
         Load the text ingestion page.
 
         Returns:
-            None
+            Tuple[Callable[[], None], Callable[[], None]]: Stop and restart the border animation.
         """
         self.canvas = tk.Canvas(self.page_frame, width=self.size[0], height=self.size[1], highlightthickness=0)
         self.canvas.create_image(0, 0, anchor='nw', image=self.bg_image)
@@ -398,9 +628,6 @@ class Conviva(ctk.CTk):
         self.pdf_preview_canvas = tk.Canvas(self.text_based_preview_frame, bg='red', highlightthickness=0)
         self.text_based_preview_frame.propagate(False)
 
-        # Create a floating button list with page commands
-        FloatingButtonList(self, orientation='vertical', functions=self.page_commands)
-        
         # Bind double-click event to open text-based file
         self.text_based_preview_frame.bind("<Double-Button-1>", self.open_text_based_file)
         
@@ -413,6 +640,7 @@ class Conviva(ctk.CTk):
         
         # Pack the canvas to make it visible
         self.canvas.pack(expand=True, fill='both')
+        return self.pause_frame_border, self.resume_frame_border
 
 
 
@@ -434,6 +662,29 @@ class Conviva(ctk.CTk):
         self.text_based_preview_frame.configure(border_color=self.border_color)
         self.border_animation_id = self.after(500, self.animate_frame_border)
 
+    def pause_frame_border(self) -> None:
+        """
+        Stop the border animation while the text ingestion page is hidden.
+
+        Returns:
+            None
+        """
+        if self.border_animation_id is not None:
+            self.after_cancel(self.border_animation_id)
+            self.border_animation_id = None
+            self.border_animation_paused = True
+
+    def resume_frame_border(self) -> None:
+        """
+        Restart the border animation if it was stopped by hiding the page, and not by opening a file.
+
+        Returns:
+            None
+        """
+        if self.border_animation_paused:
+            self.border_animation_paused = False
+            self.animate_frame_border()
+
     def disable_scroll(self, event: tk.Event) -> None:
         """
         Disable scrolling for the text preview textbox.
@@ -563,7 +814,9 @@ class Conviva(ctk.CTk):
         """
         self.text = ''
         self.opening_message.pack_forget()
-        self.after_cancel(self.border_animation_id)
+        if self.border_animation_id is not None:
+            self.after_cancel(self.border_animation_id)
+            self.border_animation_id = None
         self.canvas.delete(self.text_id)
         self.text_preview_textbox.pack_forget()
         self.pdf_preview_canvas.pack_forget()
@@ -664,6 +917,8 @@ class Conviva(ctk.CTk):
         )
 
         self.yt_search_result_data = self.fetch_result_data_json(os.path.join(os.getcwd(), 'Json', 'search_results.json'))
+        self.search_pager.set_data(self.yt_search_result_data)
+        self.create_search_result_tiles()
         self.place_search_results()
 
         self.search_bar_2.bind("<KeyRelease>", self.on_key_release)
@@ -671,8 +926,6 @@ class Conviva(ctk.CTk):
 
         self.canvas.create_window(int(self.size[0]/2), 100, anchor='center', window=self.search_bar_2)
 
-        FloatingButtonList(self, orientation='vertical', functions=self.page_commands)
-
         self.listbox_suggestions = tk.Listbox(self, background=self.SECONDARY_COLOR, height=0)
         self.listbox_suggestions.bind("<Double-Button-1>", self.on_select)
         self.listbox_suggestions.bind("<<ListboxSelect>>", self.on_item_select)
@@ -684,7 +937,7 @@ class Conviva(ctk.CTk):
         self.canvas.create_window(100, 595, anchor='sw', window=self.back_button)
 
         self.canvas_text = self.canvas.create_text(
-            int(self.size[0]/2), 595, anchor='s', text=f'Page: {0 if len(self.yt_search_result_data) == 0 else int(self.end/6) }/{int(len(self.yt_search_result_data)/6)}',
+            int(self.size[0]/2), 595, anchor='s', text=self.search_pager.page_label(),
             font=('Arial Black', 20)
         )
 
@@ -699,56 +952,42 @@ class Conviva(ctk.CTk):
         """
         Navigate to the previous page of YouTube search results.
         """
-        self.clear_search_results()
-        self.canvas.delete(self.loading_line)
-
-        self.end = self.start if self.start > 0 else 6
-        self.start = (self.start - 6) if self.start > 0 else 0
-
-        self.canvas.delete(self.canvas_text)
-        self.canvas_text = self.canvas.create_text(
-            int(self.size[0]/2), 595, anchor='s', text=f'Page: {int(self.end/6)}/{int(len(self.yt_search_result_data)/6)}',
-            font=('Arial Black', 20)
-        )
-        self.loading_line = self.canvas.create_window(
-            int(self.size[0]/2), int(self.size[1]/2), anchor='center',
-            window=ctk.CTkLabel(self, text='Reloading', font=('Arial Black', 15), width=900, fg_color=self.LESSER_COLOR, text_color='white')
-        )
-
-        self.after(100, self.place_search_results)
+        self.search_pager.back()
+        self.show_search_page()
 
     def forward(self) -> None:
         """
         Navigate to the next page of YouTube search results.
         """
-        self.clear_search_results()
-        self.canvas.delete(self.loading_line)
+        self.search_pager.forward()
+        self.show_search_page()
 
-        self.start = (self.start + 6) if self.start < len(self.yt_search_result_data) - 6 else len(self.yt_search_result_data) - 6
-        self.end = self.start + 6
+    def show_search_page(self) -> None:
+        """
+        Replace the search results on the canvas with the pager's current page.
 
+        The tile data and thumbnails of the neighbouring pages are prefetched, so this normally
+        needs no network access and no loading banner.
+        """
+        self.clear_search_results()
         self.canvas.delete(self.canvas_text)
         self.canvas_text = self.canvas.create_text(
-            int(self.size[0]/2), 595, anchor='s', text=f'Page: {int(self.end/6)}/{int(len(self.yt_search_result_data)/6)}',
+            int(self.size[0]/2), 595, anchor='s', text=self.search_pager.page_label(),
             font=('Arial Black', 20)
         )
-        self.loading_line = self.canvas.create_window(
-            int(self.size[0]/2), int(self.size[1]/2), anchor='center',
-            window=ctk.CTkLabel(self, text='Reloading', font=('Arial Black', 15), width=900, fg_color=self.LESSER_COLOR, text_color='white')
-        )
-
-        self.after(100, self.place_search_results)
+        self.place_search_results()
 
     def bind_items(self) -> None:
         """
         Bind the YouTube search result items to open the download screen on click.
+
+        The tiles are reused from page to page, so their old handlers are removed first, and the
+        handlers read the page shown when they are clicked.
         """
-        id = 0
-        for _, image_label, title_label, duration_label in self.yt_search_result_frame_details:
-            image_label.bind("<Button-1>", lambda event, id=id, images=self.images, data=self.first_6_data: self.open_download_screen(event, id, images, data))
-            title_label.bind("<Button-1>", lambda event, id=id, images=self.images, data=self.first_6_data: self.open_download_screen(event, id, images, data))
-            duration_label.bind("<Button-1>", lambda event, id=id, images=self.images, data=self.first_6_data: self.open_download_screen(event, id, images, data))
-            id += 1
+        for id, (_, image_label, title_label, duration_label) in enumerate(self.yt_search_result_frame_details):
+            for label in (image_label, title_label, duration_label):
+                label.unbind("<Button-1>")
+                label.bind("<Button-1>", lambda event, id=id: self.open_download_screen(event, id, self.images, self.first_6_data))
 
     def place_label(self) -> None:
         """
@@ -758,38 +997,61 @@ class Conviva(ctk.CTk):
         self.opening_message.pack(expand=True)
         self.opening_message.bind("<Double-Button-1>", self.open_text_based_file)
 
-    def search_youtube(self) -> None:
+    def search_youtube(self, query: str) -> List[Dict]:
         """
-        Search for YouTube videos and update the search results.
+        Search for YouTube videos on a background queue and save the results.
+
+        Args:
+            query (str): The text in the search bar.
 
-        This method disables the search bar and navigation buttons, performs a YouTube search,
-        and updates the UI with the new search results.
+        Returns:
+            List[Dict]: The saved search results.
         """
-        time.sleep(1)
-        self.search_bar_2.configure(state='disabled')
-        self.forward_button.configure(state='disabled')
-        self.back_button.configure(state='disabled')
-        search = YoutubeDownloader(False, say)
-        query = self.search_bar_2.get()
+        search = YoutubeDownloader(False, say, connectivity=self.connectivity)
         max_result = random.choice([6, 12, 16, 24, 30, 36])
-        search_results = search.search_videos(self.search_bar_2.get(), random.choice([6, 12, 16, 24, 30, 36]))
+        search_results = search.search_videos(query, max_result)
         if search_results:
             search.save_as_json(search_results, os.path.join(os.getcwd(), 'Json', 'search_results.json'))
             logging.info(f"Performed search  with {query} as query and {max_result} as number of result.")
+        return self.fetch_result_data_json(os.path.join(os.getcwd(), 'Json', 'search_results.json'))
+
+    def show_search_results(self, results: List[Dict]) -> None:
+        """
+        Show the results of a search and enable the search bar and navigation buttons again.
+
+        Args:
+            results (List[Dict]): The search results.
+        """
+        self.search_task = None
         self.canvas.delete(self.loading_line)
         self.search_bar_2.configure(state='normal')
         self.forward_button.configure(state='normal')
         self.back_button.configure(state='normal')
-        self.start = 0
-        self.end = 6
         self.canvas.delete(self.canvas_text)
-        self.yt_search_result_data = self.fetch_result_data_json(os.path.join(os.getcwd(), os.path.join(os.getcwd(), 'Json', 'search_results.json')))
+        self.yt_search_result_data = results
+        self.search_pager.set_data(self.yt_search_result_data, reset=True)
         self.canvas_text = self.canvas.create_text(
-            int(self.size[0]/2), 595, anchor='s', text=f'Page: {int(self.end/6)}/{int(len(self.yt_search_result_data)/6)}',
+            int(self.size[0]/2), 595, anchor='s', text=self.search_pager.page_label(),
             font=('Arial Black', 20)
         )
         self.search_bar_2.delete(0, tk.END)
-        self.after(100, self.place_search_results)
+        self.place_search_results()
+
+    def cancel_search(self) -> None:
+        """
+        Drop the search in progress, if any, and put the previous results back.
+
+        The page is kept when another one is shown, so it has to be left usable.
+        """
+        if self.search_task is None:
+            return
+        self.search_task.cancel()
+        self.search_task = None
+        self.canvas.delete(self.loading_line)
+        self.search_bar_2.configure(state='normal')
+        self.forward_button.configure(state='normal')
+        self.back_button.configure(state='normal')
+        self.place_search_results()
 
     def on_select(self, event: tk.Event) -> None:
         """
@@ -806,50 +1068,71 @@ class Conviva(ctk.CTk):
 
     def clear_search_results(self) -> None:
         """
-        Clear the current search results from the canvas.
+        Hide the current search results on the canvas.
         """
         for result_frame, image_label, title_label, duration_label in self.yt_search_result_frame_details:
-            self.canvas.delete(result_frame)
+            self.canvas.itemconfigure(result_frame, state='hidden')
 
-    def place_search_results(self) -> None:
+    def create_search_result_tiles(self) -> None:
         """
-        Place the search results on the canvas.
+        Create the fixed pool of search result tiles.
 
-        This method displays the first 6 search results, creating frames and labels for each result.
+        The tiles are created once per canvas and reconfigured on every page change, so
+        browsing through results does not create new widgets.
         """
-        self.yt_search_result_frame_details = []
-        self.first_6_data = self.yt_search_result_data[self.start:self.end]
-        self.images = [self.fetch_image_from_internet(url['largest_thumbnail']) for url in self.first_6_data]
-        idx = 0
+        self.search_result_tiles = []
         for i in [50, 350, 650]:
             for j in [170, 380]:
-                if self.first_6_data and idx < len(self.images):
-                    self.result_frame = ctk.CTkFrame(self, width=250, height=180, corner_radius=0, fg_color=self.TERTIARY_COLOR )
-
-                    self.canvas_result_frame = self.canvas.create_window(i-25, j, anchor='nw', window=self.result_frame)
-
-                    self.image_label = tk.Label(self.result_frame, image=self.images[idx], height=112)
-                    self.image_label.pack()
-
-                    self.title_label  = ctk.CTkLabel(self.result_frame, text=self.manage_break(self.break_text(self.first_6_data[idx]['title'], 30)), width=20, padx=5, font=('Arial', 12), justify='left', fg_color=self.TERTIARY_COLOR , text_color='white')
-                    self.title_label.pack(expand=True, side='left', fill='both')
-
-                    self.duration_label = ctk.CTkLabel(self.result_frame, text=self.first_6_data[idx]['audio_length'], font=('Arial', 12), fg_color=self.TERTIARY_COLOR , text_color='white')
-                    self.duration_label.pack(expand=True, side='right', fill='both')
+                tile = SearchResultTile(self.canvas, self)
+                canvas_result_frame = self.canvas.create_window(i-25, j, anchor='nw', window=tile, state='hidden')
+                self.search_result_tiles.append((canvas_result_frame, tile.image_label, tile.title_label, tile.duration_label))
+        self.yt_search_result_frame_details = []
 
+    def place_search_results(self) -> None:
+        """
+        Place the search results on the canvas.
 
-                    
-                    self.result_frame.propagate(False)
-                    self.yt_search_result_frame_details.append((self.canvas_result_frame, self.image_label, self.title_label, self.duration_label))
-                idx+=1
+        This method shows the pager's current page of search results on the pooled tiles,
+        then prefetches the neighbouring pages.
+        """
+        tiles = self.search_pager.page_items()
+        self.first_6_data = [tile['entry'] for tile in tiles]
+        self.thumbnail_generation += 1
+        self.images = [
+            self.thumbnail_loader.load(
+                tile['thumbnail'],
+                lambda photo, idx=idx, generation=self.thumbnail_generation: self.show_thumbnail(photo, idx, generation)
+            )
+            for idx, tile in enumerate(tiles)
+        ]
+        self.yt_search_result_frame_details = self.search_result_tiles[:len(tiles)]
+        for idx, (canvas_result_frame, image_label, title_label, duration_label) in enumerate(self.search_result_tiles):
+            if idx < len(tiles):
+                image_label.configure(image=self.images[idx])
+                title_label.configure(text=tiles[idx]['title'])
+                duration_label.configure(text=tiles[idx]['duration'])
+                self.canvas.itemconfigure(canvas_result_frame, state='normal')
+            else:
+                self.canvas.itemconfigure(canvas_result_frame, state='hidden')
         self.bind_items()
         self.reloading = False
-        self.update()
         self.canvas.delete(self.loading_line)
         self.listbox_suggestions.lift()
+        self.search_pager.prefetch()
 
+    def show_thumbnail(self, photo: ImageTk.PhotoImage, idx: int, generation: int) -> None:
+        """
+        Swap a loaded thumbnail into its search result tile.
 
-
+        Args:
+            photo (ImageTk.PhotoImage): The loaded thumbnail.
+            idx (int): The index of the tile on the current page.
+            generation (int): The page render the thumbnail was requested for.
+        """
+        if generation != self.thumbnail_generation or idx >= len(self.yt_search_result_frame_details):
+            return
+        self.images[idx] = photo
+        self.yt_search_result_frame_details[idx][1].configure(image=photo)
 
     def on_item_select(self, event: tk.Event) -> None:
         """
@@ -871,7 +1154,11 @@ class Conviva(ctk.CTk):
         """
         key = event.keysym
         if key != "Return":
-            threading.Thread(target=self.get_suggestions_for_list_box).start()
+            # Only the suggestions for the latest text are wanted
+            if self.suggestion_task is not None:
+                self.suggestion_task.cancel()
+            self.suggestion_task = self.scheduler.submit('network', self.get_suggestions_for_list_box, self.search_bar_2.get(),
+                                                         group='page', on_result=self.update_listbox)
 
     def on_entry_enter(self, event: tk.Event) -> None:
         """
@@ -880,6 +1167,9 @@ class Conviva(ctk.CTk):
         Args:
             event (tk.Event): The event that triggered the method.
         """
+        if not self.connectivity.is_online():
+            Toast(self, 'Sorry, There is no internet connection', offset=(200, 200))
+            return
         self.clear_search_results()
         self.canvas.delete(self.listbox_id)
         self.canvas.delete(self.listbox_id)
@@ -889,7 +1179,11 @@ class Conviva(ctk.CTk):
             window=ctk.CTkLabel(self, text='Searching', font=('Arial Black', 15), width=900,
                                  fg_color=self.LESSER_COLOR, text_color='white')
         )
-        threading.Thread(target=self.search_youtube).start()
+        self.search_bar_2.configure(state='disabled')
+        self.forward_button.configure(state='disabled')
+        self.back_button.configure(state='disabled')
+        self.search_task = self.scheduler.submit('network', self.search_youtube, self.search_bar_2.get(), group='page',
+                                                 on_result=self.show_search_results)
 
     def break_text(self, text: str, width: int) -> List[str]:
         """
@@ -963,13 +1257,17 @@ class Conviva(ctk.CTk):
         else:
             self.canvas.delete(self.listbox_id)
 
-    def get_suggestions_for_list_box(self) -> None:
+    def get_suggestions_for_list_box(self, query: str) -> List[str]:
         """
         Fetch suggestions for the listbox based on the search bar input.
+
+        Args:
+            query (str): The text in the search bar.
+
+        Returns:
+            List[str]: The suggestions.
         """
-        query = self.search_bar_2.get()
-        suggestions = YoutubeDownloader(False, say).fetch_suggestions(query) if query.strip() else []
-        self.listbox_suggestions.after(0, self.update_listbox, suggestions)
+        return YoutubeDownloader(False, say, connectivity=self.connectivity).fetch_suggestions(query) if query.strip() else []
 
     def fetch_result_data_json(self, path: str) -> Dict:
         """
@@ -1001,7 +1299,7 @@ class Conviva(ctk.CTk):
 
     def fetch_image_from_internet(self, url: str, target_width: int = 250) -> Any:
         """
-        Fetch an image from the internet and resize it.
+        Fetch an image from the internet, or the thumbnail cache, and resize it.
 
         Args:
             url (str): The URL of the image.
@@ -1010,17 +1308,38 @@ class Conviva(ctk.CTk):
         Returns:
             Any: The resized image.
         """
-        try:
-            res = requests.get(url, timeout=5)
-            img = Image.open(BytesIO(res.content))
-            width, height = img.size
-            new_width, new_height = (target_width, int(target_width/(width/height)))
-            return ImageTk.PhotoImage(img.resize((new_width, new_height)))
-        except:
-            img = Image.open(os.path.join(os.getcwd(), 'Images', 'placeholder.jpg'))
-            width, height = img.size
-            new_width, new_height = (target_width, int(target_width/(width/height)))
-            return ImageTk.PhotoImage(img.resize((new_width, new_height)))
+        return self.thumbnail_loader.load_now(url, target_width=target_width)
+
+
+class SearchResultTile(ctk.CTkFrame):
+    """
+    A reusable tile showing one mini YouTube search result.
+
+    Attributes:
+        image_label (tk.Label): The label showing the thumbnail.
+        title_label (ctk.CTkLabel): The label showing the title.
+        duration_label (ctk.CTkLabel): The label showing the duration.
+    """
+
+    def __init__(self, parent: tk.Widget, root: tk.Tk):
+        """
+        Initialize the SearchResultTile class.
+
+        Args:
+            parent (tk.Widget): The canvas the tile is shown on.
+            root (tk.Tk): The root window holding the color scheme.
+        """
+        super().__init__(parent, width=250, height=180, corner_radius=0, fg_color=root.TERTIARY_COLOR)
+        self.image_label = tk.Label(self, height=112)
+        self.image_label.pack()
+
+        self.title_label = ctk.CTkLabel(self, text='', width=20, padx=5, font=('Arial', 12), justify='left', fg_color=root.TERTIARY_COLOR, text_color='white')
+        self.title_label.pack(expand=True, side='left', fill='both')
+
+        self.duration_label = ctk.CTkLabel(self, text='', font=('Arial', 12), fg_color=root.TERTIARY_COLOR, text_color='white')
+        self.duration_label.pack(expand=True, side='right', fill='both')
+
+        self.propagate(False)
 
 
 class Toast(tk.Toplevel):
@@ -1069,6 +1388,10 @@ class Pulser(ctk.CTkFrame):
         output_file (str): The audio output file.
         y (ndarray): The audio data.
         sr (int): The sample rate of the audio.
+        player (AudioPlayer): Streams the audio to the speakers.
+        envelope (ndarray): The loudness of the audio over every animation frame, from 0 to 1.
+        hop (int): The number of audio samples per animation frame.
+        animation (OrbAnimation): Plays the orb GIF from pre-rendered frames.
     """
     def __init__(self, parent: tk.Tk, border_width: int = 2, border_color: str = 'black', 
                  corner_radius: int = 200, fg_color: str = 'black', width: int = 350, 
@@ -1096,21 +1419,31 @@ class Pulser(ctk.CTkFrame):
         self.speaking = False
         self.color = fg_color
         self.output_file = os.path.join(os.getcwd(), 'Sound', 'prompt.aiff')
-        self.y, self.sr = librosa.load(self.output_file, sr=None)
+        self.y, self.sr = None, 0
+        self.envelope, self.hop = None, 1
+        self.player = AudioPlayer()
 
         self._create_gif_section()
 
     def _play(self) -> None:
         """
-        Play the audio file and toggle the speaking state.
+        Start streaming the loaded audio and mark the Pulser as speaking until it ends.
+
+        Returns:
+            None
+        """
+        self.player.play(self.y, self.sr, on_finish=self._speech_finished)
+        # Set after play(), which stops the previous reply; a reply too short to still be playing is already done
+        self.speaking = self.player.playing
+
+    def _speech_finished(self) -> None:
+        """
+        Clear the speaking state once playback ends. Called from the audio thread.
 
         Returns:
             None
         """
-        self.speaking = not self.speaking
-        sd.play(self.y, self.sr)
-        sd.wait()
-        self.speaking = not self.speaking
+        self.speaking = False
 
     def pack_frame(self) -> 'Pulser':
         """
@@ -1125,7 +1458,9 @@ class Pulser(ctk.CTkFrame):
 
     def speech(self, text: str) -> None:
         """
-        Convert the text to speech and play it.
+        Convert the text to speech on the speech worker and play it once it is ready.
+
+        Replies that were spoken before come from the speech cache without running the engine again.
 
         Args:
             text (str): The text to be converted to speech.
@@ -1133,92 +1468,68 @@ class Pulser(ctk.CTkFrame):
         Returns:
             None
         """
-        subprocess.run(["say", "-o", os.path.join(os.getcwd(), 'Sound', 'prompt.aiff'), text])
-        self.y, self.sr = librosa.load(self.output_file, sr=None)
-        self._toggle_speech()
+        self.parent.tts.render_async(text, self._load_speech)
 
-    def _toggle_speech(self) -> None:
+    def _load_speech(self, path: str) -> None:
         """
-        Toggle the speech playback in a separate thread.
+        Load rendered speech and compute its loudness envelope on the speech worker, then start playing
+        it on the Tk thread.
 
-        Returns:
-            None
-        """
-        threading.Thread(target=self._play).start()
-
-    def _create_gif_section(self) -> None:
-        """
-        Create the section for displaying the GIF.
+        Args:
+            path (str): The path of the rendered audio.
 
         Returns:
             None
         """
-        gif_div_ctk = tk.Label(self, text='', bd=0, background='black')
-        self._play_gif(gif_div_ctk, self._get_frames(os.path.join(os.getcwd(), 'Images', 'conviva-orb.gif')))
-        gif_div_ctk.pack(expand=True)
+        y, sr = load_audio(path)
+        # One loudness value per animation frame, so the orb follows the voice
+        hop = max(int(sr * self.speed / 1000), 1)
+        self.after(0, self._start_speech, path, y, sr, rms_envelope(y, hop), hop)
 
-    def _get_frames(self, img_path: str) -> list:
+    def _start_speech(self, path: str, y: Any, sr: int, envelope: Any, hop: int) -> None:
         """
-        Get the frames from the GIF image.
+        Play loaded speech.
 
         Args:
-            img_path (str): The path to the GIF image.
+            path (str): The path of the rendered audio.
+            y (ndarray): The audio data.
+            sr (int): The sample rate of the audio.
+            envelope (ndarray): The loudness of the audio over every animation frame.
+            hop (int): The number of audio samples per animation frame.
 
         Returns:
-            list: The frames of the GIF image.
+            None
         """
-        frames = []
-        try:
-            with Image.open(img_path) as img:
-                while True:
-                    try:
-                        img.seek(img.tell() + 1)
-                        frames.append(img.copy())
-                    except EOFError:
-                        break
-        except Exception as e:
-            print("Error:", e)
-        return frames
+        self.output_file = path
+        self.y, self.sr = y, sr
+        self.envelope, self.hop = envelope, hop
+        self._play()
 
-    def _play_gif(self, container: tk.Label, frames: list) -> None:
+    def _create_gif_section(self) -> None:
         """
-        Play the GIF animation.
-
-        Args:
-            container (tk.Label): The label to display the GIF.
-            frames (list): The frames of the GIF image.
+        Create the section for displaying the GIF, with its frames rendered once at every orb size.
 
         Returns:
             None
         """
-        total_delay = 50
-        for frame in frames:
-            self.parent.after(total_delay, self._next_frame, frame, container, frames)
-            total_delay += self.speed
-        self.parent.after(total_delay, self._next_frame, frame, container, frames, True)
+        gif_div_ctk = tk.Label(self, text='', bd=0, background='black')
+        self.animation = OrbAnimation(gif_div_ctk, os.path.join(os.getcwd(), 'Images', 'conviva-orb.gif'),
+                                      self._orb_size, delay=self.speed)
+        self.animation.start()
+        gif_div_ctk.pack(expand=True)
 
-    def _next_frame(self, frame: Image, container: tk.Label, frames: list, restart: bool = False) -> None:
+    def _orb_size(self) -> int:
         """
-        Display the next frame of the GIF animation.
-
-        Args:
-            frame (Image): The current frame to display.
-            container (tk.Label): The label to display the frame.
-            frames (list): The frames of the GIF image.
-            restart (bool, optional): Whether to restart the animation. Defaults to False.
+        Get the size of the orb for the next frame: the smallest while idle, and while speaking one that
+        grows with the loudness of the audio being played.
 
         Returns:
-            None
+            int: The size in pixels.
         """
-        if self.speaking:
-            x = random.randint(200, 250)
-        else:
-            x = 200
-        if restart:
-            self.parent.after(1, self._play_gif, container, frames)
-        photo_image = ImageTk.PhotoImage(frame.resize((x, x)))
-        container.configure(image=photo_image)
-        container.image = photo_image
+        if not self.speaking or self.envelope is None or not len(self.envelope):
+            return ORB_SIZES[0]
+        level = self.envelope[min(self.player.position // self.hop, len(self.envelope) - 1)]
+        return int(ORB_SIZES[0] + level * (ORB_SIZES[-1] - ORB_SIZES[0]))
 
 
 class MenuBarEntries(tk.Menu):
@@ -1234,8 +1545,10 @@ class MenuBarEntries(tk.Menu):
         configuration(): Define the Configuration menu and its items.
         help(): Define the Help menu and its items.
         get_file_text(file_path: str): Read and return the text from the specified file.
-        open_text_file(file_path: str = None): Open and display the text file content in a new panel.
-        clear_text_file(file_path: str = None): Clear the content of the specified text file.
+        open_text_file(file_path: str): Open and display the text file content in a new panel.
+        clear_text_file(file_path: str): Clear the content of the specified text file.
+        open_conversation_history(): Open the conversation history in a new panel.
+        clear_conversation_history(): Delete the conversation history after user confirmation.
         clear_ingested_database(): Clear the ingested database after user confirmation.
         switch_page(page_index: int): Switch to the specified page index.
         get_and_set_first_page(current_idx: int): Get and set the first page based on the current index.
@@ -1263,7 +1576,7 @@ class MenuBarEntries(tk.Menu):
             None
         """
         file_menu = tk.Menu(self, tearoff=False)
-        file_menu.add_command(label='Open Conversation Text File', command=self.open_text_file)
+        file_menu.add_command(label='Open Conversation History', command=self.open_conversation_history)
         file_menu.add_command(label='Open Summarised Text File', 
                               command=lambda file_path=os.path.join(os.getcwd(), 'Persistence Documents', 'summary_result.txt'): self.open_text_file(file_path=file_path))
         file_menu.add_command(label='Open Database Folder', 
@@ -1274,7 +1587,7 @@ class MenuBarEntries(tk.Menu):
         file_menu.add_command(label='Clear Database', command=self.clear_ingested_database)
         file_menu.add_command(label='Clear Summarised Text File', 
                               command=lambda file_path=os.path.join(os.getcwd(), 'Persistence Documents', 'summary_result.txt'): self.clear_text_file(file_path=file_path))
-        file_menu.add_command(label='Clear Conversation Text File', command=self.clear_text_file)
+        file_menu.add_command(label='Clear Conversation History', command=self.clear_conversation_history)
         file_menu.add_separator()
         file_menu.add_command(label='Close / Exit / Quit', command=self.parent.quit)
         self.add_cascade(label='File', menu=file_menu)
@@ -1358,33 +1671,53 @@ class MenuBarEntries(tk.Menu):
         with open(file_path, 'r') as fr:
             return fr.readlines()
 
-    def open_text_file(self, file_path: str = None) -> None:
+    def open_text_file(self, file_path: str) -> None:
         """
         Open and display the text file content in a new panel.
 
         Args:
-            file_path (str, optional): The path to the text file. Defaults to None.
+            file_path (str): The path to the text file.
 
         Returns:
             None
         """
         self.parent.summarize_button = ctk.CTkButton(self.parent)
-        SummarizerPanel(self.parent, summarise=False).show_summary(self.get_file_text(file_path if file_path else os.path.join(os.getcwd(), 'Persistence Documents', 'conversation_history.txt')))
+        SummarizerPanel(self.parent, summarise=False).show_summary(self.get_file_text(file_path))
 
-    def clear_text_file(self, file_path: str = None) -> None:
+    def clear_text_file(self, file_path: str) -> None:
         """
         Clear the content of the specified text file.
 
         Args:
-            file_path (str, optional): The path to the text file. Defaults to None.
+            file_path (str): The path to the text file.
 
         Returns:
             None
         """
-        with open(file_path if file_path else os.path.join(os.getcwd(), 'Persistence Documents', 'conversation_history.txt'), 'w') as fw:
+        with open(file_path, 'w') as fw:
             fw.write('')
         Toast(self.parent, "File Cleared")
 
+    def open_conversation_history(self) -> None:
+        """
+        Open the conversation history in a new panel.
+
+        Returns:
+            None
+        """
+        HistoryPanel(self.parent, self.parent.conversation_store)
+
+    def clear_conversation_history(self) -> None:
+        """
+        Delete the conversation history after user confirmation.
+
+        Returns:
+            None
+        """
+        if messagebox.askyesno('Clear History?', 'Are You Sure That You Want To Clear The Conversation History?'):
+            self.parent.conversation_store.clear()
+            Toast(self.parent, "History Cleared")
+
     def clear_ingested_database(self) -> None:
         """
         Clear the ingested database after user confirmation.
@@ -1407,7 +1740,6 @@ class MenuBarEntries(tk.Menu):
             None
         """
         self.parent.current_page_idx = page_index
-        self.parent.clear_page_frame()
         self.parent.load_page()
 
     def get_and_set_first_page(self, current_idx: int) -> None:
@@ -1436,7 +1768,7 @@ class MenuBarEntries(tk.Menu):
             self.youtube_page.set(True)
         
         # Save the starting page index to a configuration file
-        data = {"starting-page-index": current_idx}
+        data = {**self.parent.get_config_data(), "starting-page-index": current_idx}
         with open(os.path.join(os.getcwd(), "Json", "ai_config.json"), 'w') as aw:
             json.dump(data, aw, indent=4)
         logging.info(f"First Page set to {'Conviva Orb Interface' if current_idx == 0 else 'Conviva Chat Interface' if current_idx == 1 else 'Text Based File Manipulation Interface' if current_idx == 2 else 'Mini-Youtube' if current_idx == 3 else ''}")
@@ -1456,6 +1788,8 @@ class ChatBar(ctk.CTkTextbox):
         should_strip (bool): Whether the text should be stripped of newline characters.
         height_increased (bool): Whether the height has been increased.
         border_color (str): The border color of the chat bar.
+        height_id (str): The timer of the next height adjustment, or None while paused.
+        border_id (str): The timer of the next border animation step, or None while paused or not animated.
     """
 
     def __init__(self, parent: tk.Tk, width: int = 600, height: int = 55, corner_radius: int = 20, 
@@ -1484,6 +1818,8 @@ class ChatBar(ctk.CTkTextbox):
         self.should_strip = True
         self.height_increased = False
         self.border_color = parent.LESSER_COLOR
+        self.height_id = None
+        self.border_id = None
 
         # Bind events to methods
         self.bind('<Return>', self.get_text)
@@ -1525,7 +1861,7 @@ class ChatBar(ctk.CTkTextbox):
             else:
                 self.border_color = self.parent.AUXILIARY_COLOR
             self.configure(border_color=self.border_color)
-            self.parent.after(500, self.border_animation)
+            self.border_id = self.parent.after(500, self.border_animation)
 
     def shift_increase_height(self, e: tk.Event) -> None:
         """
@@ -1553,7 +1889,31 @@ class ChatBar(ctk.CTkTextbox):
             self.configure(height=100)
         else:
             self.configure(height=55)
-        self.parent.after(500, self.assisted_increase_height)
+        self.height_id = self.parent.after(500, self.assisted_increase_height)
+
+    def pause(self) -> None:
+        """
+        Stop the height adjustment and border animation while the chat bar is hidden.
+
+        Returns:
+            None
+        """
+        for after_id in (self.height_id, self.border_id):
+            if after_id is not None:
+                self.parent.after_cancel(after_id)
+        self.height_id = self.border_id = None
+
+    def resume(self) -> None:
+        """
+        Restart the height adjustment and border animation once the chat bar is shown again.
+
+        Returns:
+            None
+        """
+        if self.height_id is None:
+            self.assisted_increase_height()
+        if self.animate and self.border_id is None:
+            self.border_animation()
 
 
 class ChatBubble(ctk.CTkLabel): 
@@ -1584,15 +1944,29 @@ class ChatBubble(ctk.CTkLabel):
 
     def get_height(self) -> int:
         """
-        Get the height of the chat bubble.
+        Get the height of the chat bubble, laying out pending geometry changes but not handling events.
 
         Returns:
             int: The height of the chat bubble.
         """
-        self.update()
+        self.update_idletasks()
         h = self.winfo_reqheight()
         return h
 
+    def show(self, text: str, fg_color: str) -> None:
+        """
+        Reuse the chat bubble for another message.
+
+        Args:
+            text (str): The text to display.
+            fg_color (str): The foreground color of the chat bubble.
+
+        Returns:
+            None
+        """
+        self.text = text
+        self.configure(text=text, fg_color=fg_color)
+
     def copy_text(self, event: tk.Event) -> None:
         """
         Copy the text of the chat bubble to the clipboard when double-clicked.
@@ -1619,6 +1993,8 @@ class SplashScreen(tk.Toplevel):
         image (PIL.Image): The splash image.
         photo (ImageTk.PhotoImage): The photo image of the splash image.
         label (tk.Label): The label displaying the splash image.
+        status (tk.Label): The label naming the startup step running.
+        progress_bar (tk.Canvas): The bar showing the progress of the startup work.
     """
     def __init__(self, parent: tk.Tk):
         """
@@ -1644,8 +2020,29 @@ class SplashScreen(tk.Toplevel):
         # Create and place a frame in the center of the splash screen
         tk.Frame(self, width=150, height=150, background=self.parent.PRIMARY_COLOR).place(
             x=int(self.size[0]/2), y=int(self.size[1]/2), anchor='center')
+
+        # Progress of the startup work, filled in by show_progress
+        self.status = tk.Label(self, text='', background=self.parent.SECONDARY_COLOR, foreground='white')
+        self.status.place(x=int(self.size[0]/2), y=self.size[1]-50, anchor='center')
+        self.progress_bar = tk.Canvas(self, width=300, height=6, background=self.parent.SECONDARY_COLOR, highlightthickness=0)
+        self.progress_bar.place(x=int(self.size[0]/2), y=self.size[1]-30, anchor='center')
+        self.progress_fill = self.progress_bar.create_rectangle(0, 0, 0, 6, fill=self.parent.LESSER_COLOR, width=0)
         logging.info("Conviva Opened")
 
+    def show_progress(self, fraction: float, text: str) -> None:
+        """
+        Show how far the startup work has got.
+
+        Args:
+            fraction (float): The fraction of the work done, from 0 to 1.
+            text (str): The step running.
+
+        Returns:
+            None
+        """
+        self.progress_bar.coords(self.progress_fill, 0, 0, int(300 * fraction), 6)
+        self.status.configure(text=text)
+
 
 class SummarizerPanel(tk.Toplevel):
     """
@@ -1696,26 +2093,41 @@ class SummarizerPanel(tk.Toplevel):
 
     def summarize(self) -> None:
         """
-        Perform the summarization of the text.
+        Perform the summarization of the text on the model queue.
 
         Returns:
             None
         """
-        self.parent.summarize_button.configure(state='disabled')
-        if self.summarise:
-            try:
-                Functionalities(False, say).text_summary(file_path=self.file_path)
-            except:
-                print("Something Went Wrong")
-                self.summarizing = False
-                self.close()
-                self.parent.summarize_button.configure(state='normal')
-                return
-            # Functionalities(False, say).text_summary(file_path=self.file_path)
-            self.canvas.pack_forget()
-            self.parent.summarize_button.configure(state='normal')
-            time.sleep(0.5)
-            self.show_summary()
+        Functionalities(False, say).text_summary(file_path=self.file_path)
+
+    def finish_summary(self, result: Any = None) -> None:
+        """
+        Show the summary once the summarization has finished.
+
+        Args:
+            result (Any, optional): The result of the summarization, which is read back from its file. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.canvas.pack_forget()
+        self.parent.summarize_button.configure(state='normal')
+        self.after(500, self.show_summary)
+
+    def summary_failed(self, error: Exception) -> None:
+        """
+        Close the panel when the summarization has failed.
+
+        Args:
+            error (Exception): The error of the summarization.
+
+        Returns:
+            None
+        """
+        print("Something Went Wrong")
+        self.summarizing = False
+        self.close()
+        self.parent.summarize_button.configure(state='normal')
 
     def create_page(self) -> None:
         """
@@ -1758,7 +2170,9 @@ class SummarizerPanel(tk.Toplevel):
         self.summarizing = True
         self.loading_screen(100, start=0, extention_count=0, radius=70, width=10, text='Summarising')
         self.canvas.pack(fill='both', expand=True) if self.summarise else ''
-        threading.Thread(target=self.summarize).start()
+        if self.summarise:
+            self.parent.summarize_button.configure(state='disabled')
+            self.parent.scheduler.submit('model', self.summarize, on_result=self.finish_summary, on_error=self.summary_failed)
 
     def get_summarized_text(self) -> list:
         """
@@ -1808,6 +2222,155 @@ class SummarizerPanel(tk.Toplevel):
             self.after_cancel(self.loading_id)
 
 
+class HistoryPanel(tk.Toplevel):
+    """
+    A class representing a panel for reading the conversation history.
+
+    The newest messages are shown first, and older pages are read from the conversation store as the
+    history is scrolled to the top, so opening it takes the same time however long the history is.
+    Searching shows the matching messages from the store's full-text index instead, with the words
+    searched for highlighted.
+
+    Attributes:
+        parent (tk.Tk): The parent window.
+        store (ConversationStore): The conversation history.
+        oldest (int): The id of the oldest message shown, or None before the first page.
+        exhausted (bool): Whether the oldest message of the history is shown.
+        loading (bool): Whether a page has been asked for and not yet shown.
+        searching (bool): Whether search results are shown instead of the history.
+        search_bar (ctk.CTkEntry): The entry for the words to search for.
+        history (tk.Text): The text widget displaying the messages.
+    """
+
+    # Messages read from the store at a time
+    PAGE_SIZE = 50
+
+    def __init__(self, parent: tk.Tk, store: 'ConversationStore'):
+        """
+        Initialize the HistoryPanel class.
+
+        Args:
+            parent (tk.Tk): The parent window.
+            store (ConversationStore): The conversation history.
+        """
+        super().__init__(parent, background=parent.SECONDARY_COLOR)
+        self.parent = parent
+        self.store = store
+        self.oldest = None
+        self.exhausted = False
+        self.loading = False
+        self.searching = False
+        self.overrideredirect(True)
+        self.geometry(f"{int((self.parent.size[0]-100)/2)}x{self.parent.size[1]-50}+"
+                      f"{int(self.parent.winfo_screenwidth()/2)-int(((self.parent.size[0]-100)-int((self.parent.size[0]-100)/2))/2)}+"
+                      f"{int(self.parent.winfo_screenheight()/2)-int((self.parent.size[1]-100)/2)-50}")
+
+        frame = tk.Frame(self, background=self.parent.AUXILIARY_COLOR)
+        frame.pack(fill='both', expand=True)
+        self.search_bar = ctk.CTkEntry(frame, fg_color=self.parent.SECONDARY_COLOR, border_color=self.parent.LESSER_COLOR, corner_radius=200,
+                                       placeholder_text_color='white', placeholder_text='Search History...')
+        self.search_bar.bind("<Return>", self.search)
+        self.search_bar.pack(fill='x', padx=10, pady=10)
+        self.history = tk.Text(frame, padx=10, pady=10, wrap='word', height=400, yscrollcommand=self.on_scroll)
+        self.history.tag_configure('user', justify='right')
+        self.history.tag_configure('time', foreground='gray')
+        self.history.tag_configure('match', background=self.parent.LESSER_COLOR)
+        ctk.CTkButton(frame, text='Close', fg_color=self.parent.PRIMARY_COLOR,
+                      corner_radius=20, hover_color=self.parent.SECONDARY_COLOR,
+                      command=self.destroy).pack(pady=10, expand=True)
+        self.history.pack(fill='both', expand=True)
+
+        self.show_history()
+        logging.info("History Opened")
+
+    def show_history(self) -> None:
+        """
+        Show the newest page of the history, scrolled to the end.
+
+        Returns:
+            None
+        """
+        self.searching = False
+        self.oldest = None
+        self.exhausted = False
+        self.history.configure(state='normal')
+        self.history.delete('1.0', 'end')
+        self.load_older()
+        self.history.see('end')
+
+    def search(self, e: tk.Event = None) -> None:
+        """
+        Show the messages matching the words in the search bar, or the history if it is empty.
+
+        Args:
+            e (tk.Event, optional): The event that triggered the method. Defaults to None.
+
+        Returns:
+            None
+        """
+        query = self.search_bar.get().strip()
+        if not query:
+            self.show_history()
+            return
+        self.searching = True
+        messages = self.store.search(query, limit=self.PAGE_SIZE)
+        self.history.configure(state='normal')
+        self.history.delete('1.0', 'end')
+        if not messages:
+            self.history.insert('end', f"No messages match '{query}'.", 'time')
+        for message in messages:
+            self.history.insert('end', f"{time.strftime('%d %b %Y %H:%M', time.localtime(message['time']))}\n", (message['role'], 'time'))
+            self.history.insert('end', f"{message['text']}\n\n", message['role'])
+        for word in query.split():
+            start = '1.0'
+            while True:
+                start = self.history.search(word, start, stopindex='end', nocase=True)
+                if not start:
+                    break
+                end = f"{start}+{len(word)}c"
+                self.history.tag_add('match', start, end)
+                start = end
+        self.history.configure(state='disabled')
+        self.history.see('1.0')
+
+    def on_scroll(self, first: str, last: str) -> None:
+        """
+        Read the page before the oldest message shown once the history is scrolled to the top.
+
+        Args:
+            first (str): The top of the view as a fraction of the text.
+            last (str): The bottom of the view as a fraction of the text.
+
+        Returns:
+            None
+        """
+        if float(first) == 0.0 and not self.exhausted and not self.loading and not self.searching:
+            self.loading = True
+            self.after_idle(self.load_older)
+
+    def load_older(self) -> None:
+        """
+        Show the page of messages before the oldest shown, keeping the view on the same line.
+
+        Returns:
+            None
+        """
+        self.loading = False
+        messages = self.store.page(before=self.oldest, limit=self.PAGE_SIZE)
+        self.exhausted = len(messages) < self.PAGE_SIZE
+        if not messages:
+            return
+        self.oldest = messages[0]['id']
+        top_line = int(self.history.index('@0,0').split('.')[0])
+        lines = int(self.history.index('end').split('.')[0])
+        self.history.configure(state='normal')
+        for message in reversed(messages):
+            self.history.insert('1.0', f"{message['text']}\n\n", message['role'])
+            self.history.insert('1.0', f"{time.strftime('%d %b %Y %H:%M', time.localtime(message['time']))}\n", (message['role'], 'time'))
+        self.history.configure(state='disabled')
+        self.history.yview(f"{top_line + int(self.history.index('end').split('.')[0]) - lines}.0")
+
+
 class DocumentationPanel(tk.Toplevel):
     """
     A class to create and manage a documentation panel window.
@@ -1840,7 +2403,7 @@ class DocumentationPanel(tk.Toplevel):
         frame = tk.Frame(self, background="black", highlightthickness=0, highlightcolor="black")
         frame.pack(expand=True, fill="both")
 
-        self.html_label = HTMLLabel(frame, wrap='word', background='black', padx=10, pady=10)
+        self.html_label = tkhtmlview.HTMLLabel(frame, wrap='word', background='black', padx=10, pady=10)
         self.html_label.pack(expand=True, fill='both')
 
         # Add a close button
@@ -1965,8 +2528,8 @@ class FloatingButtonList(ctk.CTkLabel):
             e (tk.Event): The event triggering the method.
             id (int): The ID of the button clicked.
         """
-        self.place_forget()
         self.clear_buttons()
+        self.label_toggle = False
         self.functions[id]()
 
     def get_button_image(self, image_name: str) -> ImageTk.PhotoImage:
@@ -1990,18 +2553,31 @@ class ChatInterFace(ctk.CTkScrollableFrame):
     """
     A class representing a chat interface with scrollable chat history.
 
+    Only the messages in view have live bubbles. The layout keeps the height of every message so the
+    scroll region covers the whole history, and bubbles scrolled out of view go back to a pool to be
+    reused by the messages scrolled into view, so long conversations cost no more to scroll or extend
+    than short ones.
+
     Attributes:
         parent (tk.Tk): The parent window.
         root (Conviva): The root application instance.
         chat_bar (ChatBar): The chat bar widget.
         inner_canvas (tk.Canvas): The inner canvas of the scrollable frame.
         background_photo (ImageTk.PhotoImage): The background image of the canvas.
+        background_tiles (List[int]): The canvas images tiling the background of the view.
         intent (str): The intent for processing user input.
         functionality (str): The functionality for processing user input.
         intent_function_mappings (dict): Mapping of intents to functions.
         image_list (list): List to store images.
+        layout (MessageLayout): The text, role and position of every message.
+        bubbles (Dict[int, Tuple[ChatBubble, int]]): The live bubbles and their canvas windows, by message index.
+        pool (List[Tuple[ChatBubble, int]]): Hidden bubbles and their canvas windows, ready for reuse.
+        poll_id (str): The timer of the next check of the chat bar, or None while the chat page is hidden.
     """
 
+    # Pixels drawn above and below the view, so short scrolls need no new bubbles
+    OVERSCAN = 300
+
     def __init__(self, parent: tk.Tk, root: Conviva, chat_bar: ChatBar) -> None:
         """
         Initialize the ChatInterface class.
@@ -2020,71 +2596,182 @@ class ChatInterFace(ctk.CTkScrollableFrame):
         self.chat_bar = chat_bar
         self.inner_canvas = self._parent_canvas  # Accessing the inner canvas of the scrollable frame
         self.background_photo = ImageTk.PhotoImage(Image.open(os.path.join(os.getcwd(), 'Images', 'frame-bg.jpg')))
-
-        # Configure the inner canvas
-        self.inner_canvas.configure(yscrollcommand=self._scrollbar.set, scrollregion=self.inner_canvas.bbox('all'))
+        self.layout = MessageLayout()
+        self.bubbles: Dict[int, Tuple[ChatBubble, int]] = {}
+        self.pool: List[Tuple[ChatBubble, int]] = []
+        self.background_tiles: List[int] = []
+
+        # Configure the inner canvas, drawing the bubbles in view whenever it scrolls or resizes
+        self.inner_canvas.configure(yscrollcommand=self.on_scroll)
+        self.update_scrollregion()
         self.inner_canvas.yview_moveto('1.0')
         self.inner_canvas.configure(highlightthickness=0)
+        self.inner_canvas.bind('<Configure>', lambda e: self.render_visible(), add='+')
+        # The scrollable frame would fit the scroll region to the live bubbles only
+        tk.Frame.bind(self, '<Configure>', lambda e: self.update_scrollregion())
         self._scrollbar.configure(fg_color=self.root.AUXILIARY_COLOR, button_color=self.root.LESSER_COLOR)
 
         self.intent = self.root.intent  # Intent for processing user input
         self.functionality = self.root.functionality  # Functionality for processing user input
         self.intent_function_mappings = self.root.intent_function_mappings  # Mapping of intents to functions
 
+        self.poll_id = None
         self.check_if_text_has_been_entered()
 
-    def check_if_text_has_been_entered(self, h: int = 100, image_y_pos: int = 310) -> None:
+    def pause(self) -> None:
         """
-        Check if text has been entered in the chat bar.
+        Stop checking the chat bar, and stop the chat bar's own timers, while the chat page is hidden.
+
+        Returns:
+            None
+        """
+        if self.poll_id is not None:
+            self.parent.after_cancel(self.poll_id)
+            self.poll_id = None
+        self.chat_bar.pause()
+
+    def resume(self) -> None:
+        """
+        Start checking the chat bar again once the chat page is shown.
+
+        Returns:
+            None
+        """
+        self.chat_bar.resume()
+        if self.poll_id is None:
+            self.check_if_text_has_been_entered()
+
+    def on_scroll(self, first: str, last: str) -> None:
+        """
+        Move the scrollbar and draw the messages scrolled into view.
+
+        Args:
+            first (str): The top of the view as a fraction of the scroll region.
+            last (str): The bottom of the view as a fraction of the scroll region.
+
+        Returns:
+            None
+        """
+        self._scrollbar.set(first, last)
+        self.render_visible()
+
+    def update_scrollregion(self) -> None:
+        """
+        Fit the scroll region to the whole history, drawn or not.
+
+        Returns:
+            None
+        """
+        self.inner_canvas.configure(scrollregion=(0, 0, 890, max(self.layout.height, self.inner_canvas.winfo_height())))
+
+    def add_message(self, text: str, role: str) -> None:
+        """
+        Add a message to the end of the history and scroll to it.
 
         Args:
-            h: The height.
-            image_y_pos: The position of the image.
+            text (str): The text of the message.
+            role (str): Who sent it, 'user' or 'assistant'.
+
+        Returns:
+            None
+        """
+        self.layout.append(text, role)
+        self.update_scrollregion()
+        self.inner_canvas.yview_moveto('1.0')
+        self.render_visible()
+
+    def render_visible(self) -> None:
+        """
+        Give the messages in view a bubble each, and return the bubbles of the others to the pool.
 
         Returns:
             None
         """
-        # Create a background image for the canvas
-        self.inner_canvas.create_image(0, 0, anchor="nw", image=self.background_photo)
+        self.place_background()
+        top = int(self.inner_canvas.canvasy(0))
+        wanted = self.layout.visible(top - self.OVERSCAN, top + self.inner_canvas.winfo_height() + self.OVERSCAN)
+        for index in [index for index in self.bubbles if index not in wanted]:
+            bubble, window = self.bubbles.pop(index)
+            self.inner_canvas.itemconfigure(window, state='hidden')
+            self.pool.append((bubble, window))
+        moved = False
+        for index in wanted:
+            if index not in self.bubbles:
+                moved = self.show_message(index) or moved
+        if moved:
+            # A measured height differed from its estimate, so the messages below it have moved
+            for index, (bubble, window) in self.bubbles.items():
+                self.inner_canvas.coords(window, self.inner_canvas.coords(window)[0], self.layout.y(index))
+            self.update_scrollregion()
+
+    def place_background(self) -> None:
+        """
+        Tile the background over the view, moving the same few images along as it scrolls.
+
+        There are only as many tiles as it takes to cover the view, so the number of canvas items
+        stays the same however long the history grows or the chat sits idle.
 
+        Returns:
+            None
+        """
+        tile = self.background_photo.height()
+        top = int(self.inner_canvas.canvasy(0)) // tile * tile
+        rows = self.inner_canvas.winfo_height() // tile + 2
+        while len(self.background_tiles) < rows:
+            self.background_tiles.append(self.inner_canvas.create_image(0, 0, anchor="nw", image=self.background_photo))
+        for row, item in enumerate(self.background_tiles):
+            self.inner_canvas.coords(item, 0, top + row * tile)
+
+    def show_message(self, index: int) -> bool:
+        """
+        Show a message in a bubble from the pool, or in a new one if the pool is empty.
+
+        Args:
+            index (int): The index of the message.
+
+        Returns:
+            bool: True if the message had not been measured and its height differed from the estimate.
+        """
+        text, role = self.layout.messages[index]
+        color = self.root.LESSER_COLOR if role == 'user' else self.root.AUXILIARY_COLOR
+        if self.pool:
+            bubble, window = self.pool.pop()
+            bubble.show(text, color)
+        else:
+            bubble = ChatBubble(self.inner_canvas, self.root, text=text, fg_color=color)
+            window = self.inner_canvas.create_window(0, 0, window=bubble)
+        x, anchor = (850, 'ne') if role == 'user' else (50, 'nw')
+        self.inner_canvas.coords(window, x, self.layout.y(index))
+        self.inner_canvas.itemconfigure(window, anchor=anchor, state='normal')
+        self.bubbles[index] = (bubble, window)
+        if self.layout.measured[index]:
+            return False
+        return self.layout.measure(index, bubble.get_height())
+
+    def check_if_text_has_been_entered(self) -> None:
+        """
+        Check if text has been entered in the chat bar.
+
+        Returns:
+            None
+        """
         if self.chat_bar.change:
             # Get the text from the chat bar
             text = self.chat_bar.text.strip('\n') if self.chat_bar.should_strip else self.chat_bar.text
-            with open(os.path.join(os.getcwd(), "Persistence Documents", "conversation_history.txt"), 'a') as ch:
-                ch.write(f"\t\t\t{text}\n")
+            self.root.conversation_store.add('user', text)
             self.chat_bar.should_strip = True
-            # Create a chat bubble for the user's text
-            text_bubble = ChatBubble(self.inner_canvas, self.root, text=text, fg_color=self.root.LESSER_COLOR)
-            height = text_bubble.get_height()
-            self.inner_canvas.create_window(850, h, anchor='ne', window=text_bubble)
+            # Show the user's text
+            self.add_message(text, 'user')
             self.chat_bar.change = False
             # Get the response from the assistant
             response, add_ons, tag = Assistant(self.intent, False, say, intent_mapping=self.intent_function_mappings).get_response(text)
             print_add_ons, say_add_ons = add_ons or ("", "")
             response = response + print_add_ons
-            # Create a chat bubble for the assistant's response
-            with open(os.path.join(os.getcwd(), "Persistence Documents", "conversation_history.txt"), 'a') as ch:
-                ch.write(f"{response}\n\n")
-            response_bubble = ChatBubble(self.inner_canvas, self.root, text=response, fg_color=self.root.AUXILIARY_COLOR)
-            response_height = response_bubble.get_height() * len(response.split("\n"))
-            self.inner_canvas.create_window(50, h + height + 100, anchor='nw', window=response_bubble)
-            h += 100 + height + response_height
-            self.parent.update()
-            self.inner_canvas.configure(scrollregion=self.inner_canvas.bbox("all"))
-            self._scrollbar.set(*self.inner_canvas.yview())
-            self.inner_canvas.yview_moveto('1.0')
-            self._scrollbar.update()
-            self.inner_canvas.update_idletasks()
-            # Add background images if necessary
-            if image_y_pos < h:
-                self.inner_canvas.create_image(0, image_y_pos, anchor="nw", image=self.background_photo)
-                image_y_pos += 310
-            if h - image_y_pos in range(800, 10000):
-                for i in range(10):
-                    self.inner_canvas.create_image(0, image_y_pos, anchor="nw", image=self.background_photo)
-                    image_y_pos += 310
+            # Show the assistant's response
+            self.root.conversation_store.add('assistant', response)
+            self.add_message(response, 'assistant')
         # Check again after a delay
-        self.parent.after(500, self.check_if_text_has_been_entered, h, image_y_pos)
+        self.poll_id = self.parent.after(500, self.check_if_text_has_been_entered)
 
 
 class AudioOrVideoDownloadScreen(tk.Toplevel):
@@ -2104,6 +2791,9 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         mp3 (ctk.CTkButton): A button to download the audio in MP3 format.
         flood (Floodgauge): A progress bar widget.
         download_frame (tk.Frame): A frame to contain the download indicators.
+        whole_page (tk.BooleanVar): Whether to download every result on the page instead of just this one.
+        job_ids (list): The ids of the download manager jobs started from this screen.
+        download_type (str): The type of the running download ('Audio' or 'Video').
     """
 
     def __init__(self, parent: tk.Tk, id: int, image: Image, data: dict) -> None:
@@ -2121,6 +2811,9 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         self.image = image
         self.data = data
         self.id = id
+        self.job_ids = []
+        self.download_type = ''
+        self.whole_page = tk.BooleanVar(value=False)
         self.overrideredirect(True)
         self.geometry(f"{self.parent.size[0]-100}x{self.parent.size[1]-100}+{int(self.parent.winfo_screenwidth()/2)-int((self.parent.size[0]-100)/2)}+{int(self.parent.winfo_screenheight()/2)-int((self.parent.size[1]-100)/2)-50}")
 
@@ -2138,8 +2831,9 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
 
     def close(self) -> None:
         """
-        Closes the download screen.
+        Closes the download screen. Queued downloads carry on in the background.
         """
+        self.parent.download_manager.channel.unsubscribe(self.job_updated)
         self.parent.bind_items()
         self.destroy()
 
@@ -2154,21 +2848,6 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         failure.pack(side='bottom', fill='both')
         self.after(6000, lambda: self.remove_failure_message(failure))
 
-    def progress_hook(self, d: dict) -> None:
-        """
-        A callback function to update the download progress.
-
-        Args:
-            d (dict): The download status dictionary.
-        """
-        try:
-            if d['status'] == 'downloading':
-                percent_str = re.sub(r'\x1b\[[0-9;]*m', '', d['_percent_str'])
-                if percent_str.strip().endswith('%'):
-                    self.progress.set(float(float(percent_str.replace('%', ''))))
-        except:
-            raise ValueError
-
     def lift_window(self, event: tk.Event) -> None:
         """
         Brings the download screen to the front.
@@ -2188,7 +2867,7 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         self.frame = tk.Frame(self, background=self.parent.PRIMARY_COLOR)
         self.frame.configure(background=self.parent.PRIMARY_COLOR)
 
-        self.img = self.parent.fetch_image_from_internet(self.data[self.id]['largest_thumbnail'], target_width=350)
+        self.img = self.parent.fetch_image_from_internet(pick_thumbnail(self.data[self.id]), target_width=350)
         
         ctk.CTkButton(self.frame, text='\u00D7', command=self.close, fg_color=self.parent.PRIMARY_COLOR, font=('Arial', 30), hover_color=self.parent.SECONDARY_COLOR).place(relx=1, rely=0, anchor='ne', relwidth=0.08)
         
@@ -2204,34 +2883,53 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         
         self.mp3 = ctk.CTkButton(self.frame, text='MP3', text_color=self.parent.LESSER_COLOR, fg_color=self.parent.PRIMARY_COLOR, font=('Arial', 17), hover_color=self.parent.SECONDARY_COLOR, corner_radius=10, border_color=self.parent.LESSER_COLOR, border_width=3, width=30, command=lambda type='Audio': self.place_download_indicators(type=type))
         self.mp3.pack(side='left', expand=True, pady=20, ipady=15)
+
+        ctk.CTkCheckBox(self.frame, text='Whole Page', variable=self.whole_page, onvalue=True, offvalue=False, fg_color=self.parent.LESSER_COLOR, border_color=self.parent.LESSER_COLOR).pack(side='left', expand=True, pady=20)
         
         self.frame.pack(expand=1, fill='both')
 
-    def download(self, link: str, type: str) -> None:
+    def job_updated(self, job: Any) -> None:
         """
-        Handles the download process of the audio or video.
+        A progress channel subscriber that updates the progress of this screen's jobs on the Tk thread.
 
         Args:
-            link (str): The URL of the item to be downloaded.
-            type (str): The type of download ('Audio' or 'Video').
-        """
-        self.mp4.configure(state='disabled')
-        self.mp3.configure(state='disabled')
-        downloader = YoutubeDownloader(False, say)
-        if type == 'Video':
-            video = downloader.download_video(link=link, progress_hook=self.progress_hook)
-            if video == 'Success':
-                self.success_message(type)
-            else:
+            job (DownloadJob): The job that changed.
+        """
+        if job.id not in self.job_ids:
+            return
+        summary = self.parent.download_manager.progress(self.job_ids)
+        self.progress.set(round(summary['percent'], 1))
+        if summary['active'] == 0 and summary['paused'] == 0:
+            self.parent.download_manager.channel.unsubscribe(self.job_updated)
+            if summary['failed']:
                 self.failure_message()
-        else:
-            audio = downloader.download_video_audio_aka_music(link=link, progress_hook=self.progress_hook)
-            if audio == 'Success':
-                self.success_message(type)
+            elif summary['finished']:
+                self.success_message(self.download_type)
             else:
-                self.failure_message()
-        self.mp4.configure(state='enabled')
-        self.mp3.configure(state='enabled')
+                self.download_frame.pack_forget()
+            self.mp4.configure(state='normal')
+            self.mp3.configure(state='normal')
+
+    def toggle_pause(self) -> None:
+        """
+        Pause this screen's downloads, or resume them if they are paused.
+        """
+        manager = self.parent.download_manager
+        if self.pause_button.cget('text') == 'Pause':
+            for job_id in self.job_ids:
+                manager.pause(job_id)
+            self.pause_button.configure(text='Resume')
+        else:
+            for job_id in self.job_ids:
+                manager.resume(job_id)
+            self.pause_button.configure(text='Pause')
+
+    def cancel_downloads(self) -> None:
+        """
+        Cancel this screen's downloads.
+        """
+        for job_id in self.job_ids:
+            self.parent.download_manager.cancel(job_id)
 
     def success_message(self, type: str) -> None:
         """
@@ -2242,7 +2940,8 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         """
         self.flood.pack_forget()
         self.download_frame.pack_forget()
-        success = ctk.CTkLabel(self, text=f"{self.parent.manage_break(self.parent.break_text(self.data[self.id]['title'], 30))} {type} Downloaded Successfully".replace('\n', ' '), font=('Arial Black', 15), fg_color=self.parent.PRIMARY_COLOR, pady=10, text_color='#99FF99')
+        title = self.parent.manage_break(self.parent.break_text(self.data[self.id]['title'], 30)) if len(self.job_ids) == 1 else f"{len(self.job_ids)} Items:"
+        success = ctk.CTkLabel(self, text=f"{title} {type} Downloaded Successfully".replace('\n', ' '), font=('Arial Black', 15), fg_color=self.parent.PRIMARY_COLOR, pady=10, text_color='#99FF99')
         success.configure(fg_color=self.parent.PRIMARY_COLOR, text_color='#99FF99')
         success.pack(side='bottom', fill='both')
         self.after(6000, lambda: self.remove_success_message(success))
@@ -2277,9 +2976,24 @@ class AudioOrVideoDownloadScreen(tk.Toplevel):
         self.video_details_label.configure(fg_color=self.parent.PRIMARY_COLOR, text_color='white')
         self.download_frame.configure(background=self.parent.PRIMARY_COLOR)
         self.progress = tk.DoubleVar(value=0)
+        for child in self.download_frame.winfo_children():
+            child.destroy()
         self.flood = Floodgauge(self.download_frame, mask='{}%', maximum=100, font=('Arial Black', 15), variable=self.progress)
-        self.flood.pack(fill='x', padx=50, pady=10)
-        threading.Thread(target=self.download, args=(self.data[self.id]["url"], type)).start()
+        self.flood.pack(side='left', fill='x', expand=True, padx=(50, 10), pady=10)
+        self.pause_button = ctk.CTkButton(self.download_frame, text='Pause', width=80, fg_color=self.parent.SECONDARY_COLOR, hover_color=self.parent.TERTIARY_COLOR, command=self.toggle_pause)
+        self.pause_button.pack(side='left', padx=5)
+        ctk.CTkButton(self.download_frame, text='Cancel', width=80, fg_color=self.parent.SECONDARY_COLOR, hover_color=self.parent.TERTIARY_COLOR, command=self.cancel_downloads).pack(side='left', padx=(5, 50))
+
+        self.mp4.configure(state='disabled')
+        self.mp3.configure(state='disabled')
+        self.download_type = type
+        manager = self.parent.download_manager
+        manager.channel.subscribe(self.job_updated)
+        if self.whole_page.get():
+            jobs = manager.submit_many(self.data, type)
+        else:
+            jobs = [manager.submit(self.data[self.id]['url'], type, title=self.data[self.id]['title'], priority=PRIORITY_HIGH)]
+        self.job_ids = [job.id for job in jobs]
         self.download_frame.pack(side='bottom', fill='both')
 
 
@@ -2302,7 +3016,7 @@ def main():
 
 if __name__ == '__main__':
     # main()
-    Conviva('Conviva', (900, 600))
+    Conviva('Conviva', (900, 600), benchmark='--startup-benchmark' in sys.argv)
 
 
 # source myenv/bin/activate  # macOS/Linux
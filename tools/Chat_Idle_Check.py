@@ -0,0 +1,272 @@
+import os
+import sys
+import heapq
+import argparse
+from typing import Any, Callable, Dict, List, Tuple
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class FakeClock:
+    """
+    Stands in for the Tk event loop: `after` callbacks run in order of a simulated clock, not in real time.
+
+    Attributes:
+        now (float): The simulated time in milliseconds.
+        events (List[Tuple[float, int, Callable, tuple]]): The scheduled callbacks, as a heap by due time.
+        cancelled (set): The ids of the cancelled callbacks.
+        calls (int): The number of callbacks run.
+    """
+
+    def __init__(self):
+        """
+        Initialize the FakeClock class.
+        """
+        self.now = 0.0
+        self.events: List[Tuple[float, int, Callable, tuple]] = []
+        self.cancelled = set()
+        self.next_id = 0
+        self.calls = 0
+
+    def after(self, ms: int, callback: Callable, *args) -> str:
+        """
+        Schedule a callback, like `tk.Misc.after`.
+
+        Args:
+            ms (int): The delay in milliseconds.
+            callback (Callable): The callback.
+            *args: The arguments of the callback.
+
+        Returns:
+            str: The id of the callback.
+        """
+        self.next_id += 1
+        heapq.heappush(self.events, (self.now + ms, self.next_id, callback, args))
+        return f'after#{self.next_id}'
+
+    def after_cancel(self, after_id: str) -> None:
+        """
+        Cancel a scheduled callback, like `tk.Misc.after_cancel`.
+
+        Args:
+            after_id (str): The id of the callback.
+        """
+        self.cancelled.add(int(after_id.split('#')[1]))
+
+    def run(self, seconds: float) -> None:
+        """
+        Run every callback due in the next stretch of simulated time.
+
+        Args:
+            seconds (float): The stretch of time.
+        """
+        end = self.now + seconds * 1000
+        while self.events and self.events[0][0] <= end:
+            due, event_id, callback, args = heapq.heappop(self.events)
+            self.now = due
+            if event_id in self.cancelled:
+                continue
+            self.calls += 1
+            callback(*args)
+        self.now = end
+
+
+class FakeCanvas:
+    """
+    Stands in for the inner canvas of the chat, keeping only its items, their coordinates and the view.
+
+    Attributes:
+        items (Dict[int, List[float]]): The coordinates of every item, by id.
+        top (int): The canvas y coordinate at the top of the view.
+        height (int): The height of the view.
+        scrollregion (tuple): The scroll region.
+    """
+
+    def __init__(self, height: int = 300):
+        """
+        Initialize the FakeCanvas class.
+
+        Args:
+            height (int): The height of the view. Defaults to 300, the height of the chat.
+        """
+        self.items: Dict[int, List[float]] = {}
+        self.top = 0
+        self.height = height
+        self.scrollregion = (0, 0, 0, 0)
+
+    def _create(self, x: float, y: float) -> int:
+        """
+        Add an item.
+
+        Args:
+            x (float): The x coordinate.
+            y (float): The y coordinate.
+
+        Returns:
+            int: The id of the item.
+        """
+        item = len(self.items) + 1
+        self.items[item] = [x, y]
+        return item
+
+    def create_image(self, x: float, y: float, **options) -> int:
+        """
+        Add an image item.
+        """
+        return self._create(x, y)
+
+    def create_window(self, x: float, y: float, **options) -> int:
+        """
+        Add a window item.
+        """
+        return self._create(x, y)
+
+    def coords(self, item: int, *coordinates) -> List[float]:
+        """
+        Get or set the coordinates of an item.
+        """
+        if coordinates:
+            self.items[item] = list(coordinates)
+        return self.items[item]
+
+    def itemconfigure(self, item: int, **options) -> None:
+        """
+        Configure an item. Nothing is drawn, so nothing is kept.
+        """
+
+    def configure(self, **options) -> None:
+        """
+        Configure the canvas, keeping the scroll region.
+        """
+        self.scrollregion = options.get('scrollregion', self.scrollregion)
+
+    def canvasy(self, y: int) -> int:
+        """
+        Get the canvas y coordinate of a point in the view.
+        """
+        return self.top + y
+
+    def winfo_height(self) -> int:
+        """
+        Get the height of the view.
+        """
+        return self.height
+
+    def yview_moveto(self, fraction: str) -> None:
+        """
+        Scroll so a fraction of the scroll region is above the view.
+        """
+        self.top = max(int(float(fraction) * self.scrollregion[3]), 0)
+        self.top = min(self.top, max(self.scrollregion[3] - self.height, 0))
+
+
+class FakeBubble:
+    """
+    Stands in for a chat bubble, with a height that grows with its text.
+
+    Attributes:
+        text (str): The text shown.
+    """
+
+    def __init__(self, parent: Any, root: Any, text: str = '', fg_color: str = ''):
+        """
+        Initialize the FakeBubble class.
+        """
+        self.text = text
+
+    def show(self, text: str, fg_color: str) -> None:
+        """
+        Show another message.
+        """
+        self.text = text
+
+    def get_height(self) -> int:
+        """
+        Get the height the bubble would have.
+        """
+        return 18 * (1 + len(self.text) // 35) + 28
+
+
+def simulate(minutes: float = 60, messages: int = 2000) -> Dict[str, int]:
+    """
+    Drive the chat interface's poll and rendering against a fake canvas on a simulated clock.
+
+    The chat sits idle for `minutes`, then gets `messages` messages and is scrolled through from the top
+    to the bottom, then sits idle for `minutes` again.
+
+    Args:
+        minutes (float): How long each idle stretch lasts in simulated minutes. Defaults to 60.
+        messages (int): The number of messages added. Defaults to 2000.
+
+    The project root must be importable, as it is when this file is run as a script.
+
+    Returns:
+        Dict[str, int]: The number of canvas items at the start, after the first idle stretch, at most while
+        scrolling, once scrolled and at the end, the most items allowed, and the number of polls run.
+    """
+    import conviva
+    from Message_Layout import MessageLayout
+
+    clock = FakeClock()
+    canvas = FakeCanvas()
+    chat = conviva.ChatInterFace.__new__(conviva.ChatInterFace)
+    chat.parent = clock
+    chat.root = type('Root', (), {'LESSER_COLOR': '#5376a7', 'AUXILIARY_COLOR': '#413468'})()
+    chat.chat_bar = type('ChatBar', (), {'change': False})()
+    chat.inner_canvas = canvas
+    chat.background_photo = type('Photo', (), {'height': lambda self: 313})()
+    chat.layout = MessageLayout()
+    chat.bubbles, chat.pool, chat.background_tiles = {}, [], []
+    chat.poll_id = None
+
+    bubble = conviva.ChatBubble
+    conviva.ChatBubble = FakeBubble
+    try:
+        chat.render_visible()
+        chat.check_if_text_has_been_entered()
+        counts = {'start': len(canvas.items)}
+        clock.run(minutes * 60)
+        counts['idle'] = len(canvas.items)
+        most = 0
+        for i in range(messages):
+            chat.add_message('word ' * (i % 40 + 1), 'user' if i % 2 else 'assistant')
+            most = max(most, len(canvas.items))
+        for top in range(0, chat.layout.height, 97):
+            canvas.top = top
+            chat.render_visible()
+            most = max(most, len(canvas.items))
+        counts['scrolling'] = most
+        counts['scrolled'] = len(canvas.items)
+        clock.run(minutes * 60)
+        counts['end'] = len(canvas.items)
+    finally:
+        conviva.ChatBubble = bubble
+    # Enough tiles to cover the view, and a bubble for every message that fits in the view and its margins
+    counts['allowed'] = (canvas.height // 313 + 2) + (canvas.height + 2 * chat.OVERSCAN) // chat.layout.gap + 2
+    counts['polls'] = clock.calls
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check that the chat keeps a bounded number of canvas items while idle and while scrolling.')
+    parser.add_argument('-m', '--minutes', type=float, default=60, help='simulated minutes of each idle stretch')
+    parser.add_argument('-n', '--messages', type=int, default=2000, help='messages added between the idle stretches')
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    counts = simulate(args.minutes, args.messages)
+    print(f"{counts['polls']} polls: {counts['start']} items at the start, {counts['idle']} after idling, "
+          f"{counts['scrolling']} at most while scrolling through {args.messages} messages, {counts['end']} at the end")
+    problems = []
+    if counts['idle'] != counts['start']:
+        problems.append(f"idling added {counts['idle'] - counts['start']} items")
+    if counts['end'] != counts['scrolled']:
+        problems.append(f"idling after the messages added {counts['end'] - counts['scrolled']} items")
+    if counts['scrolling'] > counts['allowed']:
+        problems.append(f"{counts['scrolling']} items while scrolling, over the {counts['allowed']} allowed")
+    for problem in problems:
+        print(f'FAIL: {problem}')
+    if not problems:
+        print(f"OK: never more than {counts['allowed']} items")
+    sys.exit(1 if problems else 0)
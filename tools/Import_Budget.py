@@ -0,0 +1,89 @@
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# What the splash screen waits for: importing the app and the modules loaded by the warm-up
+STARTUP_STATEMENT = 'import conviva; conviva.import_modules()'
+
+# Packages that must only be imported once the feature that needs them is used
+DEFERRED_PACKAGES = ('torch', 'transformers', 'langchain', 'langchain_community', 'langchain_core', 'chromadb',
+                     'sentence_transformers', 'fitz', 'markdown2', 'tkhtmlview', 'sounddevice', 'librosa', 'pywhatkit')
+
+
+def profile_imports(statement: str = STARTUP_STATEMENT) -> List[Tuple[str, int, int]]:
+    """
+    Run a statement in a fresh interpreter under `python -X importtime` and collect the import times.
+
+    Args:
+        statement (str): The Python statement to run from the project root. Defaults to the startup imports.
+
+    Returns:
+        List[Tuple[str, int, int]]: The name, own time and cumulative time in microseconds of every module imported.
+
+    Raises:
+        RuntimeError: If the statement fails.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(own), int(cumulative)))
+    return imports
+
+
+def check_budget(imports: List[Tuple[str, int, int]], budget_ms: float) -> List[str]:
+    """
+    Find what breaks the import budget.
+
+    Args:
+        imports (List[Tuple[str, int, int]]): The import times from `profile_imports`.
+        budget_ms (float): The most the imports may take in milliseconds.
+
+    Returns:
+        List[str]: A description of every problem, empty if the imports are within budget.
+    """
+    problems = []
+    total = sum(own for _, own, _ in imports) / 1000
+    if total > budget_ms:
+        problems.append(f'imports took {total:.0f} ms, over the budget of {budget_ms:.0f} ms')
+    loaded: Dict[str, int] = {}
+    for name, _, cumulative in imports:
+        package = name.split('.')[0]
+        if package in DEFERRED_PACKAGES and '.' not in name:
+            loaded[package] = cumulative
+    for package, cumulative in loaded.items():
+        problems.append(f'{package} is imported at startup ({cumulative / 1000:.0f} ms) but should be imported lazily')
+    return problems
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check that starting Conviva stays within its import time budget.')
+    parser.add_argument('-b', '--budget', type=float, default=1500, help='import budget in milliseconds')
+    parser.add_argument('-s', '--statement', default=STARTUP_STATEMENT, help='statement to profile')
+    parser.add_argument('-t', '--top', type=int, default=10, help='number of slowest top-level imports to list')
+    args = parser.parse_args()
+
+    try:
+        imports = profile_imports(args.statement)
+    except RuntimeError as e:
+        print(f'Could not profile the imports: {e}')
+        sys.exit(2)
+    top_level = sorted((i for i in imports if '.' not in i[0]), key=lambda i: i[2], reverse=True)
+    print(f'{len(imports)} modules imported in {sum(i[1] for i in imports) / 1000:.0f} ms, slowest:')
+    for name, _, cumulative in top_level[:args.top]:
+        print(f'{cumulative / 1000:10.1f} ms  {name}')
+    problems = check_budget(imports, args.budget)
+    for problem in problems:
+        print(f'FAIL: {problem}')
+    if not problems:
+        print(f'OK: within the budget of {args.budget:.0f} ms')
+    sys.exit(1 if problems else 0)